@@ -0,0 +1,110 @@
+"""
+Benchmarks the color refinement engines against each other on the colorref files, or on the files given as arguments
+
+With --selectors it compares the selectors of the cell to branch on instead, by the size and time of the automorphism
+searches of the branching files, or of the files given after it
+"""
+import os
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+from bitset import BitsetGraph
+from color_refinement import color_refine, fast_color_refine, get_number_automorphisms, numpy, numpy_color_refine
+from color_refinement_helper import SELECTORS, SearchStatistics, initialize_coloring
+from coloring import Coloring
+from csr import CSRGraph
+from graph import Graph
+from graph_io import load_graph
+
+COLORREF = os.path.join('graphs', 'colorref')
+BRANCHING = os.path.join('graphs', 'branching')
+
+# Every engine gets the initial coloring and the union of the graphs of a file, and builds the adjacency it needs
+ENGINES = {
+    'color_refine': lambda coloring, graph: color_refine(coloring),
+    'fast (CSR)': lambda coloring, graph: fast_color_refine(coloring, CSRGraph.from_vertices(graph.vertices)),
+    'fast (bitsets)': lambda coloring, graph: fast_color_refine(coloring, BitsetGraph.from_graph(graph)),
+}  # type: Dict[str, Callable[[Coloring, Graph], Coloring]]
+if numpy is not None:
+    ENGINES['numpy'] = lambda coloring, graph: numpy_color_refine(coloring, CSRGraph.from_vertices(graph.vertices))
+
+
+def main():
+    if sys.argv[1:2] == ['--selectors']:
+        files = sys.argv[2:] or [os.path.join(BRANCHING, file) for file in sorted(os.listdir(BRANCHING))
+                                 if file.endswith('.grl')]
+        print(create_selector_header_string())
+        for file in files:
+            print(create_selector_row_string(file, benchmark_selectors(file)))
+        return
+
+    files = sys.argv[1:] or [os.path.join(COLORREF, file) for file in sorted(os.listdir(COLORREF))]
+    print(create_header_string())
+    for file in files:
+        print(create_row_string(file, benchmark_file(file)))
+
+
+def benchmark_file(file: str, repeat: int = 3) -> Dict[str, float]:
+    """
+    Times every engine on the union of the graphs in a file
+    :param file: path to the graph file
+    :param repeat: the number of runs of every engine, of which the fastest is kept
+    :return: the time in seconds of every engine
+    """
+
+    graphs, _ = load_graph(file, read_list=True)
+    graph = graphs[0]
+    for other in graphs[1:]:
+        graph = graph + other
+
+    times = {}
+    for name, engine in ENGINES.items():
+        runs = []
+        for _ in range(repeat):
+            coloring = initialize_coloring(graph)
+            start = time.perf_counter()
+            engine(coloring, graph)
+            runs.append(time.perf_counter() - start)
+        times[name] = min(runs)
+    return times
+
+
+def benchmark_selectors(file: str) -> Dict[str, Tuple[SearchStatistics, float]]:
+    """
+    Counts the automorphisms of every graph in a file with every selector
+
+    :param file: path to the graph file
+    :return: the statistics of the searches and their time in seconds for every selector
+    """
+
+    graphs, _ = load_graph(file, read_list=True)
+    results = {}
+    for name, selector in SELECTORS.items():
+        statistics = SearchStatistics()
+        start = time.perf_counter()
+        for graph in graphs:
+            get_number_automorphisms(graph, selector, statistics)
+        results[name] = statistics, time.perf_counter() - start
+    return results
+
+
+def create_header_string() -> str:
+    return '{:<36}'.format('FILE') + ''.join('{:>16}'.format(name) for name in ENGINES)
+
+
+def create_row_string(file: str, times: Dict[str, float]) -> str:
+    return '{:<36}'.format(os.path.basename(file)) + ''.join('{:>16.4f}'.format(times[name]) for name in ENGINES)
+
+
+def create_selector_header_string() -> str:
+    return '{:<36}'.format('FILE') + ''.join('{:>24}'.format(name + ' (nodes, s)') for name in SELECTORS)
+
+
+def create_selector_row_string(file: str, results: Dict[str, Tuple[SearchStatistics, float]]) -> str:
+    return '{:<36}'.format(os.path.basename(file)) + ''.join(
+        '{:>14}{:>10.2f}'.format(results[name][0].nodes, results[name][1]) for name in SELECTORS)
+
+
+if __name__ == "__main__":
+    main()
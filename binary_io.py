@@ -0,0 +1,173 @@
+"""
+Includes functions for storing collections of graphs in a binary container that is read through a memory map.
+
+Layout, all integers little-endian:
+    header     magic b'GRB1', uint32 number of graphs
+    table      per graph: int32 number of vertices, int32 number of edges, int64 file offset of its edges
+    edges      per graph: int32 tail, int32 head for every edge
+
+Only the structure of the graphs is stored, edge weights and options are left out.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Union
+
+from csr import CSRGraph
+from graph import Graph
+from graph_io import edge_array, open_graph_file, parse_edge_list, read_sections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = b'GRB1'
+HEADER = struct.Struct('<4sI')
+ENTRY = struct.Struct('<iiq')
+
+
+def _little_endian(edges) -> bytes:
+    if numpy is not None and isinstance(edges, numpy.ndarray):
+        return edges.astype('<i4').tobytes()
+    edges = array('i', edges)
+    if sys.byteorder != 'little':
+        edges.byteswap()
+    return edges.tobytes()
+
+
+def _write(f, orders: List[int], sizes: List[int], edge_arrays: Iterable) -> int:
+    offset = HEADER.size + ENTRY.size * len(orders)
+    f.write(HEADER.pack(MAGIC, len(orders)))
+    for n, m in zip(orders, sizes):
+        f.write(ENTRY.pack(n, m, offset))
+        offset += 8 * m
+    for edges in edge_arrays:
+        f.write(_little_endian(edges))
+    return len(orders)
+
+
+def write_binary(graphs: Iterable[Union[Graph, CSRGraph]], path: str) -> int:
+    """
+    Write graphs to a binary container
+
+    :param graphs: the graphs to write
+    :param path: the path of the container
+    :return: the number of graphs written
+    """
+
+    graphs = list(graphs)
+    with open(path, 'wb') as f:
+        return _write(f, [g.order for g in graphs], [g.size for g in graphs], (edge_array(g) for g in graphs))
+
+
+def convert(source: str, path: str) -> int:
+    """
+    Convert a .gr or .grl file, which may be compressed, to a binary container
+
+    The source is read twice, first for the order and size of every graph and then graph by graph for the edges, so
+    only one graph is kept in memory.
+    :param source: the path of the text file
+    :param path: the path of the container
+    :return: the number of graphs converted
+    """
+
+    with open_graph_file(source) as f:
+        headers = [(section.order, section.size) for section in read_sections(f, headers_only=True)]
+
+    def edge_arrays():
+        with open_graph_file(source) as text:
+            for section in read_sections(text):
+                yield parse_edge_list([line.split(':')[0] for line in section.edge_lines])
+
+    with open(path, 'wb') as f:
+        return _write(f, [n for n, _ in headers], [m for _, m in headers], edge_arrays())
+
+
+class BinaryGraphFile:
+    def __init__(self, path: str):
+        """
+        Opens a binary container through a read-only memory map
+
+        Opening only reads the header. The pages of a graph are read when the graph is requested, and are shared through
+        the page cache with every other process that maps the same file.
+        :param path: the path of the container
+        :raises ValueError if the file is not a binary graph container
+        """
+
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError('{} is not a binary graph container'.format(path))
+
+    def close(self):
+        try:
+            self._map.close()
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "BinaryGraphFile":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def header(self, i: int) -> (int, int):
+        """
+        :param i: the number of the graph
+        :return: the number of vertices and edges of graph i
+        """
+        if not 0 <= i < self._count:
+            raise IndexError('graph index out of range')
+        n, m, _ = ENTRY.unpack_from(self._map, HEADER.size + ENTRY.size * i)
+        return n, m
+
+    def edges(self, i: int):
+        """
+        Returns the edges of graph i
+
+        The edges are copied out of the memory map, so the array can be kept after the container is closed.
+        :param i: the number of the graph
+        :return: flat int32 array of alternating tails and heads, a NumPy array if NumPy is available
+        """
+
+        if not 0 <= i < self._count:
+            raise IndexError('graph index out of range')
+        _, m, offset = ENTRY.unpack_from(self._map, HEADER.size + ENTRY.size * i)
+        if numpy is not None:
+            return numpy.frombuffer(self._map, dtype='<i4', count=2 * m, offset=offset).copy()
+
+        edges = array('i', self._map[offset:offset + 8 * m])
+        if sys.byteorder != 'little':
+            edges.byteswap()
+        return edges
+
+    def graph(self, i: int, graph_class=Graph) -> Union[Graph, CSRGraph]:
+        """
+        Builds graph i
+
+        :param i: the number of the graph
+        :param graph_class: the class of the graph, see `csr` for a graph without vertex and edge objects
+        :return: the graph, named G<i>
+        """
+        n, _ = self.header(i)
+        return graph_class.from_edge_array(n, self.edges(i), name='G' + str(i))
+
+    def csr(self, i: int) -> CSRGraph:
+        """
+        :param i: the number of the graph
+        :return: graph i in CSR form
+        """
+        return self.graph(i, CSRGraph)
+
+    def __getitem__(self, i: int) -> Graph:
+        return self.graph(i)
+
+    def __iter__(self) -> Iterator[Graph]:
+        return (self.graph(i) for i in range(self._count))
@@ -0,0 +1,189 @@
+"""
+This is a module for dense graphs stored as one integer bitset per adjacency row
+"""
+from array import array
+from typing import Iterator, List, Sequence, Union
+
+from csr import CSRGraph
+from graph import DisjointUnion, Graph
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count('1')
+
+
+popcount = getattr(int, 'bit_count', _popcount)
+
+
+def bits(x: int) -> Iterator[int]:
+    """
+    Iterates over the positions of the set bits of x, lowest first
+
+    :param x: a non-negative integer
+    :return: iterator over the positions of the set bits
+    """
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+class BitsetGraph:
+    def __init__(self, rows: List[int], vertices: Sequence = None, masks: List[int] = None, name: str = 'G'):
+        """
+        Initializes a graph from its adjacency bitsets
+
+        Bit j of rows[i] is set iff vertex i and vertex j are adjacent. Neighbour counts against a set of vertices are a
+        single `popcount(row & cell)`, which makes this the cheaper form for small, dense graphs.
+        :param rows: the adjacency bitset of every vertex
+        :param vertices: optional sequence mapping an index to the object it represents, e.g. a `Vertex`
+        :param masks: optional bitset per vertex of the vertices it can be adjacent to, all vertices if not given
+        :param name: optional name for the graph
+        """
+
+        self._rows = rows
+        self._n = len(rows)
+        self._vertices = vertices if vertices is not None else range(self._n)
+        self._index = None
+        self._masks = masks if masks is not None else [(1 << self._n) - 1] * self._n
+        self._name = name
+
+    @classmethod
+    def from_graph(cls, graph: Union[Graph, CSRGraph]) -> "BitsetGraph":
+        """
+        Builds the bitset form of a graph
+
+        For a `DisjointUnion` the vertices of either side can only be adjacent to their own side, so that the complement
+        of the union is the union of the complements.
+        :param graph: the graph to convert
+        :return: the graph in bitset form, with index i referring to `graph.vertices[i]`
+        """
+
+        if isinstance(graph, CSRGraph):
+            return cls.from_csr(graph)
+
+        masks = None
+        if isinstance(graph, DisjointUnion):
+            left = (1 << graph.left.order) - 1
+            right = ((1 << graph.order) - 1) ^ left
+            masks = [left] * graph.left.order + [right] * graph.right.order
+
+        return cls(graph.adjacency_bitsets(), vertices=graph.vertices, masks=masks, name=graph.name)
+
+    @classmethod
+    def from_csr(cls, graph: CSRGraph) -> "BitsetGraph":
+        """
+        Builds the bitset form of a graph in CSR form
+
+        :param graph: the graph to convert
+        :return: the graph in bitset form
+        """
+
+        offsets, targets = graph.offsets, graph.targets
+        rows = []
+        for i in range(graph.order):
+            row = bytearray((graph.order + 7) // 8)
+            for j in targets[offsets[i]:offsets[i + 1]]:
+                row[j >> 3] |= 1 << (j & 7)
+            rows.append(int.from_bytes(row, 'little'))
+        return cls(rows, vertices=graph.vertices, name=graph.name)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def order(self) -> int:
+        """The number of vertices of this graph."""
+        return self._n
+
+    @property
+    def size(self) -> int:
+        """The number of edges of this graph."""
+        loops = sum(1 for i in range(self._n) if self.row(i) >> i & 1)
+        return (sum(self.degrees()) + loops) // 2
+
+    @property
+    def vertices(self) -> Sequence:
+        return self._vertices
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            self._index = {v: i for i, v in enumerate(self._vertices)}
+        return self._index
+
+    @property
+    def rows(self) -> List[int]:
+        return self._rows
+
+    def row(self, i: int) -> int:
+        return self._rows[i]
+
+    def mask(self, i: int) -> int:
+        return self._masks[i]
+
+    def degree(self, i: int) -> int:
+        return popcount(self.row(i))
+
+    def degrees(self) -> List[int]:
+        return [popcount(row) for row in self.rows]
+
+    def neighbours(self, i: int) -> Iterator[int]:
+        return bits(self.row(i))
+
+    def is_adjacent(self, i: int, j: int) -> bool:
+        return bool(self.row(i) >> j & 1)
+
+    def complement(self) -> "BitsetGraph":
+        """
+        Returns a lazy view on the complement of this graph
+
+        :return: a `ComplementView`, its rows are computed when they are read
+        """
+        return ComplementView(self)
+
+    def to_csr(self) -> CSRGraph:
+        """
+        Returns the CSR form of this graph, without creating vertex or edge objects
+
+        :return: the graph in CSR form, sharing the vertices of this graph
+        """
+
+        offsets = array('i', [0])
+        targets = array('i')
+        for row in self.rows:
+            targets.extend(bits(row))
+            offsets.append(len(targets))
+        return CSRGraph(self._n, offsets, targets, vertices=self._vertices, size=self.size, name=self.name)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self):
+        return iter(range(self._n))
+
+
+class ComplementView(BitsetGraph):
+    def __init__(self, graph: BitsetGraph):
+        """
+        Initializes a lazy complement of a bitset graph
+
+        Only a reference to the graph is stored. A row of the complement, the vertices within the mask of a vertex that
+        are neither the vertex itself nor adjacent to it, is computed in O(n / w) when it is read.
+        :param graph: the graph to complement
+        """
+
+        super().__init__(graph._rows, vertices=graph.vertices, masks=graph._masks, name='complement of ' + graph.name)
+        self._graph = graph
+        self._index = graph._index
+
+    @property
+    def rows(self) -> List[int]:
+        return [self.row(i) for i in range(self._n)]
+
+    def row(self, i: int) -> int:
+        return self._masks[i] & ~self._rows[i] & ~(1 << i)
+
+    def complement(self) -> BitsetGraph:
+        return self._graph
@@ -3,50 +3,77 @@ This is a module for the color refinement algorithm
 version: 20-3-18, Claudia Reuvers & Dorien Meijer Cluwen
 """
 import time
+from collections import deque
 from typing import Dict
 
 import preprocessing
 from basicpermutationgroup import order_computation, member_of
+from bitset import BitsetGraph
 from color_refinement_helper import *
+from csr import as_csr
 from graph_io import *
 from permv2 import Permutation
 from tools import IsomorphismMapping, update_known_isomorphisms
 from tree_refinement import tree_isomorphism
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 IsomorphismMapping = Dict[int, Set[int]]
 
+# Graphs up to this order with at least this fraction of all possible edges are refined over adjacency bitsets
+DENSE_ORDER = 1024
+DENSE_DENSITY = 0.03
+
 
-def count_isomorphism(g: Graph, h: Graph, coloring: Coloring, count: bool = True) -> int:
+def count_isomorphism(g: Graph, h: Graph, coloring: Coloring, count: bool = True, graph=None, selector: Selector = None,
+                      statistics: SearchStatistics = None) -> int:
     """
     Returns the number of isomorphisms of `Graph` g and h for a given coloring
 
-    If the coloring is unbalanced, it will return 0.
+    If the coloring is unbalanced, it will return 0. The vertices of g and h are counted in every color class, see
+    `Coloring.track_sides`, so the refinement of a branch ends as soon as the coloring is unbalanced.
     If the coloring defines a bijection, it will return 1.
-    If neither applies, a color class is chosen from which a vertex of graph g is mapped to all possible vertices of
-    graph h in the same color class. For each mapping, the number of isomorphisms is calculated and summed.
+    If neither applies, a color class is chosen by the selector from which a vertex of graph g is mapped to all possible
+    vertices of graph h in the same color class. For each mapping, the number of isomorphisms is calculated and summed.
     :param g: first graph to compare
     :param h: second graph to compare
-    :param coloring: coloring of `Graph` g and h
+    :param coloring: coloring of `Graph` g and h, which is refined in place
     :param count: if `True` the number of isomorphisms is returned, if `False` 0 is returned if no isomorphisms is found
     and 1 is returned when the first isomorphism is found
+    :param graph: the adjacency to refine by, see `refinement_graph`, given by the branches of the search whose coloring
+    is already refined. If not given it is built and the coloring is refined first.
+    :param selector: the selector of the color class to branch on, see `SELECTORS`, `first_cell` if not given
+    :param statistics: optional statistics to count the nodes of the search in
     :return: the number of isomorphisms of graph g and h for a given coloring
     """
 
-    new_coloring = fast_color_refine(coloring)
+    new_coloring = coloring
+    if graph is None:
+        graph = refinement_graph(coloring.vertices)
+        new_coloring.track_sides(g, h)
+        fast_color_refine(new_coloring, graph)
     coloring_status = new_coloring.status(g, h)
+    if statistics is not None:
+        statistics.add(coloring_status)
 
     if coloring_status == "Unbalanced":
         return 0
     if coloring_status == "Bijection":
         return 1
 
-    vertices = choose_color(new_coloring)
+    vertices = choose_color(new_coloring, selector)
     first_vertex = choose_vertex(vertices, g)
     vertices_in_h = (v for v in vertices if v.in_graph(h))
     number_isomorphisms = 0
     for second_vertex in vertices_in_h:
-        adapted_coloring = create_new_color_class(new_coloring, first_vertex, second_vertex)
-        number_isomorphisms += count_isomorphism(g, h, adapted_coloring, count)
+        # Branch on the coloring itself and undo the branch afterwards instead of copying the coloring
+        mark = new_coloring.save()
+        refine_individualized(new_coloring, first_vertex, second_vertex, graph)
+        number_isomorphisms += count_isomorphism(g, h, new_coloring, count, graph, selector, statistics)
+        new_coloring.restore(mark)
 
         if not count and number_isomorphisms > 0:
             return number_isomorphisms
@@ -97,7 +124,42 @@ def color_refine(coloring: Coloring) -> Coloring:
     return coloring
 
 
-def fast_color_refine(coloring: Coloring) -> Coloring:
+def is_dense(vertices: Iterable[Vertex]) -> bool:
+    """
+    Returns whether the vertices have enough edges among them for the bitset form of their adjacency to pay off
+
+    :param vertices: the vertices of the graph, as in a coloring
+    :return: `True` if the graph has at most `DENSE_ORDER` vertices and a fraction of at least `DENSE_DENSITY` of all
+    possible edges
+    """
+
+    n = len(vertices)
+    if n < 2 or n > DENSE_ORDER:
+        return False
+    return sum(v.degree for v in vertices) >= DENSE_DENSITY * n * (n - 1)
+
+
+def refinement_graph(vertices: Iterable[Vertex], graph=None) -> Union[CSRGraph, BitsetGraph]:
+    """
+    Returns the adjacency `fast_color_refine` refines by, so that a search can build it once for all its refinements
+
+    :param vertices: the colored vertices
+    :param graph: Optional adjacency whose vertices are the colored vertices, e.g. a `ComplementView`; the neighbours
+    of the colored vertices are used if not given
+    :return: the adjacency bitsets if the graph is dense (see `is_dense`) or given as a `BitsetGraph`, the CSR form
+    otherwise
+    """
+
+    if type(graph) is BitsetGraph:
+        return graph
+    if isinstance(graph, BitsetGraph) or graph is None and is_dense(vertices):
+        if graph is None:
+            graph = BitsetGraph.from_csr(CSRGraph.from_vertices(vertices))
+        return BitsetGraph(graph.rows, vertices=graph.vertices)
+    return CSRGraph.from_vertices(vertices) if graph is None else as_csr(graph)
+
+
+def fast_color_refine(coloring: Coloring, graph=None, colors: Iterable[int] = None) -> Coloring:
     """
     The fast color refine algorithm refines a given coloring by looking at the amount of neighbours of a given color.
     A queue is used to keep track of colors for which we still have to check if they lead to refinements.
@@ -105,94 +167,195 @@ def fast_color_refine(coloring: Coloring) -> Coloring:
     and the others receive a new unused color i_l. One or more of the new classes are then added to the queue.
     For this the following rule is used:
     1. if color 'i' is already in the queue, add all new color classes i_l to the queue as well.
-    2. if color 'i' is not in the queue, add the smallest 'new' (i or one of the i_l) color class to the queue.
-    The algorithm stops when the queue is empty (and starts with all current colors of the given coloring in the queue).
+    2. if color 'i' is not in the queue, add all classes (i and the i_l) except the largest one to the queue.
+    The algorithm stops when the queue is empty (and starts with all current colors of the given coloring in the queue,
+    or with the given colors).
+    As in Hopcroft's algorithm only the neighbours of the popped color are counted, see `count_neighbours`, and only
+    the vertices that were counted are moved: the vertices of a class without neighbours of the popped color keep color
+    'i', or the vertices with the fewest such neighbours if every vertex has one. Together with rule 2 this refines in
+    O((n + m) log n) time.
+    The neighbours of a color are counted over the CSR form of the graph, or over its adjacency bitsets when the graph
+    is dense (see `is_dense`) or given as a `BitsetGraph`. Both give the same coloring.
+    The refinement stops as soon as the coloring is unbalanced when it counts the vertices of two graphs, see
+    `Coloring.track_sides`, as it stays unbalanced from then on.
     : param coloring: Given coloring which needs refinement
-    : return: The refined coloring of the graph
+    : param graph: Optional adjacency to refine by whose vertices are the colored vertices, e.g. a `ComplementView` or
+    the result of `refinement_graph`; the neighbours of the colored vertices are used if not given
+    : param colors: Optional colors to start the queue with. Only the classes that changed since the coloring was last
+    stable have to be given, see `refine_individualized`
+    : return: The refined coloring of the graph, or the coloring after the split at which it became unbalanced
     """
 
-    # Push the first color into the queue
-    queue = DoubleLinkedList()
-    for c in sorted(coloring.colors):
-        queue.append(c)
+    if coloring.is_unbalanced():
+        return coloring
+
+    # The vertices do not change during refinement, so their adjacency is built once
+    adjacency = refinement_graph(coloring.vertices, graph)
+    if isinstance(adjacency, BitsetGraph):
+        def count(color):
+            return count_neighbours_with_bitsets(coloring, color, adjacency)
+    else:
+        def count(color):
+            return count_neighbours(coloring, color, adjacency)
+    vertices = adjacency.vertices
+
+    # Push the colors into the queue, the set holds the colors that are in the queue
+    queue = deque(sorted(coloring.colors) if colors is None else dict.fromkeys(colors))
+    in_queue = set(queue)
     debug('Queue', queue)
 
-    while len(queue) > 0:
+    while queue:
         # Start refining with the first color from the queue
-        current_color = queue.pop_left()
-        counter = generate_neighbour_count_with_color(coloring, current_color)
-
-        # Loop over all the colors in the graph and refine them
-        for color_class in counter.keys():
+        current_color = queue.popleft()
+        in_queue.remove(current_color)
+
+        # Bucket the counted vertices by color and then by their number of neighbours of current_color
+        cells = {}
+        for u, n_neighbours in count(current_color).items():
+            v = vertices[u]
+            cells.setdefault(coloring.color(v), {}).setdefault(n_neighbours, []).append(v)
+
+        # The classes are split in order of color, so both ways of counting give the same colors
+        for color_class in sorted(cells):
+            buckets = cells[color_class]
+            uncounted = coloring.size(color_class) - sum(len(bucket) for bucket in buckets.values())
+            if uncounted == 0 and len(buckets) == 1:
+                continue
             debug('Refining the following color:', color_class)
-            neighbour_map = counter[color_class]
-
-            # Partition class 'c' into cells according to #neighbours of current_color
-            vertices_of_c = list(neighbour_map.keys())
-            debug('Vertices of color', color_class, vertices_of_c)
-            debug('Neighbours', neighbour_map)
-
-            # Keep split_count so the first vertices you encounter are not recolored
-            split_count = 0
-
-            # Keep a list of the color_classes from this iteration so we can count them afterwards and see which one is
-            # the smallest and should be added to the queue
-            new_color_classes = []
-
-            while len(vertices_of_c) > 0:
-                u = vertices_of_c.pop()
-                new_color = color_class
-
-                if split_count > 0:
-                    new_color = coloring.next_color()
-                    coloring.recolor(u, new_color)
-
-                for v in list(vertices_of_c):
-                    n_neighbours_u = neighbour_map[u]
-                    n_neighbours_v = neighbour_map[v]
-
-                    # Compare the amount of neighbours of u with the amount of neighbours of v
-                    # If they are equal u and v are in the same cell
-                    # If the split count is larger then zero they should both be colored with the same color
-                    if n_neighbours_u == n_neighbours_v:
-                        if split_count > 0:
-                            coloring.recolor(v, new_color)
-                        vertices_of_c.remove(v)
-
-                split_count += 1
-                # Each color_class is added to the list
-                new_color_classes.append(new_color)
 
-            # Initialize 'largest_color' with the first color class, because this is the original color
-            largest_color = new_color_classes[0]
+            # The uncounted vertices keep the color, otherwise those with the fewest neighbours of current_color do
+            cells_to_move = [buckets[n_neighbours] for n_neighbours in sorted(buckets)]
+            if uncounted == 0:
+                cells_to_move.pop(0)
 
-            if split_count > 1:
-                debug('New color classes:', new_color_classes)
+            new_color_classes = [color_class]
+            for cell in cells_to_move:
+                new_color = coloring.next_color()
+                for v in cell:
+                    coloring.recolor(v, new_color)
+                new_color_classes.append(new_color)
+            debug('New color classes:', new_color_classes)
 
-                # If the original color is in the queue, all the other colors should be added to the queue
-                if queue.find(color_class) is not None:
-                    for color in new_color_classes:
-                        if queue.find(color) is None:
-                            queue.append(color)
+            # If the original color is in the queue, all the other colors should be added to the queue, otherwise all
+            # the colors except the largest
+            if color_class in in_queue:
+                new_color_classes.pop(0)
+            else:
+                new_color_classes.remove(max(new_color_classes, key=coloring.size))
+            queue.extend(new_color_classes)
+            in_queue.update(new_color_classes)
+            if coloring.is_unbalanced():
+                debug('Unbalanced at', current_color, color_class)
+                return coloring
 
-                # Otherwise all the colors except the largest should be added to the queue
-                else:
-                    for color in new_color_classes:
-                        if len(coloring.get(largest_color)) > len(coloring.get(color)):
-                            if queue.find(color) is None:
-                                queue.append(color)
-                        else:
-                            if queue.find(largest_color) is None:
-                                queue.append(largest_color)
-                            largest_color = color
-
-            debug('Queue', queue)
         debug('Queue', queue)
     return coloring
 
 
+def refine_individualized(coloring: Coloring, vertex1: Vertex, vertex2: Vertex, graph=None) -> Coloring:
+    """
+    Individualizes two vertices of the same class of a stable coloring, see `individualize`, and refines the coloring
+
+    Since the coloring was stable, only the new class of the two vertices and the class they were taken from can split
+    other classes, so the queue of `fast_color_refine` starts with just these two. The refinement then takes time
+    proportional to the neighbourhoods of the classes that split, instead of all edges.
+    :param coloring: a stable coloring, which is changed
+    :param vertex1: vertex to be in the separate color
+    :param vertex2: vertex to be in the separate color
+    :param graph: the adjacency to refine by, see `refinement_graph`, which is built from the coloring if not given
+    :return: the refined coloring
+    """
+
+    parent = coloring.color(vertex1)
+    new_color = individualize(coloring, vertex1, vertex2)
+    return fast_color_refine(coloring, graph, [new_color, parent])
+
+
+def numpy_color_refine(coloring: Coloring, graph=None) -> Coloring:
+    """
+    Refines a coloring to the same stable coloring as `fast_color_refine`, doing every round of 1-dimensional
+    Weisfeiler-Leman refinement as NumPy array operations instead of a Python loop, for graphs with 10^5 and more
+    vertices
+
+    Every round gathers the colors of all neighbours through the CSR targets, and hashes the multiset of neighbour
+    colors of every vertex into two sums of random 64-bit values, one value per color for each sum. The (color, hash,
+    hash) triples are relabeled with `numpy.unique`, and the rounds stop when no class splits. A hash collision could
+    keep two vertices together that should be split, so the result is checked to be stable and refined further by
+    `fast_color_refine` if it is not.
+    The number of rounds is the number of times a split has to travel through the graph, which for a long path is its
+    length, so `fast_color_refine` is faster on graphs of large diameter.
+    : param coloring: Given coloring which needs refinement, it is not changed
+    : param graph: Optional adjacency to refine by whose vertices are the colored vertices, the neighbours of the
+    colored vertices are used if not given
+    : return: A new coloring, refined
+    : raises ImportError if NumPy is not installed
+    """
+
+    if numpy is None:
+        raise ImportError('numpy_color_refine requires NumPy')
+
+    csr = CSRGraph.from_vertices(coloring.vertices) if graph is None else as_csr(graph)
+    vertices = csr.vertices
+    if not vertices:
+        return coloring.copy()
+    offsets = numpy.asarray(csr.offsets, dtype=numpy.int64)
+    targets = numpy.asarray(csr.targets, dtype=numpy.int64)
+
+    colors = numpy.unique([coloring.color(v) for v in vertices], return_inverse=True)[1].reshape(-1)
+    n_colors = int(colors.max()) + 1
+    values = numpy.random.RandomState(0).randint(0, 2 ** 63, size=(2, len(vertices)), dtype=numpy.int64)
+    values = values.view(numpy.uint64)
+    sums = numpy.zeros((2, len(targets) + 1), dtype=numpy.uint64)
+
+    while True:
+        # The sums over the neighbours of every vertex are differences of the running sums at the CSR offsets
+        numpy.cumsum(values[:, colors[targets]], axis=1, out=sums[:, 1:])
+        hashes = sums[:, offsets[1:]] - sums[:, offsets[:-1]]
+        keys = numpy.stack((colors.astype(numpy.uint64), hashes[0], hashes[1]), axis=1)
+        colors = numpy.unique(keys, axis=0, return_inverse=True)[1].reshape(-1)
+        if int(colors.max()) + 1 == n_colors:
+            break
+        n_colors = int(colors.max()) + 1
+
+    refined = Coloring()
+    order = numpy.argsort(colors, kind='stable')
+    bounds = numpy.searchsorted(colors[order], numpy.arange(n_colors + 1))
+    for color in range(n_colors):
+        refined.add([vertices[i] for i in order[bounds[color]:bounds[color + 1]]], color)
+
+    if not is_stable(colors, offsets, targets):
+        fast_color_refine(refined, csr)
+    return refined
+
+
+def is_stable(colors: "numpy.ndarray", offsets: "numpy.ndarray", targets: "numpy.ndarray") -> bool:
+    """
+    Returns whether all vertices of every color have the same number of neighbours of every color
+
+    : param colors: the color of every vertex, numbered from 0
+    : param offsets: the CSR offsets of the graph
+    : param targets: the CSR targets of the graph
+    : return: `True` if the coloring is stable
+    """
+
+    n_colors = int(colors.max()) + 1
+    sources = numpy.repeat(numpy.arange(len(colors)), numpy.diff(offsets))
+    pairs, counts = numpy.unique(sources * n_colors + colors[targets], return_counts=True)
+    # Every vertex of a color that has a neighbour of some color must have the same number of them
+    groups = colors[pairs // n_colors] * n_colors + pairs % n_colors
+    order = numpy.argsort(groups, kind='stable')
+    groups, counts = groups[order], counts[order]
+    keys, starts, members = numpy.unique(groups, return_index=True, return_counts=True)
+    if len(keys) == 0:
+        return True
+    sizes = numpy.bincount(colors, minlength=n_colors)
+    return bool((members == sizes[keys // n_colors]).all() and
+                (numpy.minimum.reduceat(counts, starts) == numpy.maximum.reduceat(counts, starts)).all())
+
+
 def get_number_isomorphisms(g: Graph, h: Graph, coloring: Coloring, count: bool,
-                            modular_decomposition_factor: int = 1) -> int:
+                            modular_decomposition_factor: int = 1, selector: Selector = None,
+                            statistics: SearchStatistics = None) -> int:
     """
     Returns the number of isomorphisms of graph g and h
 
@@ -204,12 +367,15 @@ def get_number_isomorphisms(g: Graph, h: Graph, coloring: Coloring, count: bool,
     :param Graph g: graph for which to determine the number of isomorphisms
     :param Graph h: graph for which to determine the number of isomorphisms
     :param count: whether the number of isomorphisms
+    :param selector: the selector of the color class to branch on, see `SELECTORS`
+    :param statistics: optional statistics to count the nodes of the search in
     :return: The number of isomorphisms of graph g and h
     """
-    return modular_decomposition_factor * count_isomorphism(g, h, coloring, count)
+    return modular_decomposition_factor * count_isomorphism(g, h, coloring, count, selector=selector,
+                                                            statistics=statistics)
 
 
-def is_isomorphisms(g: Graph, h: Graph) -> bool:
+def is_isomorphisms(g: Graph, h: Graph, selector: Selector = None, statistics: SearchStatistics = None) -> bool:
     """
     Returns whether the two graphs are isomorphic
 
@@ -217,6 +383,8 @@ def is_isomorphisms(g: Graph, h: Graph) -> bool:
     isomorphisms. When the number of isomorphisms is 0, graphs are not isomorphic. Otherwise, the graphs are isomorphic.
     :param Graph g: One graph to compare for isomorphism.
     :param Graph h: Another graph to compare for isomorphism.
+    :param selector: the selector of the color class to branch on, see `SELECTORS`
+    :param statistics: optional statistics to count the nodes of the search in
     :return: `True` if graph g and h are isomorphic, `False` otherwise
     """
 
@@ -241,7 +409,7 @@ def is_isomorphisms(g: Graph, h: Graph) -> bool:
                 for i in range(len(md_iso_groups_g_h)):
                     coloring.add(md_iso_groups_g_h[i])
 
-                return get_number_isomorphisms(g, h, coloring, False) > 0
+                return get_number_isomorphisms(g, h, coloring, False, selector=selector, statistics=statistics) > 0
         else:
             return False
 
@@ -261,15 +429,17 @@ def modular_decomposition(g: Graph, h: Graph) -> (bool, Graph, Graph, int, [[Ver
     return True, g, h, modular_decomposition_factor, md_iso_groups_g, md_iso_groups_h
 
 
-def get_number_automorphisms(g: Graph) -> int:
+def get_number_automorphisms(g: Graph, selector: Selector = None, statistics: SearchStatistics = None) -> int:
     """
     Returns the number of automorphisms of graph g
 
     The algorithm of `compute_generators` is used with graph g and a copy of graph g.
     :param g: graph for which to determine the number of automorphisms.
+    :param selector: the selector of the color class to branch on, see `SELECTORS`
+    :param statistics: optional statistics to count the nodes of the search in
     :return: The number of automorphisms of graph g
     """
-    copy_g = g.deepcopy()
+    copy_g = g.clone()
     _, g, copy_g, factor, md_iso_groups_g, md_iso_groups_h = modular_decomposition(g, copy_g)
     md_iso_groups_g_h = [group_g + group_h for group_g, group_h in zip(md_iso_groups_g, md_iso_groups_h)]
 
@@ -281,14 +451,13 @@ def get_number_automorphisms(g: Graph) -> int:
     coloring = initialize_coloring(g + copy_g)
     for i in range(len(md_iso_groups_g_h)):
         coloring.add(md_iso_groups_g_h[i])
-    lastvisited = [coloring]
-    generators = []
-    generators, _ = compute_generators(g, copy_g, coloring, generators=generators, lastvisited=lastvisited)
+    generators = compute_generators(g, copy_g, coloring, selector=selector, statistics=statistics)
     return factor * order_computation(generators)
 
 
-def compute_generators(g: Graph, h: Graph, start_coloring: Coloring, generators: list() = [],
-                       lastvisited: list() = list()) -> (list(), list()):
+def compute_generators(g: Graph, h: Graph, coloring: Coloring, generators: List[Permutation] = None,
+                       trivial: bool = True, graph=None, selector: Selector = None,
+                       statistics: SearchStatistics = None) -> List[Permutation]:
     """
     Computes a set of generators of the mapping from graph g to graph h
 
@@ -297,66 +466,71 @@ def compute_generators(g: Graph, h: Graph, start_coloring: Coloring, generators:
     If the coloring then defines a bijection, it is checked whether this mapping is already in the set of generators. If
     not, the permutation is added to the set. In both cases, the coloring is put back to the last visited trivial
     mapping.
-    When the coloring is undecided, the coloring branches. The first pick is the trivial mapping (if possible) and the
-    generating set is computed recursively. Thereafter, the non-trivial mapping is computed recursively.
+    When the coloring is undecided, the coloring branches on the color class chosen by the selector, or by default on
+    the first color class with a vertex whose trivial mapping is in it as well (see `choose_color_trivial`). The first
+    pick is the trivial mapping (if possible) and the generating set is computed recursively. Thereafter, the
+    non-trivial mapping is computed recursively.
+    Every branch changes the coloring in place and restores it afterwards, see `Coloring.save`, so the coloring is
+    refined but otherwise unchanged when this returns.
     :param Graph g: graph to determine the generators from
     :param Graph h: graph to be mapped to
-    :param Coloring start_coloring: an unstable coloring
-    :param set generators: list of generators
-    :param DoubleLinkedList lastvisited: list of lastvisited trivial mappings
-    :return (list, [Coloring]): a list of generators of the mapping from graph g to h
+    :param Coloring coloring: an unstable coloring
+    :param list generators: list of generators, which is extended
+    :param bool trivial: whether all vertices individualized so far were mapped to the vertex with the same id
+    :param graph: the adjacency to refine by, see `refinement_graph`, given by the branches whose coloring is already
+    refined
+    :param selector: the selector of the color class to branch on, see `SELECTORS`, the default described above if not
+    given
+    :param statistics: optional statistics to count the nodes of the search in
+    :return list: a list of generators of the mapping from graph g to h
     """
-    # Do colorrefinement -> returns stable or unbalanced coloring
-    is_previous_node_trivial = start_coloring in lastvisited
-    new_coloring = fast_color_refine(start_coloring)
-    coloring_status = new_coloring.status(g, h)
+    if generators is None:
+        generators = []
+    # Do colorrefinement -> returns stable or unbalanced coloring, the branches refine incrementally
+    if graph is None:
+        graph = refinement_graph(coloring.vertices)
+        coloring.track_sides(g, h)
+        fast_color_refine(coloring, graph)
+    coloring_status = coloring.status(g, h)
+    if statistics is not None:
+        statistics.add(coloring_status)
     # # No automorphism with given coloring
     if coloring_status == "Unbalanced":
-        return generators, lastvisited
+        return generators
     # Unique automorphism
     elif coloring_status == "Bijection":
-        perm_f = Permutation(len(g.vertices), coloring=new_coloring, g=g)
+        perm_f = Permutation(len(g.vertices), coloring=coloring, g=g)
         # is this coloring already in the set of colorings?
         if len(generators) == 0 or not member_of(perm_f, generators):
             # put f in the set and return to last visited node
             generators.append(perm_f)
-        return generators, lastvisited
+        return generators
     # Undecided
     else:
-        # choose branching vertex x and cell C
-        chosen_vertex_g, vertices = choose_color_trivial(new_coloring, g)
-        if chosen_vertex_g is None:
-            vertices = choose_color(new_coloring)
-            chosen_vertex_g = choose_vertex(vertices, g)
+        # choose branching vertex x and cell C, x has a trivial mapping if possible
+        if selector is None:
+            chosen_vertex_g, vertices = choose_color_trivial(coloring, g)
+            if chosen_vertex_g is None:
+                vertices = choose_color(coloring)
+                chosen_vertex_g = choose_vertex(vertices, g)
+        else:
+            vertices = choose_color(coloring, selector)
+            chosen_vertex_g = choose_vertex_trivial(vertices, g)
         vertices_in_h = [v for v in vertices if v.in_graph(h)]
         trivial_mapping, non_trivial_mapping = get_mappings(chosen_vertex_g, vertices_in_h)
-        # add this coloring to a map
-        # if this coloring is not trivial: only do left branch (if there is a trivial, do trivial, else, do one of non_trivial)
-        if not is_previous_node_trivial:
-            if trivial_mapping is not None:
-                # lastvisited[coloring] = is_trivial
-                trivial_coloring = create_new_color_class(new_coloring, chosen_vertex_g, trivial_mapping)
-                generators, lastvisited = compute_generators(g, h, trivial_coloring, generators=generators,
-                                                             lastvisited=lastvisited)
-            else:
-                # lastvisited[coloring] = is_trivial
-                adapted_coloring = create_new_color_class(new_coloring, chosen_vertex_g, non_trivial_mapping[0])
-                generators, lastvisited = compute_generators(g, h, adapted_coloring, generators=generators,
-                                                             lastvisited=lastvisited)
-        # if coloring is trivial: do all branches
-        else:
-            if trivial_mapping is not None:
-                # lastvisited[coloring] = True
-                trivial_coloring = create_new_color_class(new_coloring, chosen_vertex_g, trivial_mapping)
-                lastvisited.append(trivial_coloring)
-                generators, lastvisited = compute_generators(g, h, trivial_coloring, generators=generators,
-                                                             lastvisited=lastvisited)
-                # lastvisited[coloring] = False
-            for second_vertex in non_trivial_mapping:
-                adapted_coloring = create_new_color_class(new_coloring, chosen_vertex_g, second_vertex)
-                generators, lastvisited = compute_generators(g, h, adapted_coloring, generators=generators,
-                                                             lastvisited=lastvisited)
-    return generators, lastvisited
+
+        # if this coloring is not trivial: only do left branch (if there is a trivial, do trivial, else, do one of
+        # non_trivial), if it is trivial: do all branches, of which only the trivial one is trivial again
+        branches = [] if trivial_mapping is None else [(trivial_mapping, trivial)]
+        branches += [(second_vertex, False) for second_vertex in non_trivial_mapping]
+        if not trivial:
+            branches = branches[:1]
+        for second_vertex, is_trivial in branches:
+            mark = coloring.save()
+            refine_individualized(coloring, chosen_vertex_g, second_vertex, graph)
+            compute_generators(g, h, coloring, generators, is_trivial, graph, selector, statistics)
+            coloring.restore(mark)
+    return generators
 
 
 def process(graphs: List[Graph]) -> IsomorphismMapping:
@@ -1,9 +1,11 @@
 """
 Module with helper methods for the Color Refinement Algorithm
 """
-from typing import Iterable
+from typing import Callable, Dict, Iterable
 
+from bitset import BitsetGraph, bits, popcount
 from coloring import *
+from csr import CSRGraph
 from graph import Graph
 from tools import create_graph_helper
 
@@ -45,12 +47,25 @@ def create_new_color_class(coloring: Coloring, vertex1: Vertex, vertex2: Vertex)
     :return: a new coloring with vertex1 and vertex2 together as a new color class
     """
     new_coloring = coloring.copy()
-    new_color = new_coloring.next_color()
-    new_coloring.recolor(vertex1, new_color)
-    new_coloring.recolor(vertex2, new_color)
+    individualize(new_coloring, vertex1, vertex2)
     return new_coloring
 
 
+def individualize(coloring: Coloring, vertex1: Vertex, vertex2: Vertex) -> int:
+    """
+    Moves both vertices to the same new color class, see `create_new_color_class` for a new coloring
+
+    :param coloring: current coloring, which is changed
+    :param vertex1: vertex to be in the separate color
+    :param vertex2: vertex to be in the separate color
+    :return: the new color
+    """
+    new_color = coloring.next_color()
+    coloring.recolor(vertex1, new_color)
+    coloring.recolor(vertex2, new_color)
+    return new_color
+
+
 def has_same_color_neighbours(u: Vertex, v: Vertex, coloring: Coloring) -> bool:
     """
     Returns whether the vertices u and v have the same colored neighbourhood for the given coloring
@@ -65,19 +80,126 @@ def has_same_color_neighbours(u: Vertex, v: Vertex, coloring: Coloring) -> bool:
     return compare(ncolors_u, ncolors_v)
 
 
-def choose_color(coloring: Coloring) -> DoubleLinkedList:
+def choose_color(coloring: Coloring, selector: "Selector" = None) -> List[Vertex]:
     """
     Returns a partition cell (aka color class) with at least four vertices
 
-    Returns the first color class with at least four vertices that is found.
+    Returns the color class chosen by the selector, by default the first color class with at least four vertices that
+    is found.
     :param coloring: current coloring
-    :return: a color class with at least four vertices, `None` if no color class could be found
+    :param selector: the selector that chooses the color class, see `SELECTORS`, `first_cell` if not given
+    :return: a color class with at least four vertices, an empty list if no color class could be found
+    """
+    color = (selector or first_cell)(coloring)
+    return [] if color is None else coloring.get(color)
+
+
+def target_cells(coloring: Coloring) -> List[int]:
+    """
+    Returns the colors of the cells that a search can branch on, those with an even number of at least four vertices
+
+    Cells with two vertices map a vertex of one graph to the other already, and cells with an odd number of vertices
+    are unbalanced.
+    :param coloring: current coloring
+    :return: the colors of the cells to branch on, in the order of the colors
+    """
+    return [color for color in coloring.colors if coloring.size(color) >= 4 and coloring.size(color) % 2 == 0]
+
+
+def first_cell(coloring: Coloring) -> Union[int, None]:
+    """
+    Selects the first cell to branch on, see `target_cells`
+
+    :param coloring: current coloring
+    :return: the color of the cell, `None` if there is none
     """
     for color in coloring.colors:
-        vertices = coloring.get(color)
-        if len(vertices) >= 4 and len(vertices) % 2 == 0:
-            return vertices
-    return DoubleLinkedList()
+        size = coloring.size(color)
+        if size >= 4 and size % 2 == 0:
+            return color
+    return None
+
+
+def largest_cell(coloring: Coloring) -> Union[int, None]:
+    """
+    Selects the largest cell to branch on, the first of them if there are more
+
+    :param coloring: current coloring
+    :return: the color of the cell, `None` if there is none
+    """
+    return max(target_cells(coloring), key=coloring.size, default=None)
+
+
+def smallest_cell(coloring: Coloring) -> Union[int, None]:
+    """
+    Selects the smallest cell to branch on, the first of them if there are more
+
+    Individualizing a vertex of a small cell gives few branches, but it may split few other cells.
+    :param coloring: current coloring
+    :return: the color of the cell, `None` if there is none
+    """
+    return min(target_cells(coloring), key=coloring.size, default=None)
+
+
+def most_joined_cell(coloring: Coloring) -> Union[int, None]:
+    """
+    Selects the cell to branch on that is non-trivially joined to the most other cells to branch on, as nauty does
+
+    A cell is non-trivially joined to another when its vertices have some but not all vertices of the other cell on
+    their side as neighbours, so individualizing one of its vertices is likely to split the other cell. The coloring
+    is stable and balanced when a search branches, so one vertex of every cell is counted, and half of every cell is on
+    its side.
+    :param coloring: current coloring
+    :return: the color of the cell, the first of them if there are more, `None` if there is none
+    """
+    cells = target_cells(coloring)
+    best, best_joined = None, -1
+    for color in cells:
+        neighbours = group_by(coloring.color(w) for w in coloring.get(color)[0].neighbours)
+        joined = sum(1 for other in cells if 0 < len(neighbours.get(other, ())) < coloring.size(other) // 2)
+        if joined > best_joined:
+            best, best_joined = color, joined
+    return best
+
+
+Selector = Callable[[Coloring], Union[int, None]]
+
+# The selectors by name, a search branches on the cell chosen by its selector
+SELECTORS = {
+    'first': first_cell,
+    'largest': largest_cell,
+    'smallest': smallest_cell,
+    'joined': most_joined_cell,
+}  # type: Dict[str, Selector]
+
+
+class SearchStatistics:
+    def __init__(self):
+        """
+        Initializes the counts of the nodes of a search, see `count_isomorphism` and `compute_generators`
+
+        The counts are added to by every search the statistics are given to, so the statistics of several searches can
+        be compared, e.g. of different selectors.
+        """
+
+        self.nodes = 0
+        self.bijections = 0
+        self.unbalanced = 0
+
+    def add(self, status: Union[str, None]):
+        """
+        Counts a node of a search
+
+        :param status: the status of the coloring at the node, see `Coloring.status`
+        """
+        self.nodes += 1
+        if status == "Bijection":
+            self.bijections += 1
+        elif status == "Unbalanced":
+            self.unbalanced += 1
+
+    def __str__(self) -> str:
+        return 'nodes: {}, bijections: {}, unbalanced: {}'.format(self.nodes, self.bijections, self.unbalanced)
 
 
 def choose_color_trivial(coloring: Coloring, g: Graph) -> (Vertex, [Vertex]):
@@ -116,6 +238,23 @@ def choose_vertex(color: Iterable[Vertex], g: Graph) -> Union[Vertex, None]:
     return None
 
 
+def choose_vertex_trivial(color: Iterable[Vertex], g: Graph) -> Union[Vertex, None]:
+    """
+    Returns a vertex of graph g in the given color class whose trivial mapping, the vertex with the same id, is in the
+    color class as well, see `get_mappings`
+
+    :param color: color class from which the vertex must be chosen
+    :param g: graph of which the vertex must be a part of
+    :return: the first such vertex, or the first vertex of graph g if there is none, `None` if there is no vertex of
+    graph g
+    """
+    ordered = group_by(color, group_rule=lambda v: v.id)
+    for vertex in color:
+        if vertex.in_graph(g) and len(ordered[vertex.id]) == 2:
+            return vertex
+    return choose_vertex(color, g)
+
+
 def graph_to_modules(graph: Graph) -> ModularDecomposition:
     vertices = graph.vertices
     vertices_in_any_module = []
@@ -258,33 +397,95 @@ def initialize_coloring(g: Graph) -> Coloring:
     """
 
     coloring = Coloring()
-    for v in g.vertices:
-        coloring.set(v, v.degree)
+    # Add the vertices class by class, so every vertex is added at the end of its class
+    for degree, vertices in group_by(g.vertices, lambda v: v.degree).items():
+        coloring.add(vertices, degree)
     debug('Init coloring ', coloring)
     return coloring
 
 
-def generate_neighbour_count_with_color(coloring: Coloring, current_color: int) -> {}:
+def generate_neighbour_count_with_color(coloring: Coloring, current_color: int, csr: CSRGraph = None) -> {}:
     """
     This methode creates a mapping from a vertex to the amount of neighbours with current_color.
+
+    The counts are made from the side of current_color: every vertex of that color adds one to each of its neighbours
+    in the CSR form of the colored vertices, so no neighbour lists are built.
+    Refinement counts with `count_neighbours`, which leaves out the vertices without such neighbours. This full count
+    per color class is kept as the reference those counts are tested against.
     :param coloring: coloring used for the counting of the neighbours
     :param current_color: the color which is used to refine the graph
+    :param csr: CSR form of the vertices in the coloring, built from the coloring if not given
     :return: mapping of colors to a vertex-neighbour_count mapping, the vertex-neighbour_count mapping
                 is a dictionary which maps vertices to the amount of neighbours with current_color
     """
 
+    if csr is None:
+        csr = CSRGraph.from_vertices(coloring.vertices)
+    index = csr.index
+    offsets, targets = csr.offsets, csr.targets
+
+    counts = [0] * csr.order
+    for w in coloring.get(current_color):
+        i = index[w]
+        for j in range(offsets[i], offsets[i + 1]):
+            counts[targets[j]] += 1
+
     counter = {}
     for v in coloring.vertices:
-        count = 0
-        for x in v.neighbours:
-            if coloring.color(x) is current_color:
-                count += 1
-        if coloring.color(v) not in counter.keys():
-            counter[coloring.color(v)] = {}
-        counter[coloring.color(v)].update({v: count})
+        counter.setdefault(coloring.color(v), {})[v] = counts[index[v]]
     return counter
 
 
+def count_neighbours(coloring: Coloring, current_color: int, csr: CSRGraph) -> Dict[int, int]:
+    """
+    Counts the neighbours with current_color of the vertices that have at least one
+
+    Only the neighbours of the vertices of current_color are visited, so this takes time proportional to the number of
+    edges at current_color, where `generate_neighbour_count_with_color` visits every vertex in the coloring.
+    :param coloring: coloring used for the counting of the neighbours
+    :param current_color: the color which is used to refine the graph
+    :param csr: CSR form of the vertices in the coloring
+    :return: mapping of the index in csr of every vertex with a neighbour of current_color to its number of such
+    neighbours
+    """
+
+    index = csr.index
+    offsets, targets = csr.offsets, csr.targets
+
+    counts = {}
+    for w in coloring.get(current_color):
+        i = index[w]
+        for j in range(offsets[i], offsets[i + 1]):
+            u = targets[j]
+            counts[u] = counts.get(u, 0) + 1
+    return counts
+
+
+def count_neighbours_with_bitsets(coloring: Coloring, current_color: int, bitsets: BitsetGraph) -> Dict[int, int]:
+    """
+    Counts the neighbours with current_color of the vertices that have at least one, see `count_neighbours`
+
+    The vertices with a neighbour of current_color are the union of the adjacency rows of current_color, and each is
+    counted with `popcount(row & cell)`.
+    :param coloring: coloring used for the counting of the neighbours
+    :param current_color: the color which is used to refine the graph
+    :param bitsets: bitset form of the vertices in the coloring
+    :return: mapping of the index in bitsets of every vertex with a neighbour of current_color to its number of such
+    neighbours
+    """
+
+    index = bitsets.index
+    rows = bitsets.rows
+
+    cell = 0
+    touched = 0
+    for w in coloring.get(current_color):
+        i = index[w]
+        cell |= 1 << i
+        touched |= rows[i]
+    return {u: popcount(rows[u] & cell) for u in bits(touched)}
+
+
 def group_by(obj, group_rule=None) -> dict:
     """
     Group the given object according to the given key.
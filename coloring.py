@@ -4,7 +4,6 @@ This is a module for the Coloring class used in the Color Refinement Algorithm
 # version: 7-3-18, Dorien Meijer Cluwen
 from typing import Iterable
 
-from dll import DoubleLinkedList
 from graph import *
 
 
@@ -13,12 +12,108 @@ class Coloring:
         """
         Initializes the coloring
 
-        Creates a dictionary to store the color classes. Color classes are stored as a key, value-pair where the key is
-        a number (the color) and the value is a list of vertices belonging to that color.
+        The coloring is stored as an ordered partition, as in nauty: all vertices are kept in one list in which every
+        color class is a contiguous range, given by the start and length of the color, and every vertex knows its
+        position in the list. The size of a color class and the next color take O(1) time, and so does splitting a
+        vertex off into a new color class or moving it into the class next to its own, see `recolor`.
+        Recolors can be recorded on a trail and undone, see `save` and `restore`. A color class that becomes empty keeps
+        its color, so restoring can refill it, but it is not part of `colors`, `len` or `items`.
+        The number of vertices of two graphs in every color class can be counted as well, see `track_sides`.
         """
 
-        self._dict = {}
+        self._elements = []
+        self._position = {}
         self._vertex_dict = {}
+        # The colors are kept in the order in which they were created
+        self._start = {}
+        self._length = {}
+        self._next = 0
+        # The recorded recolors as (vertex, old color) and new colors as (None, color), None when not recording
+        self._trail = None
+        # The number of non-empty color classes
+        self._cells = 0
+        # When sides are tracked: the graphs, 1 or -1 for the side of every vertex, the number of vertices of the one
+        # side minus those of the other in every color class and the number of color classes where that is not 0
+        self._graphs = None
+        self._sides = None
+        self._balance = None
+        self._unbalanced = 0
+
+    def _swap(self, i: int, j: int):
+        elements = self._elements
+        elements[i], elements[j] = elements[j], elements[i]
+        self._position[elements[i]] = i
+        self._position[elements[j]] = j
+
+    def _detach(self, vertex: Vertex, to_end: bool = False) -> int:
+        # Move the vertex to the start, or the end, of its color class and take it out of the class, the class is kept
+        # if it becomes empty
+        color = self._vertex_dict[vertex]
+        start = self._start[color]
+        if to_end:
+            position = start + self._length[color] - 1
+        else:
+            position = start
+            self._start[color] = start + 1
+        self._swap(self._position[vertex], position)
+        self._length[color] -= 1
+        if not self._length[color]:
+            self._cells -= 1
+        if self._balance is not None:
+            before = self._balance[color]
+            after = self._balance[color] = before - self._sides[vertex]
+            self._unbalanced += (after != 0) - (before != 0)
+        return position
+
+    def _attach(self, vertex: Vertex, color: int, position: int):
+        # Add the vertex at the given position, which is not part of any color class, to the color class. A new or empty
+        # class starts at the position and a class next to it is extended, otherwise the vertex is moved past the
+        # classes in between by swapping it with their first or last vertex, one swap per class.
+        elements = self._elements
+        start = self._start
+        length = self._length
+        if not length.get(color):
+            start[color] = position
+            length[color] = 1
+            self._cells += 1
+        elif start[color] + length[color] == position:
+            length[color] += 1
+        elif start[color] < position:
+            while True:
+                other = self._vertex_dict[elements[position - 1]]
+                if other == color:
+                    break
+                first = start[other]
+                self._swap(position, first)
+                start[other] = first + 1
+                position = first
+            length[color] += 1
+        else:
+            while True:
+                other = self._vertex_dict[elements[position + 1]]
+                if other == color:
+                    break
+                last = start[other] + length[other] - 1
+                self._swap(position, last)
+                start[other] -= 1
+                position = last
+            start[color] = position
+            length[color] += 1
+
+        self._vertex_dict[vertex] = color
+        if color >= self._next:
+            self._next = color + 1
+        if self._balance is not None:
+            before = self._balance.get(color, 0)
+            after = self._balance[color] = before + self._sides[vertex]
+            self._unbalanced += (after != 0) - (before != 0)
+
+    def _move(self, vertex: Vertex, color: int):
+        # Take the vertex out of its class at the end facing the class it moves to, so that a class next to its own is
+        # extended without moving any other vertex
+        length = self._length.get(color)
+        to_end = bool(length) and self._start[color] > self._start[self._vertex_dict[vertex]]
+        self._attach(vertex, color, self._detach(vertex, to_end))
 
     def set(self, vertex: Vertex, color: int):
         """
@@ -35,9 +130,10 @@ class Coloring:
             raise KeyError('Vertex {} already in coloring, color: {}. '
                            'Use recolor instead'.format(str(vertex), str(self.color(vertex))))
 
-        self._dict.setdefault(color, DoubleLinkedList()).append(vertex)
-        self._vertex_dict[vertex] = color
-        # vertex.colornum = color
+        position = len(self._elements)
+        self._elements.append(vertex)
+        self._position[vertex] = position
+        self._attach(vertex, color, position)
 
     def get(self, color) -> List[Vertex]:
         """
@@ -46,7 +142,17 @@ class Coloring:
         :param color: the number (or color) of the color class
         :return: a list of vertices belonging to the color class
         """
-        return self._dict[color]
+        start = self._start[color]
+        return self._elements[start:start + self._length[color]]
+
+    def size(self, color) -> int:
+        """
+        Returns the number of vertices in the given color class
+
+        :param color: the number (or color) of the color class
+        :return: the number of vertices belonging to the color class
+        """
+        return self._length[color]
 
     def add(self, vertices: List[Vertex], color=None):
         """
@@ -79,6 +185,10 @@ class Coloring:
         """
         Moves the vertex from the old color class color to a new color class (new_color)
 
+        Moving a vertex to a new or empty color class, or to the class next to its old class, takes O(1) time. Moving it
+        to any other class takes time proportional to the number of color classes in between, as the vertex is swapped
+        past every one of them. Color refinement only splits vertices off into new classes, which are created next to
+        the class that is split.
         :param vertex: the vertex to put in another color class
         :param new_color: the color class to put the vertex in
         :raises KeyError when vertex is not found in the coloring
@@ -86,19 +196,95 @@ class Coloring:
         old_color = self.color(vertex)
         if old_color is None:
             raise KeyError('Vertex ' + str(vertex) + ' not found in coloring, use set() instead')
-        else:
-            self._dict[old_color].remove(vertex)
-            self._vertex_dict.pop(vertex)
-            self.set(vertex, new_color)
+        elif old_color != new_color:
+            if self._trail is not None:
+                if new_color not in self._start:
+                    self._trail.append((None, new_color))
+                self._trail.append((vertex, old_color))
+            self._move(vertex, new_color)
+
+    def save(self) -> Tuple[int, int, bool]:
+        """
+        Returns a mark to which the coloring can be restored, and records all recolors from now on
+
+        Marks can be nested, so a search can save the coloring before every branch and restore it afterwards instead of
+        copying it. The memory used is proportional to the number of recolors since the first mark.
+        :return: the mark
+        """
+        started = self._trail is None
+        if started:
+            self._trail = []
+        return len(self._trail), self._next, started
+
+    def restore(self, mark: Tuple[int, int, bool]):
+        """
+        Restores the coloring to a mark by undoing the recorded recolors in reverse order
+
+        Undoing in reverse order returns every vertex to a class next to the class it is in, as every class created
+        since has been emptied and the classes never change order, so restoring takes time proportional to the number
+        of recolors since the mark when those took O(1) time, see `recolor`. Restoring the first mark stops recording.
+        :param mark: a mark returned by `save`, restoring to a mark undoes any later marks as well
+        """
+        size, next_color, started = mark
+        trail = self._trail
+        while len(trail) > size:
+            vertex, color = trail.pop()
+            if vertex is None:
+                del self._start[color]
+                del self._length[color]
+                if self._balance is not None:
+                    del self._balance[color]
+            else:
+                self._move(vertex, color)
+        self._next = next_color
+        if started:
+            self._trail = None
+
+    def track_sides(self, g: Graph, h: Graph):
+        """
+        Counts the vertices of graph g and of graph h in every color class from now on
+
+        The counts are updated on every recolor, which makes `is_unbalanced` and `status` for g and h take O(1) time.
+        :param g: one graph, every colored vertex must be a vertex of g or of h
+        :param h: the other graph
+        :raises KeyError when a colored vertex is not a vertex of g or h
+        """
+
+        self._graphs = (g, h)
+        self._sides = dict.fromkeys(g.vertices, 1)
+        self._sides.update(dict.fromkeys(h.vertices, -1))
+        self._balance = {color: sum(self._sides[vertex] for vertex in self.get(color)) for color in self._start}
+        self._unbalanced = sum(1 for balance in self._balance.values() if balance)
+
+    def side_counts(self, color: int) -> Tuple[int, int]:
+        """
+        Returns the number of vertices of either graph in the given color class, see `track_sides`
+
+        :param color: the number (or color) of the color class
+        :return: the number of vertices of graph g and of graph h in the color class
+        :raises ValueError when the sides are not tracked
+        """
+        if self._balance is None:
+            raise ValueError('The sides of the coloring are not tracked, use track_sides first')
+        length, balance = self._length[color], self._balance[color]
+        return (length + balance) // 2, (length - balance) // 2
+
+    def is_unbalanced(self) -> bool:
+        """
+        Returns whether a color class has more vertices of the one graph than of the other, see `track_sides`
+
+        :return: `True` if a color class is unbalanced, `False` if none is or the sides are not tracked
+        """
+        return self._unbalanced > 0
 
     @property
     def colors(self) -> Iterable[int]:
         """
-        Returns the number (or colors) of the coloring
+        Returns the number (or colors) of the coloring, without the empty color classes
 
         :return: iterable colors of the coloring
         """
-        return iter(self._dict.keys())
+        return (color for color, length in self._length.items() if length)
 
     @property
     def vertices(self) -> Iterable[Vertex]:
@@ -111,36 +297,33 @@ class Coloring:
 
     def __len__(self) -> int:
         """
-        Returns the number of color classes in the coloring
+        Returns the number of non-empty color classes in the coloring
 
         :return: the number of color classes in the coloring
         """
-        return len(self._dict.keys())
+        return self._cells
 
-    def items(self):
+    def items(self) -> List[Tuple[int, List[Vertex]]]:
         """
-        Return a copy of a set of the (color,List[Vertex]) pairs in the Coloring
-        :return: set of (color,DoubleLinkedList()) pairs
+        Return the (color,List[Vertex]) pairs in the Coloring, without the empty color classes
+        :return: list of (color,List[Vertex]) pairs
         """
-        return self._dict.items()
+        return [(color, self.get(color)) for color, length in self._length.items() if length]
 
     def next_color(self) -> int:
         """
         Returns the next number (or color) for a color class
 
         It returns the number for the next color class. It returns 0 if there is not yet a coloring defined. If a
-        coloring is initiated, the next number is the length of the dictionary + 1.
+        coloring is initiated, the next number is the largest color + 1.
         :return:
         """
-        if self._dict:
-            return max(self._dict.keys()) + 1
-        else:
-            return 0
+        return self._next
 
     def __str__(self) -> str:
         return "{ " + ', '.join(
-            str(color) + "(" + str(len(self._dict[color])) + "): [" + ', '.join(str(v) for v in self._dict[color]) + "]"
-            for color in self._dict.keys()
+            str(color) + "(" + str(self._length[color]) + "): [" + ', '.join(str(v) for v in self.get(color)) + "]"
+            for color in self.colors
         ) + " }"
 
     def status(self, g: Graph, h: Graph) -> Union[str, None]:
@@ -151,14 +334,22 @@ class Coloring:
         the graph g and the other to graph h.
         The status of the coloring is unbalanced when one of the color classes has an odd length.
         The status is `None` if the coloring is neither unbalanced nor defines a bijection.
+        Empty color classes, which a recolor can leave behind, are ignored.
+        If the sides of g and h are tracked, see `track_sides`, the status follows from the counts without looking at
+        the color classes.
         :param g: graph g
         :param h: graph h
         :return: "Bijection" when coloring defines a bijection, "Unbalanced" if unbalanced, `None` otherwise
         """
 
+        if self._graphs is not None and self._graphs[0] is g and self._graphs[1] is h:
+            if self._unbalanced:
+                return "Unbalanced"
+            # Every class is balanced, so there are as many classes as pairs of vertices iff every class is a pair
+            return "Bijection" if 2 * self._cells == len(self._elements) else None
+
         maybe = False
-        for color in self.colors:
-            vertices = self.get(color)
+        for color, vertices in self.items():
             if len(vertices) % 2 == 1:
                 return "Unbalanced"
             else:
@@ -179,11 +370,23 @@ class Coloring:
         """
         Returns a copy of the coloring
 
-        Note that the copy uses the same vertices
+        Note that the copy uses the same vertices. Empty color classes are not copied.
         :return: a copy of the coloring
         """
 
         new_coloring = Coloring()
-        for c, v in self.items():
-            new_coloring.add(v, color=c)
+        new_coloring._elements = list(self._elements)
+        new_coloring._position = dict(self._position)
+        new_coloring._vertex_dict = dict(self._vertex_dict)
+        for color, length in self._length.items():
+            if length:
+                new_coloring._start[color] = self._start[color]
+                new_coloring._length[color] = length
+                new_coloring._next = max(new_coloring._next, color + 1)
+        new_coloring._cells = self._cells
+        if self._balance is not None:
+            new_coloring._graphs = self._graphs
+            new_coloring._sides = self._sides
+            new_coloring._balance = {color: self._balance[color] for color in new_coloring._start}
+            new_coloring._unbalanced = self._unbalanced
         return new_coloring
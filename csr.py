@@ -0,0 +1,241 @@
+"""
+This is a module for a compact, integer-indexed representation of graphs in compressed sparse row (CSR) form
+"""
+from array import array
+from typing import Any, Dict, Iterable, List, Sequence, Union
+
+from graph import Graph, Vertex, edge_pairs
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class CSRGraph:
+    def __init__(self, n: int, offsets: array, targets: array, vertices: Sequence = None, size: int = None,
+                 name: str = 'G'):
+        """
+        Initializes a graph in compressed sparse row form
+
+        The vertices are the integers 0..n-1. The neighbours of vertex i are stored in
+        `targets[offsets[i]:offsets[i + 1]]`, so a graph with n vertices and m undirected edges is stored in n + 1 + 2m
+        machine integers. Every neighbour occurs once per row, loops included, just like `Vertex.neighbours`.
+        :param n: the number of vertices
+        :param offsets: array of length n + 1 with the start of every row in `targets`
+        :param targets: array with the concatenated neighbour rows
+        :param vertices: optional sequence mapping an index to the object it represents, e.g. a `Vertex`
+        :param size: the number of edges, computed from the rows if not given
+        :param name: optional name for the graph
+        """
+
+        self._n = n
+        self._offsets = offsets
+        self._targets = targets
+        self._view = memoryview(targets)
+        self._vertices = vertices if vertices is not None else range(n)
+        self._index = None
+        self._name = name
+
+        if size is None:
+            loops = sum(1 for i in range(n) for j in self._row(i) if targets[j] == i)
+            size = (len(targets) + loops) // 2
+        self._size = size
+
+    @classmethod
+    def from_edge_array(cls, n: int, edges: Any, name: str = 'G') -> "CSRGraph":
+        """
+        Builds a graph on the vertices 0..n-1 from a sequence of (tail, head) pairs
+
+        The rows are filled with a counting sort over the endpoints, so construction takes O(n + m) time and never
+        creates per-edge objects.
+        :param n: the number of vertices
+        :param edges: the (tail, head) pairs of vertex indices, see `graph.edge_pairs` for the accepted forms
+        :param name: optional name for the graph
+        :return: the graph in CSR form
+        """
+
+        if numpy is not None and isinstance(edges, numpy.ndarray):
+            return cls._from_numpy_edge_array(n, edges, name)
+
+        tails = array('i')
+        heads = array('i')
+        for tail, head in edge_pairs(edges):
+            tails.append(tail)
+            heads.append(head)
+
+        degrees = array('i', [0]) * (n + 1)
+        for tail, head in zip(tails, heads):
+            degrees[tail] += 1
+            if tail != head:
+                degrees[head] += 1
+
+        offsets = array('i', [0]) * (n + 1)
+        for i in range(n):
+            offsets[i + 1] = offsets[i] + degrees[i]
+
+        targets = array('i', [0]) * offsets[n]
+        fill = array('i', offsets)
+        for tail, head in zip(tails, heads):
+            targets[fill[tail]] = head
+            fill[tail] += 1
+            if tail != head:
+                targets[fill[head]] = tail
+                fill[head] += 1
+
+        return cls(n, offsets, targets, size=len(tails), name=name)
+
+    @classmethod
+    def _from_numpy_edge_array(cls, n: int, edges: "numpy.ndarray", name: str) -> "CSRGraph":
+        """
+        Builds a graph from a NumPy edge array, see `from_edge_array`
+
+        The rows come out the same as from the counting sort: the endpoints are interleaved as tail, head per edge and
+        ordered with a stable sort, so every row lists its neighbours in the order of the edges.
+        """
+
+        flat = edges.reshape(-1).astype(numpy.intc, copy=False)
+        size = len(flat) // 2
+        sources = flat
+        destinations = flat.reshape(-1, 2)[:, ::-1].reshape(-1)
+
+        # A loop is stored once, from its tail
+        keep = numpy.ones(len(flat), dtype=bool)
+        keep[1::2] = flat[0::2] != flat[1::2]
+        sources = sources[keep]
+        destinations = destinations[keep]
+
+        offsets = numpy.zeros(n + 1, dtype=numpy.intc)
+        numpy.cumsum(numpy.bincount(sources, minlength=n), out=offsets[1:])
+        targets = destinations[numpy.argsort(sources, kind='stable')].astype(numpy.intc)
+        return cls(n, array('i', offsets.tobytes()), array('i', targets.tobytes()), size=size, name=name)
+
+    @classmethod
+    def from_vertices(cls, vertices: Iterable[Vertex], name: str = 'G') -> "CSRGraph":
+        """
+        Builds the subgraph induced by the given vertices
+
+        The order of the vertices and of their neighbours is kept, so index i refers to the i-th given vertex.
+        :param vertices: the vertices to index, neighbours outside this collection are left out
+        :param name: optional name for the graph
+        :return: the graph in CSR form
+        """
+
+        vertices = list(vertices)
+        index = {v: i for i, v in enumerate(vertices)}
+
+        offsets = array('i', [0])
+        targets = array('i')
+        for v in vertices:
+            targets.extend(index[w] for w in v.neighbours if w in index)
+            offsets.append(len(targets))
+
+        graph = cls(len(vertices), offsets, targets, vertices=vertices, name=name)
+        graph._index = index
+        return graph
+
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "CSRGraph":
+        """
+        Builds the CSR form of a `Graph`
+
+        :param graph: the graph to convert
+        :return: the graph in CSR form, with index i referring to `graph.vertices[i]`
+        """
+        return cls.from_vertices(graph.vertices, name=graph.name)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        self._name = name
+
+    @property
+    def order(self) -> int:
+        """The number of vertices of this graph."""
+        return self._n
+
+    @property
+    def size(self) -> int:
+        """The number of edges of this graph."""
+        return self._size
+
+    @property
+    def offsets(self) -> array:
+        return self._offsets
+
+    @property
+    def targets(self) -> array:
+        return self._targets
+
+    @property
+    def vertices(self) -> Sequence:
+        """
+        Returns the objects the indices stand for
+
+        :return: the vertices the graph was built from, or range(n) if it was built from indices only
+        """
+        return self._vertices
+
+    @property
+    def index(self) -> Dict:
+        """
+        Returns the inverse of `vertices`
+
+        :return: a mapping from the vertices to their index
+        """
+        if self._index is None:
+            self._index = {v: i for i, v in enumerate(self._vertices)}
+        return self._index
+
+    def _row(self, i: int) -> range:
+        return range(self._offsets[i], self._offsets[i + 1])
+
+    def neighbours(self, i: int) -> memoryview:
+        """
+        Returns the neighbours of vertex i
+
+        :param i: index of the vertex
+        :return: a read-only view on the row of vertex i, no neighbours are copied
+        """
+        return self._view[self._offsets[i]:self._offsets[i + 1]]
+
+    def degree(self, i: int) -> int:
+        return self._offsets[i + 1] - self._offsets[i]
+
+    def degrees(self) -> List[int]:
+        offsets = self._offsets
+        return [offsets[i + 1] - offsets[i] for i in range(self._n)]
+
+    def is_adjacent(self, i: int, j: int) -> bool:
+        return j in self.neighbours(i)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes used by the offset and neighbour arrays."""
+        return self._offsets.itemsize * len(self._offsets) + self._targets.itemsize * len(self._targets)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self):
+        return iter(range(self._n))
+
+    def __repr__(self):
+        return f'CSRGraph(name={self._name}, #edges={self._size}, #vertices={self._n})'
+
+
+def as_csr(graph: Union[Graph, CSRGraph]) -> CSRGraph:
+    """
+    Returns the CSR form of the graph
+
+    :param graph: a `Graph`, a `CSRGraph` or any other form that has a `to_csr` method, such as a `BitsetGraph`
+    :return: the graph itself if it already is a `CSRGraph`, its CSR form otherwise
+    """
+    if isinstance(graph, CSRGraph):
+        return graph
+    if hasattr(graph, 'to_csr'):
+        return graph.to_csr()
+    return CSRGraph.from_graph(graph)
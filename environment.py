@@ -1,11 +1,12 @@
 import os
 import time
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple, Union
 
+from bitset import BitsetGraph
 from color_refinement import get_number_automorphisms, is_isomorphisms
 from disconnected_refinement import graph_component_isomorphic
 from graph import Graph
-from graph_io import load_graph
+from graph_io import GraphSection, open_graph_file, read_sections
 from preprocessing import checks, check_complement, find_components, construct_graph_from_components
 
 GRAPHS = 'graphs'
@@ -48,13 +49,28 @@ def process_graph_files(graph_files: List[str]):
         output_result(result_string)
 
 
-def get_graphs_from_file(file: str) -> List[Graph]:
-    with open(file) as f:
-        graphs = load_graph(f, read_list=True)
-    return graphs[0]
+def get_graphs_from_file(file: str) -> Iterator[GraphSection]:
+    """
+    Read the graphs of a file one at a time, so processing starts as soon as the first graph has been read
+
+    The edges of a graph are only parsed when the graph is needed, see `calculate_isomorphisms`.
+    :param file: path to the graph file, which may be compressed with gzip, xz, bzip2 or zstd
+    :return: iterator over the sections of the graphs in the file
+    """
+    with open_graph_file(file) as f:
+        yield from read_sections(f)
 
 
-def process_graphs(graphs: List[Graph]) -> Tuple[List[List[Graph]], float, List[int], float]:
+def parse_graph(graph: Union[Graph, GraphSection]) -> Graph:
+    """
+    Parse the edges of a graph that has only been read as a section of a file
+    :param graph: a graph or the section of a graph, see `get_graphs_from_file`
+    :return: the graph
+    """
+    return graph.graph(Graph) if isinstance(graph, GraphSection) else graph
+
+
+def process_graphs(graphs: Iterable[Union[Graph, GraphSection]]) -> Tuple[List[List[Graph]], float, List[int], float]:
     """
     First preprocesses the given graphs, then runs calculations for isomorphisms and automorphisms. :param graphs:
     raw graphs to be processed
@@ -77,44 +93,59 @@ def process_graphs(graphs: List[Graph]) -> Tuple[List[List[Graph]], float, List[
     return isomorphs, iso_time, automorphs, auto_time
 
 
-def calculate_isomorphisms(graphs: List[Graph]) -> List[List[Graph]]:
+def calculate_isomorphisms(graphs: Iterable[Union[Graph, GraphSection]]) -> List[List[Graph]]:
     """
-    Run isomorphism calculation for every graph in the input list
-    :param graphs: list of graphs to be calculated
+    Run isomorphism calculation for every graph in the input, in the order in which the graphs are given
+
+    A graph given as a section of a file is only compared with the graphs of the same number of vertices and edges, so
+    its edges are not parsed before it is known to be a candidate or to be the first graph of a new class.
+    :param graphs: list or iterator of graphs, or sections of graphs (see `get_graphs_from_file`), to be calculated
     :return: list with list of isomorphic graphs
     """
 
-    isomorphs = [[]]
-    isomorphs[0] = [graphs.pop(0)]
-    for i in range(len(graphs)):
+    graphs = iter(graphs)
+    isomorphs = [[parse_graph(next(graphs))]]
+    for section in graphs:
         added = False
         start_time = time.time()
+        graph = None
         for j in range(len(isomorphs)):
-            is_potential_isomorph, g, h = preprocess(isomorphs[j][0], graphs[i])
+            if (section.order, section.size) != (isomorphs[j][0].order, isomorphs[j][0].size):
+                continue
+            if graph is None:
+                graph = parse_graph(section)
+            is_potential_isomorph, g, h = preprocess(isomorphs[j][0], graph)
             if is_potential_isomorph:
                 is_connected_g, components_g = find_components(g)
                 is_connected_h, components_h = find_components(h)
+                # Lazy complements of dense graphs get edges only for the graphs that are compared
+                rows_g, rows_h = (g, h) if isinstance(g, BitsetGraph) else (None, None)
                 if not is_connected_g and not is_connected_h:
-                    if graph_component_isomorphic(construct_graph_from_components(components_g),
-                                                  construct_graph_from_components(components_h)):
+                    if graph_component_isomorphic(construct_graph_from_components(components_g, rows_g),
+                                                  construct_graph_from_components(components_h, rows_h)):
                         end_time = time.time()
-                        isomorphs[j].append(graphs[i])
+                        isomorphs[j].append(graph)
                         added = True
-                        output_result(graphs[i].name + " and " + isomorphs[j][0].name + " are isomorphisms (" + str(
+                        output_result(graph.name + " and " + isomorphs[j][0].name + " are isomorphisms (" + str(
                             end_time - start_time) + ")")
                         break
                 if is_connected_g and is_connected_h:
+                    if rows_g is not None:
+                        g = construct_graph_from_components(components_g, rows_g)[0]
+                        h = construct_graph_from_components(components_h, rows_h)[0]
                     if is_isomorphisms(g, h):
                         end_time = time.time()
-                        isomorphs[j].append(graphs[i])
+                        isomorphs[j].append(graph)
                         added = True
-                        output_result(graphs[i].name + " and " + isomorphs[j][0].name + " are isomorphisms (" + str(
+                        output_result(graph.name + " and " + isomorphs[j][0].name + " are isomorphisms (" + str(
                             end_time - start_time) + ")")
                         break
         if not added:
-            isomorphs.append([graphs[i]])
+            if graph is None:
+                graph = parse_graph(section)
+            isomorphs.append([graph])
             end_time = time.time()
-            output_result(f"{graphs[i].name} has no isomorphisms yet ({str(end_time - start_time)})")
+            output_result(f"{graph.name} has no isomorphisms yet ({str(end_time - start_time)})")
     return isomorphs
 
 
@@ -123,12 +154,13 @@ def preprocess(g: Graph, h: Graph) -> Tuple[bool, Graph, Graph]:
     Preprocess graphs for isomorphism calculation
     :param Graph h: One graph.
     :param Graph g: Another graph.
-    :return: graphs prepared for isomorphism calculation
+    :return: graphs prepared for isomorphism calculation, dense graphs are replaced by lazy complements, see
+    `check_complement`
     """
 
     is_isomorph = checks(g, h)
     if is_isomorph:
-        g, h = check_complement(g, h)
+        g, h = check_complement(g, h, lazy=True)
     return is_isomorph, g, h
 
 
@@ -5,7 +5,9 @@ This is a module for working with directed and undirected multigraphs.
 # version: 01-02-2017, Pieter Bos, Tariq Bontekoe
 # version: 13-37-1337, NU2 🎓
 
-from typing import List, Union, Set
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, List, Union, Set, Tuple
 
 
 class GraphError(Exception):
@@ -21,7 +23,14 @@ class GraphError(Exception):
 
 
 class Vertex(object):
-    """`Vertex` objects belong to graph objects. They have an attribute `label` which can be anything."""
+    """`Vertex` objects belong to graph objects. They have an attribute `label` which can be anything.
+
+    Vertices have no `__dict__`; state of an algorithm belongs in arrays indexed by vertex index, which are local to a
+    single run. Only `colortext` and `colornum` can be set, for `graph_io.write_dot`.
+    """
+
+    __slots__ = ('_graphs', '_incidence', '_label', '_id', '_neighbours_view', '_incidence_view', '_degree_value',
+                 '_pending', 'colortext', 'colornum')
 
     def __init__(self, graph: "Graph", label=None, id=None):
         """Instantiate a vertex, part of the specified graph.
@@ -33,11 +42,20 @@ class Vertex(object):
         if label is None:
             label = graph._next_label()
 
-        self._graphs = [graph]
+        # The graphs are kept as the keys of a dict, an insertion-ordered set with O(1) membership
+        self._graphs = {graph: None}
         self._incidence = {}
         self._label = label
         self._id = id
 
+        # Read-only views on the incidence map, built on first use and dropped whenever the map changes
+        self._neighbours_view = None
+        self._incidence_view = None
+        self._degree_value = None
+
+        # The copy-on-write clone whose edges still have to be attached to this vertex, see `Graph.clone`
+        self._pending = None
+
     def __repr__(self):
         """A programmer-friendly representation of this vertex.
 
@@ -60,6 +78,8 @@ class Vertex(object):
         :param Vertex other: The other vertex
         """
 
+        if self._pending is not None:
+            self._pending._materialize()
         return other in self._incidence
 
     def _add_incidence(self, edge: "Edge"):
@@ -68,24 +88,40 @@ class Vertex(object):
         :param Edge edge: The edge to add.
         """
 
+        if self._pending is not None:
+            self._pending._materialize()
         other = edge.other_end(self)
 
         if other not in self._incidence:
             self._incidence[other] = set()
 
-        self._incidence[other].add(edge)
+        if edge not in self._incidence[other]:
+            self._incidence[other].add(edge)
+            self._invalidate()
 
     def remove_incidence(self, edge):
+        if self._pending is not None:
+            self._pending._materialize()
         other = edge.other_end(self)
 
         if other in self._incidence:
             self._incidence[other].remove(edge)
             if len(self._incidence[other]) == 0:
                 self._incidence.pop(other)
+            self._invalidate()
+
+    def _invalidate(self):
+        """Drop the cached neighbour, incidence and degree views after the incidence map has changed."""
+
+        self._neighbours_view = None
+        self._incidence_view = None
+        self._degree_value = None
 
     def add_graph(self, graph: "Graph"):
-        if graph not in self._graphs:
-            self._graphs.append(graph)
+        self._graphs[graph] = None
+
+    def remove_graph(self, graph: "Graph"):
+        self._graphs.pop(graph, None)
 
     def in_graph(self, graph: "Graph") -> bool:
         return graph in self._graphs
@@ -97,33 +133,45 @@ class Vertex(object):
         :return: List of graphs this vertex belongs to.
         """
 
-        return self._graphs
+        return list(self._graphs)
 
     @property
-    def incidence(self) -> List["Edge"]:
-        """Get incidence, i.e. the list of edges incident with this vertex.
+    def incidence(self) -> Tuple["Edge", ...]:
+        """Get incidence, i.e. the edges incident with this vertex.
 
-        :return: The list of edges incident with this vertex
-        """
+        The tuple is cached until an edge is added to or removed from this vertex, so repeated reads do not allocate.
 
-        result = set()
+        :return: The read-only sequence of edges incident with this vertex
+        """
 
-        for edge_set in self._incidence.values():
-            result |= edge_set
+        if self._incidence_view is None:
+            if self._pending is not None:
+                self._pending._materialize()
+            self._incidence_view = tuple(edge for edge_set in self._incidence.values() for edge in edge_set)
 
-        return list(result)
+        return self._incidence_view
 
     @property
-    def neighbours(self) -> ["Vertex"]:
-        """Get the list of neighbours of the vertex."""
+    def neighbours(self) -> Tuple["Vertex", ...]:
+        """Get the neighbours of the vertex, as a cached read-only sequence."""
+
+        if self._neighbours_view is None:
+            if self._pending is not None:
+                self._pending._materialize()
+            self._neighbours_view = tuple(self._incidence)
 
-        return list(self._incidence.keys())
+        return self._neighbours_view
 
     @property
     def degree(self) -> int:
         """Get the degree of the vertex."""
 
-        return sum(map(len, self._incidence.values()))
+        if self._degree_value is None:
+            if self._pending is not None:
+                self._pending._materialize()
+            self._degree_value = sum(map(len, self._incidence.values()))
+
+        return self._degree_value
 
     @property
     def label(self) -> str:
@@ -143,7 +191,9 @@ class Vertex(object):
 
 class Edge(object):
     """An edge has a tail and a head which point to the end vertices. The order of these matters if the graph is
-    directed."""
+    directed. Like vertices, edges only have `colortext` and `colornum` next to their own attributes."""
+
+    __slots__ = ('_tail', '_head', '_weight', 'colortext', 'colornum')
 
     def __init__(self, tail: Vertex, head: Vertex, weight=None):
         """Create an edge between vertices `tail` and `head`.
@@ -225,6 +275,73 @@ class Edge(object):
         return self.head == vertex or self.tail == vertex
 
 
+def edge_pairs(edges: Any) -> Iterator[Tuple[int, int]]:
+    """Iterate over an edge array as (tail, head) pairs of vertex indices.
+
+    :param edges: A sequence of pairs, a flat `array.array` of alternating tails and heads, or a NumPy array of shape
+                  (m, 2) or (2m,).
+    :return: An iterator over the (tail, head) pairs.
+    """
+
+    if isinstance(edges, array) or getattr(edges, 'ndim', None) == 1:
+        flat = iter(edges.tolist())
+        return zip(flat, flat)
+
+    if hasattr(edges, 'tolist'):
+        edges = edges.tolist()
+
+    return ((tail, head) for tail, head in edges)
+
+
+class IndexedView(Sequence):
+    """A read-only, live view on the vertices or edges of a graph. Membership tests and `index` take O(1) time."""
+
+    __slots__ = ('_items', '_positions')
+
+    def __init__(self, items: list, positions: dict):
+        """Instantiate a view.
+
+        :param list items: The list to expose.
+        :param dict positions: Mapping of every item to its position in `items`.
+        """
+
+        self._items = items
+        self._positions = positions
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, item) -> bool:
+        return item in self._positions
+
+    def index(self, item, *args) -> int:
+        if item not in self._positions:
+            raise ValueError('{} is not in the view'.format(item))
+        return self._positions[item]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, tuple, IndexedView)):
+            return NotImplemented
+        return len(self) == len(other) and all(a is b or a == b for a, b in zip(self._items, other))
+
+    __hash__ = None
+
+    def __add__(self, other) -> list:
+        return self._items + list(other)
+
+    def __radd__(self, other) -> list:
+        return list(other) + self._items
+
+    def __repr__(self):
+        return repr(self._items)
+
+
 class Graph(object):
     disjoint_union_operator = '⊎'
 
@@ -237,14 +354,27 @@ class Graph(object):
         :param str name: Optional name for the graph.
         """
 
+        # Vertices and edges are kept in a list together with a map to their position in it, a vertex or edge should
+        # be added at most once to a graph that is going to be modified
         self._v = list()
         self._e = list()
+        self._v_positions = dict()
+        self._e_positions = dict()
+        self._vertex_view = IndexedView(self._v, self._v_positions)
+        self._edge_view = IndexedView(self._e, self._e_positions)
+
+        # The edges by their (tail, head) pair, for adjacency and multiplicity queries in O(1) time
+        self._edge_index = dict()
         self._simple = simple
         self._directed = directed
         self._next_label_value = 0
         self._next_id_value = 0
         self._name = name
 
+        # The edges as an immutable index array, shared with clones until either graph changes, see `clone`
+        self._snapshot_value = None
+        self._shared = None
+
         for i in range(n):
             self.add_vertex(Vertex(self, id=self._next_id()))
 
@@ -258,7 +388,7 @@ class Graph(object):
                f'name={self.name}, ' \
                f'directed={self._directed}, ' \
                f'simple={self._simple}, ' \
-               f'#edges={len(self._e)}, ' \
+               f'#edges={self.size}, ' \
                f'#vertices={len(self._v)}' \
                ')'
 
@@ -270,7 +400,7 @@ class Graph(object):
 
         return self._name + ':\n' \
                             'V=[' + ", ".join(map(str, self._v)) + ']\n' \
-                                                                   'E=[' + ", ".join(map(str, self._e)) + ']'
+                                                                   'E=[' + ", ".join(map(str, self.edges)) + ']'
 
     def _next_label(self) -> str:
         """Generate a unique label for vertices in the graph.
@@ -322,27 +452,51 @@ class Graph(object):
         return self._directed
 
     @property
-    def vertices(self) -> List["Vertex"]:
-        """:return: The list of vertices of this graph."""
+    def vertices(self) -> IndexedView:
+        """:return: A read-only view on the vertices of this graph, copy it before modifying the graph."""
 
-        return list(self._v)
+        return self._vertex_view
 
     @property
-    def edges(self) -> List["Edge"]:
-        """:return: The list of edges of this graph."""
+    def edges(self) -> IndexedView:
+        """:return: A read-only view on the edges of this graph, copy it before modifying the graph."""
 
-        return list(self._e)
+        self._materialize()
+        return self._edge_view
 
     @property
     def order(self) -> int:
         """The number of vertices of this graph."""
-        return len(self.vertices)
+        return len(self._v)
 
     @property
     def size(self) -> int:
         """The number of edges of this graph."""
 
-        return len(self.edges)
+        if self._shared is not None:
+            return len(self._shared[0]) // 2
+        return len(self._e)
+
+    @staticmethod
+    def _append(items: list, positions: dict, item):
+        positions[item] = len(items)
+        items.append(item)
+
+    @staticmethod
+    def _swap_remove(items: list, positions: dict, item):
+        """Remove an item in O(1) time by moving the last item into its place.
+
+        :raises ValueError if the item is not present.
+        """
+
+        position = positions.pop(item, None)
+        if position is None:
+            raise ValueError('{} is not in the graph'.format(item))
+
+        last = items.pop()
+        if position < len(items):
+            items[position] = last
+            positions[last] = position
 
     def __iter__(self):
         """:return: Returns an iterator for the vertices of the graph."""
@@ -355,8 +509,8 @@ class Graph(object):
         :param Vertex vertex: The vertex to be added.
         """
 
-        vertex.graphs.append(self)
-        self._v.append(vertex)
+        vertex.add_graph(self)
+        self._append(self._v, self._v_positions, vertex)
 
     def add_edge(self, edge: "Edge"):
         """Add an edge to this graph and, if necessary, also the vertices of the edge. This includes some checks
@@ -365,6 +519,8 @@ class Graph(object):
         :param edge: The edge to be added.
         """
 
+        self._materialize()
+
         if self._simple:
             if edge.tail == edge.head:
                 raise GraphError('No loops allowed in simple graphs')
@@ -372,30 +528,129 @@ class Graph(object):
             if self.is_adjacent(edge.tail, edge.head):
                 raise GraphError('No multiedges allowed in simple graphs')
 
-        if edge.tail not in self._v:
+        self._snapshot_value = None
+
+        if edge.tail not in self._v_positions:
             self.add_vertex(edge.tail)
-        if edge.head not in self._v:
+        if edge.head not in self._v_positions:
             self.add_vertex(edge.head)
 
-        self._e.append(edge)
+        self._append(self._e, self._e_positions, edge)
+        self._index_edge(edge)
 
         edge.head._add_incidence(edge)
         edge.tail._add_incidence(edge)
 
-    def deepcopy(self) -> "Graph":
-        graph = Graph(self.directed)
-        for v in self.vertices:
-            v_copy = Vertex(graph)
+    @classmethod
+    def from_edge_array(cls, n: int, edges: Any, directed: bool = False, simple: bool = False, name: str = 'G',
+                        weights: Iterable = None) -> "Graph":
+        """Instantiate a graph with n vertices and the specified edges in a single pass.
+
+        The vertices are created as by `Graph(directed, n)`, after which every edge is attached directly to its end
+        points. Only the checks of a simple graph are done per edge, and these take O(1) time.
+
+        :param int n: The number of vertices.
+        :param edges: The (tail, head) pairs of vertex indices, see `edge_pairs` for the accepted forms.
+        :param bool directed: Whether the graph should behave as a directed graph.
+        :param bool simple: Whether the graph should be a simple graph, i.e., not have multi-edges or loops.
+        :param str name: Optional name for the graph.
+        :param weights: Optional weight for every edge, in the order of the edges.
+        :return: The new graph.
+        """
+
+        graph = cls(directed=directed, n=n, simple=simple, name=name)
+        graph._attach_edges(edges, weights)
+        return graph
+
+    def _attach_edges(self, edges: Any, weights: Iterable = None):
+        """Attach edges between the vertices of this graph, given by their position, see `from_edge_array`."""
+
+        vertices = self._v
+        edge_list = self._e
+        positions = self._e_positions
+        index = self._edge_index
+        simple = self._simple
+        weights = iter(weights) if weights is not None else None
+
+        for tail_index, head_index in edge_pairs(edges):
+            tail = vertices[tail_index]
+            head = vertices[head_index]
+            if simple:
+                if tail is head:
+                    raise GraphError('No loops allowed in simple graphs')
+                if self.is_adjacent(tail, head):
+                    raise GraphError('No multiedges allowed in simple graphs')
+
+            edge = Edge(tail, head, next(weights) if weights is not None else None)
+            positions[edge] = len(edge_list)
+            edge_list.append(edge)
+            index.setdefault((tail, head), []).append(edge)
+            head._add_incidence(edge)
+            tail._add_incidence(edge)
+
+    def _snapshot(self) -> Tuple[array, Union[Tuple, None]]:
+        """The edges of this graph as a flat array of (tail, head) positions and their weights, if any.
+
+        The snapshot is kept until an edge or vertex is added or deleted, and is never modified itself, so clones can
+        share it.
+        """
+
+        if self._shared is not None:
+            return self._shared
+
+        if self._snapshot_value is None:
+            index = self._v_positions
+            pairs = array('i')
+            for e in self._e:
+                pairs.append(index[e.tail])
+                pairs.append(index[e.head])
+            weights = tuple(e.weight for e in self._e)
+            self._snapshot_value = pairs, weights if any(w is not None for w in weights) else None
+
+        return self._snapshot_value
+
+    def _materialize(self):
+        """Create the edges this clone still shares with its original, before its adjacency is read or changed."""
+
+        if self._shared is None:
+            return
+
+        pairs, weights = self._shared
+        self._shared = None
+        for v in self._v:
+            v._pending = None
+        self._attach_edges(pairs, weights)
+
+    def clone(self) -> "Graph":
+        """Make a copy-on-write copy of this graph.
+
+        The clone gets new vertices with the labels and ids of the vertices of this graph right away, but its edges are
+        only created when its adjacency is first read or changed. Until then it shares an immutable array of the edges
+        with this graph and with the other clones made since this graph last changed.
+
+        :return: A new graph with new vertices and edges, structured as this graph.
+        """
+
+        shared = self._snapshot()
+        graph = Graph(directed=self._directed, n=self.order, simple=self._simple, name=self._name)
+        pending = graph if len(shared[0]) else None
+        for v, v_copy in zip(self._v, graph._v):
             v_copy.label = v.label
             v_copy.set_id(v.id)
-            graph.add_vertex(v_copy)
-        for e in self.edges:
-            tail = e.tail
-            tail_copy = graph.find_vertex(tail.label)
-            head = e.head
-            head_copy = graph.find_vertex(head.label)
-            e_copy = Edge(tail_copy, head_copy)
-            graph.add_edge(e_copy)
+            v_copy._pending = pending
+
+        if pending is not None:
+            graph._shared = shared
+        return graph
+
+    def deepcopy(self) -> "Graph":
+        """Make a copy of this graph with new vertices and edges, in O(n + m) time.
+
+        :return: A clone of this graph of which the edges have been created, see `clone`.
+        """
+
+        graph = self.clone()
+        graph._materialize()
         return graph
 
     def find_vertex(self, label) -> "Vertex":
@@ -403,31 +658,14 @@ class Graph(object):
             if v.label == label:
                 return v
 
-    def __add__(self, other: "Graph") -> "Graph":
+    def __add__(self, other: "Graph") -> "DisjointUnion":
         """Make a disjoint union of two graphs.
 
         :param Graph other: The other graph to form a disjoint union with.
-        :return: A new graph instance being the disjoint union of this graph and the other.
+        :return: A new graph instance being the disjoint union of this graph and the other, see `DisjointUnion`.
         """
 
-        disjoint_union_name = ''
-        if self.name and other.name:
-            disjoint_union_name = f'{self.name} {Graph.disjoint_union_operator} {other.name}'
-
-        disjoint_union = Graph(
-            directed=self.directed or other.directed,
-            n=0,
-            simple=self.simple and other.simple,
-            name=disjoint_union_name
-        )
-
-        for vertex in self.vertices + other.vertices:
-            disjoint_union.add_vertex(vertex)
-
-        for edge in self.edges + other.edges:
-            disjoint_union.add_edge(edge)
-
-        return disjoint_union
+        return DisjointUnion(self, other)
 
     def __iadd__(self, other: Union['Graph', Vertex, Edge]) -> "Graph":
         """Add a graph, vertex or edge to this graph with the += syntax.
@@ -448,36 +686,67 @@ class Graph(object):
 
         return self
 
+    def _index_edge(self, edge: "Edge"):
+        self._edge_index.setdefault((edge.tail, edge.head), []).append(edge)
+
+    def _unindex_edge(self, edge: "Edge"):
+        key = (edge.tail, edge.head)
+        edges = self._edge_index[key]
+        edges.remove(edge)
+        if not edges:
+            del self._edge_index[key]
+
     def edge_exists(self, u: "Vertex", v: "Vertex") -> bool:
-        return len(self.find_edge(u, v)) == 0
+        """Check if this graph has an edge between the specified vertices, see `is_adjacent`."""
+
+        return self.is_adjacent(u, v)
 
     def find_edge(self, u: "Vertex", v: "Vertex") -> Set["Edge"]:
-        """Find edges in this graph between the specified vertices.
+        """Find edges in this graph between the specified vertices. If the graph is directed, only the edges from `u`
+        to `v` are found.
 
         :param Vertex u: One vertex.
         :param Vertex v: Another vertex.
         :return: The set of edges incident with both `u` and `v`.
         """
 
-        result = set(x for x in u.incidence if x == v)
-        # result |= u.incidence.get(v, set())
+        self._materialize()
+        result = set(self._edge_index.get((u, v), ()))
 
         if not self._directed:
-            result.union(set(x for x in v.incidence if x == u))
-            # result |= v.incidence.get(u, set())
+            result.update(self._edge_index.get((v, u), ()))
 
         return result
 
+    def multiplicity(self, u: "Vertex", v: "Vertex") -> int:
+        """Count the edges in this graph between the specified vertices, in O(1) time. If the graph is directed, only
+        the edges from `u` to `v` are counted.
+
+        :param Vertex u: One vertex.
+        :param Vertex v: Another vertex.
+        :return: The number of edges between `u` and `v`.
+        """
+
+        self._materialize()
+        count = len(self._edge_index.get((u, v), ()))
+
+        if not self._directed and u is not v:
+            count += len(self._edge_index.get((v, u), ()))
+
+        return count
+
     def is_adjacent(self, u: "Vertex", v: "Vertex") -> bool:
-        """Check if the specified vertices are adjacent. If the graph is directed, the direction of the edges is
-        respected.
+        """Check if the specified vertices are adjacent, in O(1) time. If the graph is directed, the direction of the
+        edges is respected.
 
         :param Vertex u: One vertex.
         :param Vertex v: Another vertex.
         :return: Whether the vertices are adjacent.
         """
 
-        return v in u.neighbours and (not self.directed or any(e.head == v for e in u.incidence))
+        self._materialize()
+        index = self._edge_index
+        return (u, v) in index or (not self._directed and (v, u) in index)
 
     def del_edge(self, edge: "Edge"):
         """Delete the specified edge.
@@ -485,48 +754,134 @@ class Graph(object):
         :param Edge edge: the edge to delete.
         """
 
+        self._materialize()
+        self._snapshot_value = None
+
+        self._swap_remove(self._e, self._e_positions, edge)
+        self._unindex_edge(edge)
+
         edge.tail.remove_incidence(edge)
         edge.head.remove_incidence(edge)
 
-        self._e.remove(edge)
-
     def del_vertex(self, v: "Vertex"):
         """Delete the specified vertex.
 
         :param Vertex v: The vertex to be removed.
         """
 
+        self._materialize()
+        self._snapshot_value = None
+
         for e in v.incidence:
             self.del_edge(e)
 
-        v.graphs.remove(self)
-        self._v.remove(v)
+        v.remove_graph(self)
+        self._swap_remove(self._v, self._v_positions, v)
+
+    def adjacency_bitsets(self) -> List[int]:
+        """Get the adjacency matrix of this graph as one integer bitset per vertex.
+
+        Bit j of the i-th bitset is set iff the i-th and the j-th vertex of this graph are adjacent, regardless of the
+        direction of their edges. The rows are filled from the edge index as bytearrays of n / 8 bytes, so this takes
+        O(n^2 / 8 + m) time.
+
+        :return: The bitset of every vertex, in the order of the vertices.
+        """
+
+        self._materialize()
+        index = self._v_positions
+        rows = [bytearray((len(self._v) + 7) // 8) for _ in self._v]
+        for tail, head in self._edge_index:
+            i, j = index[tail], index[head]
+            rows[i][j >> 3] |= 1 << (j & 7)
+            rows[j][i >> 3] |= 1 << (i & 7)
+        return [int.from_bytes(row, 'little') for row in rows]
 
     def complement(self) -> 'Graph':
         """Instantiate this graph's complement.
 
+        The non-neighbours of a vertex are read from the adjacency bitsets, so finding them takes O(n / w) time per
+        vertex instead of a test per pair of vertices. Every vertex is connected to the non-neighbours before it in this
+        graph; the vertices of the complement are in reverse order.
+
         :return A new graph instance being this graph's complement. It has new vertex instances and, by definition, new
                 edges.
         """
 
-        complement = Graph(directed=self.directed, simple=self.simple, name='complement of ' + self.name)
+        rows = self.adjacency_bitsets()
+        n = len(rows)
+        last = n - 1
+
+        edges = []
+        for i in range(last, -1, -1):
+            missing = ~rows[i] & ((1 << i) - 1)
+            while missing:
+                low = missing & -missing
+                edges.append((last - i, last - low.bit_length() + 1))
+                missing ^= low
 
-        # Map current vertices to copies for complement
-        current_complement_vertices = {vertex: Vertex(graph=complement, label=vertex.label) for vertex in list(self._v)}
+        complement = Graph.from_edge_array(n, edges, directed=self.directed, simple=self.simple,
+                                           name='complement of ' + self.name)
+        for v, v_complement in zip(reversed(self._v), complement._v):
+            v_complement.label = v.label
+        return complement
 
-        while len(current_complement_vertices) > 0:
-            current_vertex, complement_vertex = current_complement_vertices.popitem()
 
-            if complement_vertex not in complement.vertices:
-                complement.add_vertex(complement_vertex)
+class DisjointUnion(Graph):
+    """The disjoint union of two graphs, sharing their vertices and edges.
 
-            complement_neighbours = {
-                complement_neighbour
-                for current_neighbour, complement_neighbour in current_complement_vertices.items()
-                if not current_vertex.is_adjacent(current_neighbour)
-            }
+    The vertices of the left graph come first. The union does not register itself on the shared vertices, so the input
+    graphs are left untouched and one graph can take part in any number of unions. For the same reason the edges of a
+    union cannot be changed, as that would change the vertices of the input graphs without their edge lists.
+    """
 
-            for complement_neighbour in complement_neighbours:
-                complement.add_edge(Edge(tail=complement_vertex, head=complement_neighbour))
+    def __init__(self, left: Graph, right: Graph):
+        """Instantiate the disjoint union of two graphs.
 
-        return complement
+        :param Graph left: The graph whose vertices come first.
+        :param Graph right: The graph whose vertices come last.
+        """
+
+        name = ''
+        if left.name and right.name:
+            name = f'{left.name} {Graph.disjoint_union_operator} {right.name}'
+
+        super(DisjointUnion, self).__init__(directed=left.directed or right.directed,
+                                            simple=left.simple and right.simple, name=name)
+
+        self._left = left
+        self._right = right
+
+        for vertex in left.vertices + right.vertices:
+            self._append(self._v, self._v_positions, vertex)
+
+        for edge in left.edges + right.edges:
+            self._append(self._e, self._e_positions, edge)
+            self._index_edge(edge)
+
+    @property
+    def left(self) -> Graph:
+        """:return: The graph whose vertices come first."""
+
+        return self._left
+
+    @property
+    def right(self) -> Graph:
+        """:return: The graph whose vertices come last."""
+
+        return self._right
+
+    def add_edge(self, edge: "Edge"):
+        """Edges cannot be added to a disjoint union, as that would change the incidence of the shared vertices."""
+
+        raise GraphError('Edges cannot be added to a disjoint union')
+
+    def del_edge(self, edge: "Edge"):
+        """Edges cannot be deleted from a disjoint union, as that would change the incidence of the shared vertices."""
+
+        raise GraphError('Edges cannot be deleted from a disjoint union')
+
+    def del_vertex(self, v: "Vertex"):
+        """Vertices cannot be deleted from a disjoint union, as that would change the shared vertices."""
+
+        raise GraphError('Vertices cannot be deleted from a disjoint union')
@@ -9,14 +9,82 @@ Includes functions for reading and writing graphs, in a very simple readable for
 # updated 5-2-2015: no black fill color used, when more than numcolors**2 vertices.
 # updated 29-1-2017: pep8 reformat, general improvements
 
+import bz2
+import gzip
+import io
+import lzma
+import multiprocessing
+import os
+import re
 import sys
-from typing import IO, Tuple, List, Union
+from array import array
+from typing import IO, Any, Iterable, Iterator, List, Tuple, Union
 
-from graph import Graph, Edge
+from csr import CSRGraph
+from graph import Graph
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 DEFAULT_COLOR_SCHEME = "paired12"
 NUM_COLORS = 12
 
+# The number of lines that are joined into one write, see `write_lines`
+CHUNK_LINES = 4096
+
+# A line starting with a dash separates two graphs in a file
+SEPARATOR = re.compile(r'^-.*\n?', re.MULTILINE)
+
+# The magic bytes and extensions of the compression formats that are decompressed while reading
+COMPRESSION = (('gzip', b'\x1f\x8b', '.gz'), ('xz', b'\xfd7zXZ\x00', '.xz'), ('bzip2', b'BZh', '.bz2'),
+               ('zstd', b'\x28\xb5\x2f\xfd', '.zst'))
+
+
+def compression_of(path: str) -> Union[str, None]:
+    """
+    Determines the compression of a file from its first bytes, or from its extension if those are not recognised
+    :param path: The path of the file
+    :return: 'gzip', 'xz', 'bzip2', 'zstd', or None for an uncompressed file
+    """
+    with open(path, 'rb') as f:
+        start = f.read(6)
+    for compression, magic, _ in COMPRESSION:
+        if start.startswith(magic):
+            return compression
+    extension = os.path.splitext(path)[1]
+    for compression, _, suffix in COMPRESSION:
+        if extension == suffix:
+            return compression
+    return None
+
+
+def open_graph_file(path: str) -> IO[str]:
+    """
+    Open a graph file for reading as text, compressed files are decompressed incrementally while they are read
+    :param path: The path of the file, see `compression_of`
+    :return: The file
+    :raises ImportError if the file is compressed with zstd and the zstandard package is not installed
+    """
+    compression = compression_of(path)
+    if compression == 'gzip':
+        return gzip.open(path, 'rt')
+    if compression == 'xz':
+        return lzma.open(path, 'rt')
+    if compression == 'bzip2':
+        return bz2.open(path, 'rt')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError('Reading {} requires the zstandard package'.format(path))
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    return open(path)
+
 
 def read_line(f: IO[str]) -> str:
     """
@@ -32,53 +100,167 @@ def read_line(f: IO[str]) -> str:
     return line
 
 
-def read_graph(graphclass, f: IO[str], name: str = "G") -> Tuple[Graph, List[str], bool]:
+class GraphSection:
     """
-    Read a graph from a file
-    :param str name: Graph name.
-    :param graphclass: The class of the graph
+    A graph of a file of which only the header has been parsed
+
+    The number of vertices and edges are known as soon as the section has been read, the edge list is only parsed when
+    the graph is built by `graph`. If only the header was read, the edge lines are read again from the file when they
+    are needed, which requires the file to be open and seekable.
+    """
+
+    __slots__ = ('name', 'order', 'size', 'options', '_edge_lines', '_file', '_offset')
+
+    def __init__(self, name: str, order: int, size: int, options: List[str], edge_lines: Union[List[str], None],
+                 file: IO[str] = None, offset: int = None):
+        """
+        :param name: Graph name
+        :param order: The number of vertices
+        :param size: The number of edges
+        :param options: The option lines before the graph
+        :param edge_lines: The unparsed edge lines, `None` if only the header was read
+        :param file: The file to read the edge lines from if only the header was read
+        :param offset: The position of the edge lines in the file, `None` if the file cannot seek
+        """
+        self.name = name
+        self.order = order
+        self.size = size
+        self.options = options
+        self._edge_lines = edge_lines
+        self._file = file
+        self._offset = offset
+
+    @property
+    def edge_lines(self) -> Union[List[str], None]:
+        """The unparsed edge lines, read from the file if only the header was read, `None` if they cannot be read."""
+        if self._edge_lines is not None or self._offset is None:
+            return self._edge_lines
+
+        # Read the lines at the offset and return to where the file was, so reading the next sections continues
+        f = self._file
+        position = f.tell()
+        f.seek(self._offset)
+        try:
+            return [read_line(f) for _ in range(self.size)]
+        finally:
+            f.seek(position)
+
+    def graph(self, graph_class=Graph) -> Graph:
+        """
+        Parse the edge list and build the graph
+        :param graph_class: The class of the graph, a `CSRGraph` is built straight from the edge list
+        :return: The graph
+        """
+        edge_lines = self.edge_lines
+        if edge_lines is None:
+            raise ValueError('The edges of {} were not read, only its header'.format(self.name))
+
+        pairs = []
+        weights = []
+        for line in edge_lines:
+            comma = line.find(',')
+            colon = line.find(':')
+            if colon >= 0:
+                pairs.append((int(line[:comma]), int(line[comma + 1:colon])))
+                weights.append(int(line[colon + 1:]))
+            else:
+                pairs.append((int(line[:comma]), int(line[comma + 1:])))
+                weights.append(None)
+
+        if issubclass(graph_class, CSRGraph):
+            return graph_class.from_edge_array(self.order, pairs, name=self.name)
+        return graph_class.from_edge_array(self.order, pairs, name=self.name, weights=weights)
+
+
+def read_section(f: IO[str], name: str = "G", headers_only: bool = False) -> Tuple[Union[GraphSection, None], bool]:
+    """
+    Read the next graph of a file up to the end of its edge list, without parsing the edges
     :param f: The file
-    :return: The graph
+    :param name: Graph name
+    :param headers_only: Only count the edges instead of keeping their lines, which are read again when they are
+    needed if the file can seek, see `GraphSection.edge_lines`
+    :return: The section, `None` if the file has no more graphs, and whether another graph follows
     """
 
     options = []
 
     while True:
+        line = read_line(f)
+        if line == '':
+            return None, False
         try:
-            line = read_line(f)
             n = int(line)
-            graph = graphclass(directed=False, n=n, name=name)
             break
         except ValueError:
-            if len(line) > 0 and line[-1] == '\n':
+            if line[-1] == '\n':
                 options.append(line[:-1])
             else:
                 options.append(line)
 
+    edge_lines = None if headers_only else []
+    file, offset = (f, f.tell()) if headers_only and f.seekable() else (None, None)
+    size = 0
     line = read_line(f)
-    edges = []
+    while ',' in line:
+        if edge_lines is not None:
+            edge_lines.append(line)
+        size += 1
+        line = read_line(f)
 
-    try:
-        while True:
-            comma = line.find(',')
-            if ':' in line:
-                colon = line.find(':')
-                edges.append((int(line[:comma]), int(line[comma + 1:colon]), int(line[colon + 1:])))
-            else:
-                edges.append((int(line[:comma]), int(line[comma + 1:]), None))
-            line = read_line(f)
-    except Exception:
-        pass
+    return GraphSection(name, n, size, options, edge_lines, file, offset), line[:1] == '-'
 
-    indexed_nodes = list(graph.vertices)
 
-    for edge in edges:
-        graph += Edge(indexed_nodes[edge[0]], indexed_nodes[edge[1]], edge[2])
+def read_sections(f: IO[str], headers_only: bool = False) -> Iterator[GraphSection]:
+    """
+    Read the graphs of a file one at a time
 
-    if line != '' and line[0] == '-':
-        return graph, options, True
-    else:
-        return graph, options, False
+    Only the lines of the current graph are kept, so a file with many graphs is read in the memory of its largest
+    graph. The order and size of every graph can be checked before its edge list is parsed with `GraphSection.graph`.
+    :param f: The file
+    :param headers_only: Only read the number of vertices and edges of every graph, see `read_section`
+    :return: Iterator over the sections, named G0, G1, ...
+    """
+
+    index = 0
+    more = True
+    while more:
+        section, more = read_section(f, name='G' + str(index), headers_only=headers_only)
+        if section is None:
+            return
+        yield section
+        index += 1
+
+
+def iter_graphs(graph_class, f: Union[IO[str], str]) -> Iterator[Graph]:
+    """
+    Read the graphs of a file one at a time, see `read_sections`
+    :param graph_class: The graph class
+    :param f: The file, or the path of a file that may be compressed, see `open_graph_file`
+    :return: Iterator over the graphs, named G0, G1, ...
+    """
+
+    if isinstance(f, str):
+        with open_graph_file(f) as handle:
+            yield from iter_graphs(graph_class, handle)
+        return
+
+    for section in read_sections(f):
+        yield section.graph(graph_class)
+
+
+def read_graph(graphclass, f: IO[str], name: str = "G") -> Tuple[Graph, List[str], bool]:
+    """
+    Read a graph from a file
+    :param str name: Graph name.
+    :param graphclass: The class of the graph, a `CSRGraph` is built straight from the edge list without vertex objects
+    :param f: The file
+    :return: The graph
+    """
+
+    section, more = read_section(f, name=name)
+    if section is None:
+        raise ValueError('No graph found')
+    return section.graph(graphclass), section.options, more
 
 
 def read_graph_list(graph_class, f: IO[str]) -> Tuple[List[Graph], List[str]]:
@@ -90,26 +272,161 @@ def read_graph_list(graph_class, f: IO[str]) -> Tuple[List[Graph], List[str]]:
     """
     options = []
     graphs = []
-    cont = True
 
-    while cont:
-        graph, new_options, cont = read_graph(graph_class, f, name='G' + str(len(graphs)))
-        options += new_options
-        graphs.append(graph)
+    for section in read_sections(f):
+        options += section.options
+        graphs.append(section.graph(graph_class))
 
     return graphs, options
 
 
-def load_graph(f: IO[str], graph_class=Graph, read_list: bool = False) -> Union[Tuple[List[Graph], List[str]], Graph]:
+def parse_edge_list(lines: List[str]):
     """
-    Load a graph from a file
+    Convert edge lines of the form `tail,head` into a flat integer array of alternating tails and heads in one go
+    :param lines: The edge lines, without weights
+    :return: A NumPy array if NumPy is available, an `array.array` otherwise
+    :raises ValueError naming the first line that is not a pair of integers
+    """
+    try:
+        if numpy is None:
+            edges = array('i', map(int, ' '.join(lines).replace(',', ' ').split()))
+        elif lines:
+            edges = numpy.loadtxt(lines, dtype=numpy.intc, delimiter=',', comments=None, ndmin=2).reshape(-1)
+        else:
+            edges = numpy.empty(0, dtype=numpy.intc)
+    except ValueError:
+        edges = None
+
+    if edges is None or len(edges) != 2 * len(lines):
+        # Only look for the line that is wrong when the whole list did not parse
+        for line in lines:
+            pair = line.replace(',', ' ').split()
+            if len(pair) != 2 or not all(number.lstrip('+-').isdigit() for number in pair):
+                raise ValueError('Invalid edge line: {!r}'.format(line))
+        raise ValueError('Invalid edge list')
+    return edges
+
+
+# The options, number of vertices, flat edge array and weights of a graph, see `parse_section`
+ParsedSection = Tuple[List[str], Union[int, None], Any, Union[List[int], None]]
+
+
+def parse_section(section: str) -> ParsedSection:
+    """
+    Parse the text of one graph of a graph file into compact arrays, see `parse_edge_list`
+    :param section: The text between two `---` separators
+    :return: The options, the number of vertices or None if the text holds no graph, the flat edge array and the
+    weights of the edges or None if no edge has a weight
+    """
+    options = []
+    lines = section.split('\n')
+    n = None
+    for start, line in enumerate(lines):
+        if line[:1] == '#' or not line.strip():
+            continue
+        try:
+            n = int(line)
+            break
+        except ValueError:
+            options.append(line)
+    if n is None:
+        return options, None, None, None
+
+    edge_lines = []
+    for line in lines[start + 1:]:
+        if line[:1] == '#':
+            continue
+        if ',' not in line:
+            break
+        edge_lines.append(line)
+
+    if not any(':' in line for line in edge_lines):
+        return options, n, parse_edge_list(edge_lines), None
+    weights = []
+    for i, line in enumerate(edge_lines):
+        edge_lines[i], colon, weight = line.partition(':')
+        weights.append(int(weight) if colon else None)
+    return options, n, parse_edge_list(edge_lines), weights
+
+
+def parse_sections(text: str, processes: int = 1) -> List[ParsedSection]:
+    """
+    Split the contents of a graph file on the `---` separators and parse every graph, see `parse_section`
+    :param text: The contents of the file
+    :param processes: The number of processes that parse the graphs, None for one per CPU
+    :return: The parsed graphs, in the order of the file
+    """
+    sections = SEPARATOR.split(text)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(sections) == 1:
+        return [parse_section(section) for section in sections]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(parse_section, sections, chunksize=max(1, len(sections) // (4 * processes)))
+
+
+def parse_graph_list(graph_class, text: str, processes: int = 1) -> Tuple[List[Graph], List[str]]:
+    """
+    Parse all graphs of the contents of a graph file at once
+
+    Every edge list is converted to integers in bulk, see `parse_sections`, after which the graph is built by
+    `from_edge_array`.
+    :param graph_class: The graph class
+    :param text: The contents of the file
+    :param processes: The number of processes that parse the graphs, None for one per CPU. The graphs are built from
+    the parsed arrays in this process.
+    :return: A list of graphs and the options
+    """
+    options = []
+    graphs = []
+
+    for section_options, n, edges, weights in parse_sections(text, processes):
+        options += section_options
+        if n is None:
+            continue
+        name = 'G' + str(len(graphs))
+        if weights is None or issubclass(graph_class, CSRGraph):
+            graphs.append(graph_class.from_edge_array(n, edges, name=name))
+        else:
+            graphs.append(graph_class.from_edge_array(n, edges, name=name, weights=weights))
+
+    return graphs, options
+
+
+def read_graph_list_bulk(graph_class, f: IO[str]) -> Tuple[List[Graph], List[str]]:
+    """
+    Read a list of graphs from a file by reading the whole file at once, see `parse_graph_list`
+    :param graph_class: The graph class
+    :param f: The file
+    :return: A list of graphs
+    """
+    return parse_graph_list(graph_class, f.read())
+
+
+def read_graph_list_parallel(graph_class, f: IO[str], processes: int = None) -> Tuple[List[Graph], List[str]]:
+    """
+    Read a list of graphs from a file, parsing the graphs in a pool of processes, see `parse_graph_list`
+    :param graph_class: The graph class
     :param f: The file
+    :param processes: The number of processes, None for one per CPU
+    :return: A list of graphs, named G0, G1, ... in the order of the file, and the options
+    """
+    return parse_graph_list(graph_class, f.read(), processes)
+
+
+def load_graph(f: Union[IO[str], str], graph_class=Graph,
+               read_list: bool = False) -> Union[Tuple[List[Graph], List[str]], Graph]:
+    """
+    Load a graph from a file
+    :param f: The file, or the path of a file that may be compressed, see `open_graph_file`
     :param graph_class: The class of the graph. You may subclass the default graph class and add your own here.
     :param read_list: Specifies whether to read a list of graphs from the file, or just a single graph.
     :return: The graph, or a list of graphs.
     """
+    if isinstance(f, str):
+        with open_graph_file(f) as handle:
+            return load_graph(handle, graph_class, read_list)
     if read_list:
-        graph_list, options = read_graph_list(graph_class, f)
+        graph_list, options = read_graph_list_bulk(graph_class, f)
         return graph_list, options
     else:
         graph, options, tmp = read_graph(graph_class, f)
@@ -135,85 +452,361 @@ def write_line(f: IO[str], line: str):
     f.write(line + '\n')
 
 
-def write_graph_list(graph_list: List[Graph], f: IO[str], options=list()):
+def write_lines(f: IO[str], lines: Iterable[str]):
     """
-    Write a graph list to a file.
-    :param graph_list: The list of graphs
+    Write lines to a file, joining them into chunks of `CHUNK_LINES` lines so that a large graph takes few writes
+    :param f: The file
+    :param lines: The lines, without newlines
+    """
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == CHUNK_LINES:
+            f.write('\n'.join(chunk) + '\n')
+            chunk = []
+    if chunk:
+        f.write('\n'.join(chunk) + '\n')
+
+
+def graph_lines(graph: Graph) -> Iterator[str]:
+    """
+    The lines of a graph in a graph file
+    :param graph: The graph, its vertices are numbered in the order of the graph
+    :return: Iterator over the lines, without newlines
+    """
+    yield '# Number of vertices:'
+    yield str(graph.order)
+    # Give the vertices (temporary) labels from 0 to n-1:
+    label = {vertex: str(vertex_index) for vertex_index, vertex in enumerate(graph)}
+    yield '# Edge list:'
+    for e in graph.edges:
+        if e.weight:
+            yield label[e.tail] + ',' + label[e.head] + ':' + str(e.weight)
+        else:
+            yield label[e.tail] + ',' + label[e.head]
+
+
+def write_graphs(graphs: Iterable[Graph], f: IO[str], options=list()) -> int:
+    """
+    Write graphs to a file one at a time, so the graphs may come from a generator that builds them while writing
+    :param graphs: The graphs
     :param f: the file
     :param options: the (optional) options to write to the file.
+    :return: The number of graphs written
     """
-    # we may only write options that cannot be seen as an integer:
-    for S in options:
-        try:
-            int(S)
-        except ValueError:
-            write_line(f, str(S))
-
-    for i, g in enumerate(graph_list):
-        n = len(g)
-        write_line(f, '# Number of vertices:')
-        write_line(f, str(n))
 
-        # Give the vertices (temporary) labels from 0 to n-1:
-        label = {}
-        for vertex_index, vertex in enumerate(g):
-            label[vertex] = vertex_index
+    def lines() -> Iterator[str]:
+        # we may only write options that cannot be seen as an integer:
+        for S in options:
+            try:
+                int(S)
+            except ValueError:
+                yield str(S)
+        for i, g in enumerate(graphs):
+            if i > 0:
+                yield '--- Next graph:'
+            yield from graph_lines(g)
+            count[0] += 1
 
-        write_line(f, '# Edge list:')
+    count = [0]
+    write_lines(f, lines())
+    return count[0]
 
-        for e in g.edges:
-            if e.weight:
-                write_line(f, str(label[e.tail]) + ',' + str(label[e.head]) + ':' + str(e.weight))
-            else:
-                write_line(f, str(label[e.tail]) + ',' + str(label[e.head]))
 
-        if i + 1 < len(graph_list):
-            write_line(f, '--- Next graph:')
+def write_graph_list(graph_list: List[Graph], f: IO[str], options=list()):
+    """
+    Write a graph list to a file.
+    :param graph_list: The list of graphs
+    :param f: the file
+    :param options: the (optional) options to write to the file.
+    """
+    write_graphs(graph_list, f, options)
 
 
-def save_graph(graph_list: Union[Graph, List[Graph]], f: IO[str], options=list()):
+def save_graph(graph_list: Union[Graph, Iterable[Graph]], f: IO[str], options=list()):
     """
     Write a graph, or a list of graphs to a file.
-    :param graph_list: The graph, or a list of graphs.
+    :param graph_list: The graph, or a list of graphs. Any iterable of graphs is written one graph at a time.
     :param f: The file
     :param options: the (optional) options to write to the file.
     """
-    if type(graph_list) is list:
-        write_graph_list(graph_list, f, options)
+    if isinstance(graph_list, Graph):
+        write_graphs([graph_list], f, options)
     else:
-        write_graph_list([graph_list], f, options)
+        write_graphs(graph_list, f, options)
 
 
-def print_graph(graph_list: Union[Graph, List[Graph]], options=list()):
+def print_graph(graph_list: Union[Graph, Iterable[Graph]], options=list()):
     """
     Print a graph, or a list of graphs to sys.stdout
-    :param graph_list: The graph, or list of graphs.
+    :param graph_list: The graph, or list of graphs. Any iterable of graphs is printed one graph at a time.
     :param options: The (optional) options to print.
     """
-    if type(graph_list) is list:
-        write_graph_list(graph_list, sys.stdout, options)
+    save_graph(graph_list, sys.stdout, options)
+
+
+# First character of a sparse6 line, and the optional headers of graph6 and sparse6 files
+SPARSE6 = ':'
+GRAPH6_HEADER = '>>graph6<<'
+SPARSE6_HEADER = '>>sparse6<<'
+
+
+def edge_array(graph: Union[Graph, CSRGraph]) -> array:
+    """
+    Returns the edges of a graph as a flat array of alternating tails and heads
+
+    :param graph: a `Graph` or a `CSRGraph`, of which every edge is listed once
+    :return: the (tail, head) vertex indices of every edge
+    """
+
+    if isinstance(graph, CSRGraph):
+        edges = array('i')
+        for i in graph:
+            for j in graph.neighbours(i):
+                if i <= j:
+                    edges.append(i)
+                    edges.append(j)
+        return edges
+
+    index = graph.vertices.index
+    edges = array('i')
+    for edge in graph.edges:
+        edges.append(index(edge.tail))
+        edges.append(index(edge.head))
+    return edges
+
+
+def _encode_order(n: int) -> str:
+    if n < 63:
+        return chr(n + 63)
+    if n < 258048:
+        return '~' + ''.join(chr((n >> shift & 63) + 63) for shift in (12, 6, 0))
+    return '~~' + ''.join(chr((n >> shift & 63) + 63) for shift in (30, 24, 18, 12, 6, 0))
+
+
+def _decode_order(line: str) -> (int, int):
+    if line[:2] == '~~':
+        digits, start = line[2:8], 8
+    elif line[:1] == '~':
+        digits, start = line[1:4], 4
     else:
-        write_graph_list([graph_list], sys.stdout, options)
+        digits, start = line[:1], 1
+    n = 0
+    for c in digits:
+        n = n << 6 | ord(c) - 63
+    return n, start
 
 
-def write_dot(graph: Graph, f: IO[str], directed=False):
+def _bits(data: str) -> Iterator[int]:
+    for c in data:
+        value = ord(c) - 63
+        for shift in (5, 4, 3, 2, 1, 0):
+            yield value >> shift & 1
+
+
+def _pack(bits: List[int]) -> str:
+    bits += [0] * (-len(bits) % 6)
+    return ''.join(chr(63 + (bits[i] << 5 | bits[i + 1] << 4 | bits[i + 2] << 3 | bits[i + 3] << 2 |
+                             bits[i + 4] << 1 | bits[i + 5])) for i in range(0, len(bits), 6))
+
+
+def decode_graph6(line: str) -> (int, array):
     """
-    Writes a given graph to a file in .dot format.
-    :param graph: The graph. If its vertices contain attributes `label`, `colortext` or `colornum`, these are also
-    included in the file. If its edges contain an attribute `weight`, these are also included in the file.
-    :param f: The file.
+    Decode a graph6 line, which lists the upper triangle of the adjacency matrix column by column
+    :param line: The line, without header or newline
+    :return: The number of vertices and a flat array of alternating tails and heads with tail < head
+    """
+    n, start = _decode_order(line)
+    total = n * (n - 1) // 2
+    if len(line) - start != (total + 5) // 6:
+        raise ValueError('Invalid graph6 line')
+
+    if numpy is not None:
+        values = numpy.frombuffer(line[start:].encode('ascii'), dtype=numpy.uint8) - 63
+        k = numpy.flatnonzero(numpy.unpackbits(values[:, None], axis=1)[:, 2:].ravel()[:total])
+        # Bit k is the entry (i, j) with k = j(j-1)/2 + i, correct the rounding of the square root
+        j = ((1 + numpy.sqrt(1 + 8 * k)) // 2).astype(numpy.int64)
+        j -= j * (j - 1) // 2 > k
+        j += (j + 1) * j // 2 <= k
+        return n, numpy.stack((k - j * (j - 1) // 2, j), axis=1).ravel().astype(numpy.intc)
+
+    edges = array('i')
+    i, j = 0, 1
+    for _, bit in zip(range(total), _bits(line[start:])):
+        if bit:
+            edges.append(i)
+            edges.append(j)
+        i += 1
+        if i == j:
+            i, j = 0, j + 1
+    return n, edges
+
+
+def encode_graph6(n: int, edges) -> str:
+    """
+    Encode a simple graph as a graph6 line
+    :param n: The number of vertices
+    :param edges: A flat sequence of alternating tails and heads
+    :return: The line, without newline
+    """
+    bits = [0] * (n * (n - 1) // 2)
+    for k in range(0, len(edges), 2):
+        i, j = sorted((int(edges[k]), int(edges[k + 1])))
+        if i == j:
+            raise ValueError('graph6 cannot store loops')
+        bits[j * (j - 1) // 2 + i] = 1
+    return _encode_order(n) + _pack(bits)
+
+
+def decode_sparse6(line: str) -> (int, array):
+    """
+    Decode a sparse6 line, which lists the edges as records of one bit, telling whether to move to the next vertex,
+    and a vertex number
+    :param line: The line, starting with `:`, without header or newline
+    :return: The number of vertices and a flat array of alternating tails and heads with tail <= head
+    """
+    if line[:1] != SPARSE6:
+        raise ValueError('Invalid sparse6 line')
+    n, start = _decode_order(line[1:])
+    k = (n - 1).bit_length()
+    bits = list(_bits(line[start + 1:]))
+
+    edges = array('i')
+    v = 0
+    # An incomplete record at the end is padding
+    for p in range(0, len(bits) - k, k + 1):
+        if bits[p]:
+            v += 1
+        if v >= n:
+            break
+        x = 0
+        for bit in bits[p + 1:p + 1 + k]:
+            x = x << 1 | bit
+        if x > v:
+            v = x
+        else:
+            edges.append(x)
+            edges.append(v)
+    return n, edges
+
+
+def encode_sparse6(n: int, edges) -> str:
+    """
+    Encode a graph, that may have loops and multiple edges, as a sparse6 line
+    :param n: The number of vertices
+    :param edges: A flat sequence of alternating tails and heads
+    :return: The line, starting with `:`, without newline
+    """
+    k = (n - 1).bit_length()
+    pairs = sorted((max(int(edges[i]), int(edges[i + 1])), min(int(edges[i]), int(edges[i + 1])))
+                   for i in range(0, len(edges), 2))
+
+    bits = []
+
+    def put(x: int):
+        bits.extend(x >> shift & 1 for shift in range(k - 1, -1, -1))
+
+    v = 0
+    for head, tail in pairs:
+        if head == v:
+            bits.append(0)
+        elif head == v + 1:
+            bits.append(1)
+            v = head
+        else:
+            bits.append(1)
+            put(head)
+            bits.append(0)
+            v = head
+        put(tail)
+
+    # Pad with ones, unless the padding could be read as a record that moves to vertex n - 1 and adds a loop there
+    padding = -len(bits) % 6
+    if padding > k and v == n - 2 and n == 1 << k:
+        bits += [0] + [1] * (padding - 1)
+    else:
+        bits += [1] * padding
+    return SPARSE6 + _encode_order(n) + _pack(bits)
+
+
+def iter_graph6(graph_class, f: Union[IO[str], str]) -> Iterator[Graph]:
+    """
+    Lazily read the graphs of a graph6 or sparse6 file, one graph per line, lines of both formats may be mixed
+    :param graph_class: The graph class, the graph is built by its `from_edge_array`
+    :param f: The file, or the path of a file that may be compressed, see `open_graph_file`
+    :return: A generator of the graphs, named G0, G1, ...
+    """
+    if isinstance(f, str):
+        with open_graph_file(f) as handle:
+            yield from iter_graph6(graph_class, handle)
+        return
+
+    index = 0
+    for line in f:
+        line = line.strip()
+        for header in (GRAPH6_HEADER, SPARSE6_HEADER):
+            if line.startswith(header):
+                line = line[len(header):]
+        if not line:
+            continue
+        n, edges = decode_sparse6(line) if line[:1] == SPARSE6 else decode_graph6(line)
+        yield graph_class.from_edge_array(n, edges, name='G' + str(index))
+        index += 1
+
+
+def load_graph6(f: Union[IO[str], str], graph_class=Graph, read_list: bool = False) -> Union[List[Graph], Graph]:
+    """
+    Load a graph from a graph6 or sparse6 file, see `iter_graph6` to read the graphs one at a time
+    :param f: The file, or the path of a file that may be compressed
+    :param graph_class: The class of the graph
+    :param read_list: Specifies whether to read all graphs from the file, or just the first graph.
+    :return: The graph, or a list of graphs.
+    """
+    graphs = iter_graph6(graph_class, f)
+    if read_list:
+        return list(graphs)
+    graph = next(graphs, None)
+    graphs.close()
+    if graph is None:
+        raise ValueError('No graph in file')
+    return graph
+
+
+def save_graph6(graph_list: Union[Graph, CSRGraph, Iterable[Union[Graph, CSRGraph]]], f: IO[str],
+                sparse: bool = False) -> int:
+    """
+    Write a graph, or graphs one by one, to a file with one line per graph
+    :param graph_list: The graph, or an iterable of graphs, which is not read before writing.
+    :param f: The file
+    :param sparse: Write sparse6 instead of graph6, which is shorter for sparse graphs and keeps loops and multiple
+    edges
+    :return: The number of graphs written
+    """
+    if isinstance(graph_list, (Graph, CSRGraph)):
+        graph_list = [graph_list]
+    encode = encode_sparse6 if sparse else encode_graph6
+    count = 0
+    for graph in graph_list:
+        f.write(encode(graph.order, edge_array(graph)) + '\n')
+        count += 1
+    return count
+
+
+def dot_lines(graph: Graph, directed=False) -> Iterator[str]:
+    """
+    The lines of a graph in .dot format, without the closing brace, see `write_dot`
+    :param graph: The graph
     :param directed: Whether the graph should be drawn as a directed graph.
+    :return: Iterator over the lines, without newlines
     """
     if directed:
-        f.write('digraph G {\n')
+        yield 'digraph G {'
     else:
-        f.write('graph G {\n')
+        yield 'graph G {'
 
     name = {}
-    next_name = 0
     for v in graph:
-        name[v] = next_name
-        next_name += 1
+        name[v] = str(len(name))
         options = 'penwidth=3,'
         if hasattr(v, '_label'):
             options += 'label="' + str(v.label) + '",'
@@ -223,12 +816,10 @@ def write_dot(graph: Graph, f: IO[str], directed=False):
             options += 'color=' + str(v.colornum % NUM_COLORS + 1) + ', colorscheme=' + DEFAULT_COLOR_SCHEME + ','
             if v.colornum >= NUM_COLORS:
                 options += 'style=filled,fillcolor=' + str((v.colornum // NUM_COLORS) % NUM_COLORS + 1) + ','
-        if len(options) > 0:
-            f.write('    ' + str(name[v]) + ' [' + options[:-1] + ']\n')
-        else:
-            f.write('    ' + str(name[v]) + '\n')
-    f.write('\n')
+        yield '    ' + name[v] + ' [' + options[:-1] + ']'
+    yield ''
 
+    arrow = ' -> ' if directed else '--'
     for e in graph.edges:
         options = 'penwidth=2,'
         if hasattr(e, 'weight'):
@@ -237,13 +828,18 @@ def write_dot(graph: Graph, f: IO[str], directed=False):
             options += 'color="' + e.colortext + '",'
         elif hasattr(e, 'colornum'):
             options += 'color=' + str(e.colornum % NUM_COLORS + 1) + ', colorscheme=' + DEFAULT_COLOR_SCHEME + ','
-        if len(options) > 0:
-            options = ' [' + options[:-1] + ']'
-        if directed:
-            f.write('    ' + str(name[e.tail]) + ' -> ' + str(name[e.head]) + options + '\n')
-        else:
-            f.write('    ' + str(name[e.tail]) + '--' + str(name[e.head]) + options + '\n')
+        yield '    ' + name[e.tail] + arrow + name[e.head] + ' [' + options[:-1] + ']'
+
 
+def write_dot(graph: Graph, f: IO[str], directed=False):
+    """
+    Writes a given graph to a file in .dot format.
+    :param graph: The graph. If its vertices contain attributes `label`, `colortext` or `colornum`, these are also
+    included in the file. If its edges contain an attribute `weight`, these are also included in the file.
+    :param f: The file.
+    :param directed: Whether the graph should be drawn as a directed graph.
+    """
+    write_lines(f, dot_lines(graph, directed))
     f.write('}')
 
 
@@ -1,8 +1,10 @@
 import math
+from collections import deque
 
+from bitset import BitsetGraph, bits
 from color_refinement_helper import compare, debug, modules_to_graph, ModularDecomposition, \
     modules_to_graph_with_module_isomorphism
-from dll import DoubleLinkedList
+from csr import CSRGraph, as_csr
 from graph import *
 
 
@@ -17,7 +19,7 @@ def checks(g, h) -> bool:
     return is_same_size(g, h) and is_same_order(g, h) and is_same_degrees(g, h)
 
 
-def is_same_order(g: Graph, h: Graph):
+def is_same_order(g: Union[Graph, CSRGraph], h: Union[Graph, CSRGraph]):
     """
     This method checks if the order (amount of vertices) of the graphs are equal
 
@@ -25,10 +27,10 @@ def is_same_order(g: Graph, h: Graph):
     :param h: Graph
     :return: Boolean: True if the amount of vertices are the same
     """
-    return len(g.vertices) == len(h.vertices)
+    return g.order == h.order
 
 
-def is_same_size(g: Graph, h: Graph):
+def is_same_size(g: Union[Graph, CSRGraph], h: Union[Graph, CSRGraph]):
     """
     This method checks if the number of edges of the graphs are equal
 
@@ -36,10 +38,10 @@ def is_same_size(g: Graph, h: Graph):
     :param h: Graph
     :return: Boolean: True if the amount of edges are the same
     """
-    return len(g.edges) == len(h.edges)
+    return g.size == h.size
 
 
-def is_same_degrees(g: Graph, h: Graph):
+def is_same_degrees(g: Union[Graph, CSRGraph], h: Union[Graph, CSRGraph]):
     """
     This method checks if the degrees of all the vertices in the graphs are all the same
 
@@ -47,9 +49,7 @@ def is_same_degrees(g: Graph, h: Graph):
     :param h: Graph
     :return: Boolean: True if the degrees are the same
     """
-    degree_g = (v.degree for v in g.vertices)
-    degree_h = (v.degree for v in h.vertices)
-    return compare(degree_g, degree_h)
+    return compare(as_csr(g).degrees(), as_csr(h).degrees())
 
 
 def remove_loners(g: Graph):
@@ -61,30 +61,34 @@ def remove_loners(g: Graph):
     :param g: Graph
     :return: processed Graph g
     """
-    for vertex in g.vertices:
+    for vertex in list(g.vertices):
         if vertex.degree == 0 or all(vertex == neighbour for neighbour in vertex.neighbours):
             g.del_vertex(vertex)
     return g
 
 
-def check_complement(g: Graph, h: Graph) -> (Graph, Graph):
+def check_complement(g: Graph, h: Graph, lazy: bool = False):
     """
         Method checks if complement is necessary
 
     :param g: Graph
     :param h: Graph
+    :param lazy: return lazy `ComplementView`s instead of new graphs, which preprocessing and refinement can consume
+    without creating the edges of the complements
     :return: Graph g and h, complemented if necessary
     """
 
     amount_of_vertices = g.order
     if g.size > (amount_of_vertices * (amount_of_vertices - 1)) / 4:
         debug("Uses complements")
+        if lazy:
+            return BitsetGraph.from_graph(g).complement(), BitsetGraph.from_graph(h).complement()
         return g.complement(), h.complement()
     else:
         return g, h
 
 
-def find_components(g: Graph):
+def find_components(g: Union[Graph, CSRGraph]):
     """
     Breadth First Search Alg. Which also:
     tests if the graph is connected,
@@ -93,41 +97,46 @@ def find_components(g: Graph):
     :param g: Graph
     :return: (isConnected, {dict of components})
     """
-    visited = set()
+    csr = as_csr(g)
+    vertices = csr.vertices
+    visited = [False] * csr.order
     components = dict()
     count = 1
 
-    while len(visited) < len(g.vertices):
-        for o in g.vertices:
-            if o not in visited:
-                v = o
-                break
-        queue = DoubleLinkedList()  # queue
-        queue.append(v)
-        visited.add(v)
-        components[count] = [v]
+    for v in range(csr.order):
+        if visited[v]:
+            continue
+        queue = deque([v])
+        visited[v] = True
+        components[count] = [vertices[v]]
 
         while len(queue) > 0:
-            w = queue.pop()  # BFS so FIFO
-            for n in w.neighbours:
+            w = queue.popleft()  # BFS so FIFO
+            for n in csr.neighbours(w):
                 # If w not visited
-                if n not in visited:
-                    visited.add(n)
+                if not visited[n]:
+                    visited[n] = True
                     queue.append(n)
-                    components[count].append(n)
+                    components[count].append(vertices[n])
         count += 1
 
     is_connected = len(components) == 1
     return is_connected, components
 
 
-def construct_graph_from_components(components: dict) -> [Graph]:
+def construct_graph_from_components(components: dict, graph: BitsetGraph = None) -> [Graph]:
     """
     constructs a list of graphs from a dictionary of components
 
         :param components: a dictionary constructed from an (unconnected) graph
+        :param graph: optional bitset form of the graph in which the components were found, e.g. a lazy complement of
+        `check_complement`. The subgraphs are then built with new vertices from its rows, instead of from the edges of
+        the vertices.
         :return: list of subgraphs
         """
+    if graph is not None:
+        return [graph_from_rows(graph, vertices) for vertices in components.values()]
+
     graphs = list()
     for key in components.keys():
         subgraph = Graph(False)
@@ -142,7 +151,30 @@ def construct_graph_from_components(components: dict) -> [Graph]:
     return graphs
 
 
-def is_tree(g: Graph) -> bool:
+def graph_from_rows(graph: BitsetGraph, vertices: List[Vertex]) -> Graph:
+    """
+    Builds the subgraph of a bitset graph induced by the given vertices, with new vertices and edges
+
+    This is where the edges of a lazy complement are created, and only for the vertices that are needed.
+    :param graph: the bitset graph, e.g. a `ComplementView`
+    :param vertices: the vertices of graph to keep, vertex i of the subgraph is vertices[i]
+    :return: the induced subgraph
+    """
+    index = graph.index
+    positions = {index[v]: i for i, v in enumerate(vertices)}
+    mask = 0
+    for p in positions:
+        mask |= 1 << p
+
+    edges = []
+    for p, i in positions.items():
+        for q in bits(graph.row(p) & mask):
+            if q > p:
+                edges.append((i, positions[q]))
+    return Graph.from_edge_array(len(vertices), edges, name=graph.name)
+
+
+def is_tree(g: Union[Graph, CSRGraph]) -> bool:
     """
     This method checks whether graph g is a tree. First iteration.
     Uses the is_cycle method from tree_algorithm_helper.py
@@ -150,34 +182,40 @@ def is_tree(g: Graph) -> bool:
     :param g: Graph
     :return: Boolean: True if the graph is a Tree
     """
-    if len(g.vertices) == 0:
+    if g.order == 0:
         return True
-    if len(g.edges) != len(g.vertices) - 1:
+    if g.size != g.order - 1:
         return False
 
-    vertex = g.vertices[0]
-
-    return not has_cycle(g, vertex, vertex, [])
+    return not has_cycle(as_csr(g), 0, 0, [False] * g.order)
 
 
-def has_cycle(g: Graph, vertex: Vertex, predecessor: Vertex, visited):
+def has_cycle(g: CSRGraph, vertex: int, predecessor: int, visited: List[bool]):
     """
-    Recursive function to detect cycles in a graph
-
-    :param g: input graph
-    :param vertex: vertex to start from
-    :param predecessor: predecessor vertex of vertex
-    :param visited: List with visited vertices
+    Function to detect cycles in a graph
+
+    Follows the first unvisited neighbour of every vertex, starting at the given vertex. Walking the path iteratively
+    keeps long trees within the recursion limit.
+    :param g: input graph in CSR form
+    :param vertex: index of the vertex to start from
+    :param predecessor: index of the predecessor vertex of vertex
+    :param visited: visited flag for every vertex index
     :return: result: [True] if has_cycle
     """
 
-    visited.append(vertex)
+    while vertex is not None:
+        visited[vertex] = True
+        successor = None
+
+        for v in g.neighbours(vertex):
+            if visited[v] and v != predecessor:
+                return True
+            elif not visited[v]:
+                successor = v
+                break
 
-    for v in vertex.neighbours:
-        if v in visited and v is not predecessor:
-            return True
-        elif v not in visited:
-            return has_cycle(g, v, vertex, visited)
+        vertex, predecessor = successor, vertex
+    return False
 
 
 def get_modular_decomposition_sizes(md: ModularDecomposition):
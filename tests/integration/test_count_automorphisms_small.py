@@ -1,7 +1,9 @@
 import unittest
 
 from color_refinement import get_number_automorphisms
+from color_refinement_helper import SELECTORS, SearchStatistics
 from graph import Graph, Edge
+from graph_io import load_graph
 
 
 class TestCountAutomorphismsSmall(unittest.TestCase):
@@ -59,5 +61,18 @@ class TestCountAutomorphismsSmall(unittest.TestCase):
         self.assertEqual(720, get_number_automorphisms(g))
 
 
+    def test_selectors(self):
+        # Assert that every selector gives the same number of automorphisms, with searches of different sizes
+        graphs, _ = load_graph('graphs/branching/cubes4.grl', read_list=True)
+        nodes = {}
+        for name, selector in SELECTORS.items():
+            statistics = SearchStatistics()
+            self.assertEqual([8, 384, 8, 384], [get_number_automorphisms(g, selector, statistics) for g in graphs[:4]],
+                             name)
+            self.assertLessEqual(statistics.bijections, statistics.nodes)
+            nodes[name] = statistics.nodes
+        self.assertLess(nodes['largest'], nodes['first'])
+
+
 if __name__ == '__main__':
     unittest.main()
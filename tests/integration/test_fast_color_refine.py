@@ -1,11 +1,17 @@
 """
 Test file for Fast Color Refinement Algorithm
 """
+import math
 import os
 import unittest
+from unittest.mock import patch
 
 import tests
-from color_refinement import process, debug, fast_color_refine, initialize_coloring
+import color_refinement
+from bitset import BitsetGraph
+from color_refinement import process, debug, fast_color_refine, individualize, initialize_coloring, is_dense, \
+    numpy_color_refine, refine_individualized, refinement_graph, choose_color, choose_vertex
+from csr import CSRGraph
 from graph_io import *
 
 PATH = 'graphs/colorref'
@@ -24,6 +30,10 @@ def get_expected_result(filename, g_name, h_name):
             return "Unbalanced"
 
 
+def partition(coloring):
+    return {frozenset(coloring.get(color)) for color in coloring.colors if coloring.size(color)}
+
+
 def get_color_ref_files():
     all_graphs = os.listdir(PATH)
     return [x for x in all_graphs if x in EXPECTED.keys()]
@@ -60,6 +70,116 @@ class FastColorRefineCase(unittest.TestCase):
                 self.assertEqual(result[0], result[1], result[2])
                 debug(result[2], 'got', result[1])
 
+    def test_bitset_engine(self):
+        # Assert that refining over adjacency bitsets gives the same coloring as refining over the CSR form
+        for path, dense in (('graphs/branching/wheeljoin14.grl', True),
+                            (PATH + '/colorref_smallexample_6_15.grl', True),
+                            ('graphs/branching/bigtrees3.grl', False)):
+            with open(path) as f:
+                graphs, _ = load_graph(f, read_list=True)
+            union = graphs[0] + graphs[1]
+            self.assertEqual(dense, is_dense(union.vertices), path)
+
+            csr_coloring = fast_color_refine(initialize_coloring(union), CSRGraph.from_vertices(union.vertices))
+            bitset_coloring = fast_color_refine(initialize_coloring(union), BitsetGraph.from_graph(union))
+            self.assertEqual({v: csr_coloring.color(v) for v in union.vertices},
+                             {v: bitset_coloring.color(v) for v in union.vertices}, path)
+
+    @unittest.skipIf(color_refinement.numpy is None, 'NumPy is not installed')
+    def test_numpy_engine(self):
+        # Assert that the vectorized rounds give the same partition as fast_color_refine
+        for path in (PATH + '/colorref_largeexample_4_1026.grl', PATH + '/colorref_smallexample_6_15.grl',
+                     'graphs/treepaths/threepaths160.gr', 'graphs/branching/torus24.grl'):
+            with open(path) as f:
+                graphs, _ = load_graph(f, read_list=True)
+            graph = graphs[0] if len(graphs) == 1 else graphs[0] + graphs[1]
+            expected = partition(fast_color_refine(initialize_coloring(graph)))
+            self.assertEqual(expected, partition(numpy_color_refine(initialize_coloring(graph))), path)
+
+            # Without hashes every round ends at once, so fast_color_refine has to finish the refinement
+            with patch('color_refinement.numpy.random.RandomState') as random_state:
+                random_state.return_value.randint.side_effect = \
+                    lambda low, high, size, dtype: color_refinement.numpy.zeros(size, dtype=dtype)
+                self.assertEqual(expected, partition(numpy_color_refine(initialize_coloring(graph))), path)
+
+    def test_refinement_bound(self):
+        # Assert that refinement visits O((n + m) log n) edges, by counting the edges at every popped color
+        visited = [0]
+        original = color_refinement.count_neighbours
+
+        def count_neighbours(coloring, color, csr):
+            visited[0] += sum(csr.degree(csr.index[v]) for v in coloring.get(color))
+            return original(coloring, color, csr)
+
+        for path in ('graphs/treepaths/threepaths160.gr', 'graphs/treepaths/threepaths1280.gr',
+                     PATH + '/colorref_largeexample_4_1026.grl', PATH + '/colorref_largeexample_6_960.grl'):
+            with open(path) as f:
+                graphs, _ = load_graph(f, read_list=True)
+            graph = graphs[0] if len(graphs) == 1 else graphs[0] + graphs[1]
+            visited[0] = 0
+            with patch('color_refinement.count_neighbours', count_neighbours):
+                fast_color_refine(initialize_coloring(graph))
+            n, m = graph.order, graph.size
+            self.assertLess(visited[0], (n + 2 * m) * math.log2(n), path)
+
+    def test_refine_individualized(self):
+        # Assert that refining from the individualized classes gives the same partition as refining from all classes,
+        # while counting the neighbours of fewer vertices
+        counted = [0]
+        original = color_refinement.count_neighbours
+
+        def count_neighbours(coloring, color, csr):
+            counted[0] += coloring.size(color)
+            return original(coloring, color, csr)
+
+        for path in ('graphs/branching/torus24.grl', 'graphs/branching/cubes5.grl', 'graphs/branching/products72.grl'):
+            with open(path) as f:
+                graphs, _ = load_graph(f, read_list=True)
+            graph = graphs[0] + graphs[0].clone()
+            coloring = initialize_coloring(graph)
+            csr = CSRGraph.from_vertices(coloring.vertices)
+            self.assertIs(csr, refinement_graph(coloring.vertices, csr))
+            self.assertEqual(is_dense(coloring.vertices), isinstance(refinement_graph(coloring.vertices), BitsetGraph))
+            fast_color_refine(coloring, csr)
+            vertices = max((coloring.get(color) for color in coloring.colors), key=len)
+
+            with patch('color_refinement.count_neighbours', count_neighbours):
+                counted[0] = 0
+                expected = coloring.copy()
+                individualize(expected, vertices[0], vertices[-1])
+                expected = partition(fast_color_refine(expected, csr))
+                from_scratch = counted[0]
+
+                counted[0] = 0
+                self.assertEqual(expected, partition(refine_individualized(coloring, vertices[0], vertices[-1], csr)))
+                self.assertLess(counted[0], from_scratch, path)
+
+    def test_unbalanced_branches(self):
+        # Assert that the branches to an isomorphic graph stay balanced, and that a refinement stops with an unbalanced
+        # coloring when the vertices of g and h are counted
+        with open('graphs/branching/torus24.grl') as f:
+            graphs, _ = load_graph(f, read_list=True)
+        for g, h, isomorphic in ((graphs[0], graphs[3], True), (graphs[0], graphs[1], False)):
+            coloring = initialize_coloring(g + h)
+            coloring.track_sides(g, h)
+            csr = CSRGraph.from_vertices(coloring.vertices)
+            fast_color_refine(coloring, csr)
+            self.assertFalse(coloring.is_unbalanced())
+
+            vertices = choose_color(coloring)
+            first_vertex = choose_vertex(vertices, g)
+            unbalanced = 0
+            for second_vertex in [v for v in vertices if v.in_graph(h)]:
+                mark = coloring.save()
+                refine_individualized(coloring, first_vertex, second_vertex, csr)
+                if coloring.is_unbalanced():
+                    self.assertEqual("Unbalanced", coloring.status(g, h))
+                    unbalanced += 1
+                coloring.restore(mark)
+            # The tori are vertex-transitive, so no branch to the isomorphic torus is unbalanced and every branch to
+            # the other one is
+            self.assertEqual(0 if isomorphic else len(vertices) // 2, unbalanced)
+
     def test_storing_known_isomorphisms(self):
         # Assert that, after processing a list of graphs containing some isomorphisms and anisomorphisms, the known
         # isomorphisms are correct
@@ -0,0 +1,77 @@
+"""
+Test file for the binary graph container
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import tests
+from binary_io import BinaryGraphFile, convert, edge_array, write_binary
+from csr import CSRGraph, as_csr
+from graph import Graph
+from graph_io import load_graph
+
+PATH = 'graphs/branching/trees90.grl'
+
+
+class BinaryGraphFileCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'graphs.grb')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertSameGraph(self, g, h):
+        g, h = as_csr(g), as_csr(h)
+        self.assertEqual((g.order, g.size), (h.order, h.size))
+        self.assertEqual([sorted(g.neighbours(i)) for i in g], [sorted(h.neighbours(i)) for i in h])
+
+    def test_convert(self):
+        with open(PATH) as f:
+            graphs, _ = load_graph(f, read_list=True)
+        self.assertEqual(len(graphs), convert(PATH, self.path))
+
+        with BinaryGraphFile(self.path) as container:
+            self.assertEqual(len(graphs), len(container))
+            self.assertEqual((graphs[2].order, graphs[2].size), container.header(2))
+            self.assertSameGraph(graphs[2], container.graph(2))
+            self.assertSameGraph(graphs[3], container.csr(3))
+            self.assertIsInstance(container.csr(3), CSRGraph)
+            self.assertEqual('G1', container[1].name)
+            self.assertEqual([g.name for g in graphs], [g.name for g in container])
+            self.assertRaises(IndexError, container.graph, len(graphs))
+
+    def test_write_binary(self):
+        tests.set_up_test_graphs()
+        graphs = [tests.v5e4loop_unconnected, as_csr(tests.v5e4loop_unconnected), tests.empty_graph]
+        self.assertEqual(3, write_binary(graphs, self.path))
+        with BinaryGraphFile(self.path) as container:
+            for i, graph in enumerate(graphs):
+                self.assertSameGraph(graph, container.graph(i))
+            self.assertEqual(list(edge_array(graphs[1])), list(container.edges(1)))
+
+    def test_edges_after_close(self):
+        convert(PATH, self.path)
+        with BinaryGraphFile(self.path) as container:
+            edges = container.edges(0)
+            graph = container.csr(0)
+        self.assertEqual(2 * graph.size, len(edges))
+        self.assertSameGraph(graph, CSRGraph.from_edge_array(graph.order, edges))
+
+    def test_without_numpy(self):
+        convert(PATH, self.path)
+        with patch('binary_io.numpy', None), BinaryGraphFile(self.path) as container:
+            self.assertEqual(2 * container.header(0)[1], len(container.edges(0)))
+            self.assertIsInstance(container.graph(0), Graph)
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a graph file')
+        self.assertRaises(ValueError, BinaryGraphFile, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Test file for the bitset graph representation and its lazy complement
+"""
+import unittest
+
+import tests
+from bitset import BitsetGraph, ComplementView, bits, popcount
+from color_refinement import fast_color_refine
+from color_refinement_helper import initialize_coloring
+from csr import CSRGraph, as_csr
+from preprocessing import check_complement, checks
+
+
+def _cells(coloring):
+    return sorted(sorted(v.label for v in coloring.get(color)) for color in coloring.colors)
+
+
+class BitsetGraphCase(unittest.TestCase):
+
+    def setUp(self):
+        tests.set_up_test_graphs()
+
+    def test_bits(self):
+        self.assertEqual([0, 3, 64], list(bits(1 | 1 << 3 | 1 << 64)))
+        self.assertEqual([], list(bits(0)))
+        self.assertEqual(3, popcount(1 | 1 << 3 | 1 << 64))
+
+    def test_from_graph(self):
+        graph = tests.non_trivial_graph
+        bitset = BitsetGraph.from_graph(graph)
+        self.assertEqual(graph.order, bitset.order)
+        self.assertEqual(graph.size, bitset.size)
+        for v in graph.vertices:
+            i = bitset.index[v]
+            self.assertEqual(v.degree, bitset.degree(i))
+            self.assertEqual(sorted(bitset.index[w] for w in v.neighbours), list(bitset.neighbours(i)))
+        self.assertEqual(bitset.rows, BitsetGraph.from_csr(as_csr(graph)).rows)
+
+    def test_complement_view(self):
+        graph = tests.non_trivial_graph
+        complement = BitsetGraph.from_graph(graph).complement()
+        self.assertIsInstance(complement, ComplementView)
+        self.assertEqual(graph.complement().size, complement.size)
+        for i in range(graph.order):
+            self.assertEqual([j for j in range(graph.order) if j != i and not graph.vertices[i].is_adjacent(
+                graph.vertices[j])], list(complement.neighbours(i)))
+
+        csr = complement.to_csr()
+        self.assertIsInstance(csr, CSRGraph)
+        self.assertEqual(complement.degrees(), csr.degrees())
+        self.assertIs(graph.vertices[0], csr.vertices[0])
+
+    def test_disjoint_union_complement(self):
+        g, h = tests.non_trivial_graph, tests.non_trivial_graph.deepcopy()
+        complement = BitsetGraph.from_graph(g + h).complement()
+        self.assertEqual(2 * g.complement().size, complement.size)
+        self.assertEqual(0, complement.row(0) >> g.order)
+
+    def test_lazy_check_complement(self):
+        g = tests.create_graph_helper([(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3), (3, 4)])
+        h = tests.create_graph_helper([(0, 1), (0, 2), (0, 4), (1, 2), (1, 4), (2, 4), (3, 4)])
+        g_complement, h_complement = check_complement(g, h, lazy=True)
+        self.assertIsInstance(g_complement, ComplementView)
+        self.assertEqual(g.complement().size, g_complement.size)
+        self.assertTrue(checks(g_complement, h_complement))
+
+    def test_refine_complement(self):
+        # Colour refinement gives the same partition on a graph and its complement
+        graph = tests.non_trivial_graph
+        coloring = fast_color_refine(initialize_coloring(graph))
+        complement = BitsetGraph.from_graph(graph).complement()
+        self.assertEqual(_cells(coloring), _cells(fast_color_refine(initialize_coloring(graph), complement)))
+
+
+if __name__ == '__main__':
+    unittest.main()
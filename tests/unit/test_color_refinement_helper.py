@@ -79,6 +79,25 @@ class ColorRefineHelper(unittest.TestCase):
                                                         1: vertices[3:8]})
         self.assertListEqual([], list(choose_color(coloring)))
 
+    def test_selectors(self):
+        g = Graph(False, 25)
+        vertices = g.vertices
+        g.add_edge(Edge(vertices[8], vertices[1]))
+        g.add_edge(Edge(vertices[8], vertices[5]))
+        coloring = tests.create_coloring_helper_vertex({0: vertices[12:14], 1: vertices[:4], 2: vertices[4:8],
+                                                        3: vertices[8:12], 4: vertices[14:20], 5: vertices[20:]})
+        self.assertEqual([1, 2, 3, 4], target_cells(coloring))
+        self.assertEqual(1, first_cell(coloring))
+        self.assertEqual(4, largest_cell(coloring))
+        self.assertEqual(1, smallest_cell(coloring))
+        # Only the first vertex of cell 3 has neighbours, in cells 1 and 2
+        self.assertEqual(3, most_joined_cell(coloring))
+        self.assertListEqual(vertices[14:20], choose_color(coloring, SELECTORS['largest']))
+
+        coloring = tests.create_coloring_helper_vertex({0: vertices[:2], 1: vertices[20:]})
+        for selector in SELECTORS.values():
+            self.assertIsNone(selector(coloring))
+
     def test_choose_vertex(self):
         g = Graph(False, 2)
         v_g1, v_g2 = g.vertices
@@ -290,6 +309,21 @@ class ColorRefineHelper(unittest.TestCase):
         self.assertEqual([v_g1, v_g3, v_1, v_3], color_class)
         self.assertEqual(v_g1, chosen)
 
+    def test_choose_vertex_trivial(self):
+        g = create_graph_helper([(1, 2), (2, 3)])
+        v_g1, v_g2, v_g3 = g.vertices
+        g_copy = g.deepcopy()
+        v_1, v_2, v_3 = g_copy.vertices
+        self.assertEqual(v_g3, choose_vertex_trivial([v_g1, v_g3, v_3, v_2], g))
+        self.assertEqual(v_g1, choose_vertex_trivial([v_g1, v_g3, v_2], g))
+        self.assertIsNone(choose_vertex_trivial([v_1, v_3], g))
+
+    def test_search_statistics(self):
+        statistics = SearchStatistics()
+        for status in (None, "Bijection", "Unbalanced", "Bijection"):
+            statistics.add(status)
+        self.assertEqual('nodes: 4, bijections: 2, unbalanced: 1', str(statistics))
+
 
 if __name__ == '__main__':
     unittest.main()
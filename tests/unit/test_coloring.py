@@ -78,7 +78,10 @@ class ColoringCase(unittest.TestCase):
         self.assertEqual(1, self.coloring.color(self.v1))
 
         self.coloring.recolor(self.v1, 2)
-        self.assertEqual(2, len(self.coloring))
+        # The emptied class is not counted
+        self.assertEqual(1, len(self.coloring))
+        self.assertEqual([2], list(self.coloring.colors))
+        self.assertEqual('{ 2(1): [' + str(self.v1) + '] }', str(self.coloring))
         self.assertFalse(self.v1 in self.coloring.get(1))
         self.assertTrue(self.v1 in self.coloring.get(2))
 
@@ -89,6 +92,47 @@ class ColoringCase(unittest.TestCase):
         self.assertEqual("\'Vertex {} not found in coloring, use set() instead\'".format(str(self.v2)),
                          str(e.exception))
 
+    def test_size(self):
+        g = Graph(False, n=6)
+        self.coloring.add(g.vertices[:2], 0)
+        self.coloring.add(g.vertices[2:], 1)
+        self.assertEqual((2, 4), (self.coloring.size(0), self.coloring.size(1)))
+
+        # Every color class stays a contiguous range while vertices move between classes
+        self.coloring.recolor(g.vertices[3], 2)
+        self.coloring.recolor(g.vertices[4], 2)
+        self.coloring.recolor(g.vertices[5], 0)
+        self.coloring.recolor(g.vertices[0], 1)
+        self.assertEqual([(0, 2), (1, 2), (2, 2)],
+                         [(color, self.coloring.size(color)) for color in self.coloring.colors])
+        self.assertEqual({g.vertices[1], g.vertices[5]}, set(self.coloring.get(0)))
+        self.assertEqual({g.vertices[0], g.vertices[2]}, set(self.coloring.get(1)))
+        self.assertEqual([g.vertices[3], g.vertices[4]], self.coloring.get(2))
+        self.assertEqual(3, self.coloring.next_color())
+
+    def test_save_restore(self):
+        g = Graph(False, n=6)
+        self.coloring.add(g.vertices[:2], 0)
+        self.coloring.add(g.vertices[2:], 1)
+        before = [(color, set(self.coloring.get(color))) for color in self.coloring.colors]
+
+        mark = self.coloring.save()
+        self.coloring.recolor(g.vertices[2], 2)
+        inner = self.coloring.save()
+        self.coloring.recolor(g.vertices[3], 2)
+        self.coloring.recolor(g.vertices[0], 3)
+        self.coloring.restore(inner)
+        self.assertEqual([(0, 2), (1, 3), (2, 1)],
+                         [(color, self.coloring.size(color)) for color in self.coloring.colors])
+        self.assertEqual(3, self.coloring.next_color())
+
+        # Restoring the first mark undoes everything and stops recording
+        self.coloring.restore(mark)
+        self.assertEqual(2, len(self.coloring))
+        self.assertEqual(before, [(color, set(self.coloring.get(color))) for color in self.coloring.colors])
+        self.assertEqual(2, self.coloring.next_color())
+        self.assertIsNone(self.coloring._trail)
+
     def test_colors(self):
         self.coloring.set(self.v1, 0)
         self.coloring.set(self.v2, 1)
@@ -171,6 +215,45 @@ class ColoringCase(unittest.TestCase):
         coloring0.set(G0copy.vertices[3], 3)
         self.assertEqual(None, coloring0.status(G0, G0copy))
 
+        # The counts of the sides give the same statuses
+        for coloring, g, h in ((coloring13, G1, G3), (coloring02, G0, G2), (coloring01, G0, G1),
+                               (unbalanced_coloring, G0, G1), (coloring0, G0, G0copy)):
+            expected = coloring.status(g, h)
+            coloring.track_sides(g, h)
+            self.assertEqual(expected, coloring.status(g, h))
+            self.assertEqual(expected == "Unbalanced", coloring.is_unbalanced())
+
+    def test_track_sides(self):
+        g = Graph(False, n=3)
+        h = Graph(False, n=3)
+        self.coloring.add(g.vertices + h.vertices, 0)
+        self.assertRaises(ValueError, self.coloring.side_counts, 0)
+        self.assertFalse(self.coloring.is_unbalanced())
+        self.coloring.track_sides(g, h)
+        self.assertEqual((3, 3), self.coloring.side_counts(0))
+        self.assertIsNone(self.coloring.status(g, h))
+
+        mark = self.coloring.save()
+        self.coloring.recolor(g.vertices[0], 1)
+        self.assertEqual(((2, 3), (1, 0)), (self.coloring.side_counts(0), self.coloring.side_counts(1)))
+        self.assertTrue(self.coloring.is_unbalanced())
+        self.assertEqual("Unbalanced", self.coloring.status(g, h))
+        copy = self.coloring.copy()
+
+        self.coloring.recolor(h.vertices[0], 1)
+        self.coloring.recolor(g.vertices[1], 2)
+        self.coloring.recolor(h.vertices[1], 2)
+        self.assertEqual("Bijection", self.coloring.status(g, h))
+        self.coloring.restore(mark)
+        self.assertEqual((3, 3), self.coloring.side_counts(0))
+        self.assertIsNone(self.coloring.status(g, h))
+
+        # A copy keeps counting
+        self.assertEqual("Unbalanced", copy.status(g, h))
+        copy.recolor(h.vertices[2], 1)
+        self.assertEqual((1, 1), copy.side_counts(1))
+        self.assertFalse(copy.is_unbalanced())
+
     def test_copy(self):
         g = Graph(False, n=10)
         self.coloring.add(g.vertices[0:2])
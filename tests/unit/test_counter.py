@@ -3,7 +3,10 @@ Test file for Counter
 """
 import unittest
 
-from color_refinement_helper import initialize_coloring, generate_neighbour_count_with_color
+from bitset import BitsetGraph
+from color_refinement_helper import count_neighbours, count_neighbours_with_bitsets, \
+    generate_neighbour_count_with_color, initialize_coloring
+from csr import CSRGraph
 from graph_io import *
 
 PATH = 'graphs/'
@@ -54,6 +57,20 @@ class CounterCase(unittest.TestCase):
         for num_neigh in counter.get(3).values():
             self.assertEqual(num_neigh, 2)
 
+    def test_count_neighbours(self):
+        # Only the vertices with a neighbour of the color are counted
+        with open(PATH + "arrow.grl") as f:
+            graphs = load_graph(f, read_list=True)
+        graph = graphs[0][0]
+        coloring = initialize_coloring(graph)
+        csr = CSRGraph.from_vertices(coloring.vertices)
+        bitsets = BitsetGraph.from_csr(csr)
+        for color in coloring.colors:
+            counter = generate_neighbour_count_with_color(coloring, color, csr)
+            expected = {csr.index[v]: n for counts in counter.values() for v, n in counts.items() if n > 0}
+            self.assertEqual(expected, count_neighbours(coloring, color, csr))
+            self.assertEqual(expected, count_neighbours_with_bitsets(coloring, color, bitsets))
+
 
 if __name__ == '__main__':
     unittest.main()
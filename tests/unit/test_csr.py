@@ -0,0 +1,91 @@
+"""
+Test file for the CSR graph representation
+"""
+import unittest
+
+import tests
+from csr import CSRGraph, as_csr
+from graph_io import load_graph
+from preprocessing import checks, find_components, is_tree
+from tree_refinement import tree_isomorphism
+
+PATH = 'graphs/branching'
+
+
+class CSRGraphCase(unittest.TestCase):
+
+    def setUp(self):
+        tests.set_up_test_graphs()
+
+    def test_from_edge_array(self):
+        # 0 - 1 - 2 and a loop at 3
+        csr = CSRGraph.from_edge_array(4, [(0, 1), (1, 2), (3, 3)])
+        self.assertEqual(4, csr.order)
+        self.assertEqual(3, csr.size)
+        self.assertEqual([1, 2, 1, 1], csr.degrees())
+        self.assertEqual([0, 2], sorted(csr.neighbours(1)))
+        self.assertEqual([3], list(csr.neighbours(3)))
+        self.assertTrue(csr.is_adjacent(2, 1))
+        self.assertFalse(csr.is_adjacent(0, 2))
+        self.assertEqual(range(4), csr.vertices)
+
+    def test_from_graph(self):
+        graph = tests.non_trivial_graph
+        csr = CSRGraph.from_graph(graph)
+        self.assertEqual(graph.order, csr.order)
+        self.assertEqual(graph.size, csr.size)
+        for v in graph.vertices:
+            i = csr.index[v]
+            self.assertIs(v, csr.vertices[i])
+            self.assertEqual(v.degree, csr.degree(i))
+            self.assertEqual(list(v.neighbours), [csr.vertices[j] for j in csr.neighbours(i)])
+
+    def test_loops(self):
+        csr = CSRGraph.from_graph(tests.v5e4loop_unconnected)
+        self.assertEqual(4, csr.size)
+
+    def test_as_csr(self):
+        csr = as_csr(tests.non_trivial_graph)
+        self.assertIsInstance(csr, CSRGraph)
+        self.assertIs(csr, as_csr(csr))
+
+    def test_memory(self):
+        # Offsets and neighbours are machine integers, not objects
+        csr = CSRGraph.from_edge_array(1000, [(i, i + 1) for i in range(999)])
+        self.assertLessEqual(csr.nbytes / csr.size, 16)
+
+    def test_preprocessing(self):
+        g = as_csr(tests.v4e4_connected)
+        h = CSRGraph.from_edge_array(4, [(0, 1), (1, 2), (1, 3), (2, 3)])
+        self.assertTrue(checks(g, h))
+        self.assertFalse(checks(g, as_csr(tests.v5e4loop_unconnected)))
+        self.assertFalse(is_tree(h))
+        self.assertTrue(is_tree(CSRGraph.from_edge_array(4, [(0, 1), (1, 2), (1, 3)])))
+
+        is_connected, components = find_components(as_csr(tests.v5e4loop_unconnected))
+        self.assertFalse(is_connected)
+        self.assertEqual([tests.v5e4loop_unconnected.find_vertex(4)], components[2])
+
+        is_connected, components = find_components(CSRGraph.from_edge_array(5, [(0, 1), (3, 4)]))
+        self.assertEqual({1: [0, 1], 2: [2], 3: [3, 4]}, components)
+
+    def test_tree_isomorphism(self):
+        with open(PATH + '/trees90.grl') as f:
+            graphs, _ = load_graph(f, graph_class=CSRGraph, read_list=True)
+        self.assertTrue(tree_isomorphism(graphs[0], graphs[3]))
+        self.assertTrue(tree_isomorphism(graphs[1], graphs[2]))
+        self.assertFalse(tree_isomorphism(graphs[0], graphs[1]))
+
+        g = tests.create_graph_helper(
+            [(0, 1), (0, 2), (1, 3), (1, 4), (1, 5), (2, 6), (2, 7), (2, 8), (6, 9), (6, 10), (8, 11), (8, 12)])
+        h = tests.create_graph_helper(
+            [(0, 1), (0, 2), (1, 3), (1, 4), (1, 5), (2, 6), (2, 7), (2, 8), (3, 9), (3, 10), (4, 11), (4, 12)])
+        g_csr, h_csr = as_csr(g), as_csr(h)
+        self.assertTrue(tree_isomorphism(g_csr, h_csr, [[g.find_vertex(8), h.find_vertex(4)],
+                                                        [g.find_vertex(11), h.find_vertex(11)]]))
+        self.assertFalse(tree_isomorphism(g_csr, h_csr, [[g.find_vertex(6), h.find_vertex(4)],
+                                                         [g.find_vertex(11), h.find_vertex(11)]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
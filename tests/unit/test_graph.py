@@ -1,9 +1,15 @@
 import unittest
+from array import array
 from typing import Iterable, Any, Callable
 
 import tests
 from color_refinement_helper import compare
-from graph import Graph, Vertex, Edge
+from graph import DisjointUnion, Graph, GraphError, Vertex, Edge
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class GraphTests(unittest.TestCase):
@@ -96,6 +102,171 @@ class GraphTests(unittest.TestCase):
         self.assertFalse((non_simple + simple).simple)
         self.assertFalse((non_simple + non_simple).simple)
 
+    def test_from_edge_array(self):
+        def _edge_indices(graph: Graph):
+            return [(graph.vertices.index(e.tail), graph.vertices.index(e.head)) for e in graph.edges]
+
+        pairs = [(0, 1), (1, 2), (2, 0), (2, 3)]
+        graph = Graph.from_edge_array(5, pairs, name='spam', weights=[1, 2, 3, 4])
+        self.assertEqual('spam', graph.name)
+        self.assertEqual(5, graph.order)
+        self.assertEqual(pairs, _edge_indices(graph))
+        self.assertEqual([1, 2, 3, 4], [e.weight for e in graph.edges])
+        self.assertEqual([2, 2, 3, 1, 0], [v.degree for v in graph.vertices])
+
+        # Assert that a flat array of alternating tails and heads gives the same graph
+        graph = Graph.from_edge_array(5, array('i', [0, 1, 1, 2, 2, 0, 2, 3]))
+        self.assertEqual(pairs, _edge_indices(graph))
+
+        # Assert that loops and multi-edges are refused in simple graphs
+        with self.assertRaises(GraphError):
+            Graph.from_edge_array(2, [(0, 0)], simple=True)
+        with self.assertRaises(GraphError):
+            Graph.from_edge_array(2, [(0, 1), (1, 0)], simple=True)
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_from_numpy_edge_array(self):
+        pairs = [(0, 1), (1, 2), (2, 3)]
+        for edges in (numpy.array(pairs), numpy.array(pairs).ravel()):
+            graph = Graph.from_edge_array(4, edges)
+            self.assertEqual(3, graph.size)
+            self.assertEqual([1, 2, 2, 1], [v.degree for v in graph.vertices])
+
+    def test_deepcopy(self):
+        graph = tests.non_trivial_graph
+        copy = graph.deepcopy()
+        self.assertEqual([v.label for v in graph.vertices], [v.label for v in copy.vertices])
+        self.assertEqual([v.id for v in graph.vertices], [v.id for v in copy.vertices])
+        self.assertEqual([(e.tail.label, e.head.label) for e in graph.edges],
+                         [(e.tail.label, e.head.label) for e in copy.edges])
+        self.assertTrue(all(v not in graph.vertices for v in copy.vertices))
+
+    def test_clone(self):
+        graph = tests.create_graph_helper([(0, 1), (1, 2), (2, 3)])
+        clone = graph.clone()
+        other = graph.clone()
+
+        # Assert that the clones share the edges of the graph until their adjacency is used
+        self.assertIs(clone._shared, other._shared)
+        self.assertEqual(3, clone.size)
+        self.assertEqual([v.label for v in graph.vertices], [v.label for v in clone.vertices])
+        self.assertEqual([1], [w.label for w in clone.find_vertex(0).neighbours])
+        self.assertIsNone(clone._shared)
+        self.assertIsNotNone(other._shared)
+
+        # Assert that changing the clone or the graph leaves the other untouched
+        clone.del_edge(clone.edges[0])
+        self.assertEqual(3, graph.size)
+        graph.add_edge(Edge(graph.find_vertex(0), graph.find_vertex(3)))
+        self.assertEqual(2, clone.size)
+        self.assertEqual(3, other.size)
+        self.assertFalse(other.find_vertex(0).is_adjacent(other.find_vertex(3)))
+        self.assertEqual(4, graph.clone().size)
+
+    def test_edge_lookup(self):
+        for directed in (False, True):
+            graph = Graph(directed, n=3)
+            u, v, w = graph.vertices
+            first, second, loop = Edge(u, v), Edge(u, v), Edge(w, w)
+            for edge in (first, second, loop):
+                graph.add_edge(edge)
+
+            self.assertEqual({first, second}, graph.find_edge(u, v))
+            self.assertEqual(2, graph.multiplicity(u, v))
+            self.assertTrue(graph.is_adjacent(u, v))
+            self.assertTrue(graph.edge_exists(u, v))
+            self.assertEqual(set() if directed else {first, second}, graph.find_edge(v, u))
+            self.assertEqual(0 if directed else 2, graph.multiplicity(v, u))
+            self.assertEqual(not directed, graph.is_adjacent(v, u))
+            self.assertEqual({loop}, graph.find_edge(w, w))
+            self.assertEqual(1, graph.multiplicity(w, w))
+            self.assertFalse(graph.edge_exists(u, w))
+
+            graph.del_edge(first)
+            self.assertEqual({second}, graph.find_edge(u, v))
+            graph.del_vertex(v)
+            self.assertFalse(graph.is_adjacent(u, v))
+            self.assertEqual(0, graph.multiplicity(u, v))
+
+        # Assert that the simple graph check uses the direction of the edges
+        graph = Graph(True, n=2, simple=True)
+        u, v = graph.vertices
+        graph.add_edge(Edge(u, v))
+        graph.add_edge(Edge(v, u))
+        self.assertRaises(GraphError, graph.add_edge, Edge(u, v))
+        self.assertRaises(GraphError, Graph.from_edge_array, 2, [(0, 1), (1, 0)], simple=True)
+
+    def test_vertex_and_edge_views(self):
+        graph = tests.create_graph_helper([(0, 1), (1, 2), (2, 3)])
+        vertices, edges = graph.vertices, graph.edges
+
+        # Assert that the views are read-only and compare equal to lists
+        self.assertFalse(hasattr(vertices, 'append'))
+        self.assertEqual(list(vertices), vertices)
+        self.assertEqual([graph.find_vertex(label) for label in range(4)], vertices)
+        self.assertIn(graph.find_vertex(3), vertices)
+        self.assertEqual(2, vertices.index(graph.find_vertex(2)))
+
+        # Assert that the views are live and that deletion moves the last element into the freed place
+        graph.del_vertex(graph.find_vertex(0))
+        self.assertEqual(3, graph.order)
+        self.assertEqual(2, graph.size)
+        self.assertEqual([graph.find_vertex(3), graph.find_vertex(1), graph.find_vertex(2)], vertices)
+        self.assertEqual(0, vertices.index(graph.find_vertex(3)))
+        self.assertEqual(2, len(edges))
+        self.assertTrue(all(edge in edges for edge in graph.find_vertex(2).incidence))
+
+        with self.assertRaises(ValueError):
+            graph.del_edge(Edge(graph.find_vertex(1), graph.find_vertex(3)))
+
+    def test_adjacency_views(self):
+        graph = tests.create_graph_helper([(0, 1), (1, 2)])
+        u, v, w = graph.find_vertex(0), graph.find_vertex(1), graph.find_vertex(2)
+
+        # Assert that repeated reads return the same cached objects
+        self.assertIs(v.neighbours, v.neighbours)
+        self.assertIs(v.incidence, v.incidence)
+        self.assertEqual(2, v.degree)
+
+        # Assert that adding an edge invalidates the views of both end points
+        neighbours = v.neighbours
+        edge = Edge(u, w)
+        graph.add_edge(edge)
+        self.assertIs(neighbours, v.neighbours)
+        self.assertEqual({v, w}, set(u.neighbours))
+        self.assertEqual(2, u.degree)
+        self.assertIn(edge, w.incidence)
+
+        # Assert that deleting an edge invalidates the views of both end points
+        graph.del_edge(edge)
+        self.assertEqual((v,), u.neighbours)
+        self.assertEqual(1, w.degree)
+        self.assertNotIn(edge, u.incidence)
+
+    def test_disjoint_union(self):
+        g = tests.non_trivial_graph
+        h = tests.connected_graph_order_2
+        graphs_before = [v.graphs for v in g.vertices + h.vertices]
+
+        union = g + h
+        self.assertIsInstance(union, DisjointUnion)
+        self.assertIs(g, union.left)
+        self.assertIs(h, union.right)
+        self.assertEqual(g.vertices + h.vertices, union.vertices)
+
+        # Assert that forming unions does not register them on the vertices of the input graphs
+        g + tests.empty_graph
+        self.assertEqual(graphs_before, [v.graphs for v in g.vertices + h.vertices])
+        self.assertTrue(all(v.in_graph(g) and not v.in_graph(union) for v in g.vertices))
+
+        with self.assertRaises(GraphError):
+            union.del_vertex(g.vertices[0])
+        with self.assertRaises(GraphError):
+            union.del_edge(g.edges[0])
+        with self.assertRaises(GraphError):
+            union.add_edge(Edge(g.vertices[0], h.vertices[0]))
+        self.assertEqual(g.size + h.size, union.size)
+
     def test_complement(self):
         vertex_label = Vertex.label.__get__
         vertex_degree = Vertex.degree.__get__
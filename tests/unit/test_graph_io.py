@@ -0,0 +1,244 @@
+"""
+Test file for reading graph files
+"""
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+from array import array
+from unittest.mock import patch
+
+from csr import CSRGraph, as_csr
+from graph import Graph
+import graph_io
+from graph_io import compression_of, decode_graph6, decode_sparse6, encode_graph6, encode_sparse6, iter_graph6, \
+    iter_graphs, load_graph, load_graph6, parse_edge_list, parse_graph_list, parse_section, read_graph, \
+    read_graph_list, read_graph_list_bulk, read_graph_list_parallel, read_sections, save_graph, save_graph6, \
+    write_dot, write_graphs
+
+PATH = 'graphs/branching'
+
+GRAPHS = '''# Two graphs
+option
+3
+0,1
+1,2:5
+---
+# Second graph
+2
+0,1
+'''
+
+
+class GraphIOCase(unittest.TestCase):
+
+    def test_read_sections(self):
+        sections = read_sections(io.StringIO(GRAPHS))
+        first = next(sections)
+        self.assertEqual(('G0', 3, 2, ['option']), (first.name, first.order, first.size, first.options))
+        graph = first.graph()
+        self.assertEqual(2, graph.size)
+        self.assertEqual([None, 5], [edge.weight for edge in graph.edges])
+
+        second = next(sections)
+        self.assertEqual(('G1', 2, 1), (second.name, second.order, second.size))
+        self.assertIsInstance(second.graph(CSRGraph), CSRGraph)
+        self.assertEqual([], list(sections))
+
+    def test_headers_only(self):
+        with open(PATH + '/trees90.grl') as f:
+            headers = [(section.order, section.size) for section in read_sections(f, headers_only=True)]
+        with open(PATH + '/trees90.grl') as f:
+            graphs, _ = load_graph(f, read_list=True)
+        self.assertEqual([(g.order, g.size) for g in graphs], headers)
+
+        # The edges are read again when they are needed, without changing where the next section is read from
+        sections = read_sections(io.StringIO(GRAPHS), headers_only=True)
+        section = next(sections)
+        self.assertEqual(2, section.size)
+        self.assertEqual([None, 5], [edge.weight for edge in section.graph().edges])
+        second = next(sections)
+        self.assertEqual(('G1', 2, 1), (second.name, second.order, second.size))
+        self.assertEqual(2, section.graph(CSRGraph).size)
+        self.assertEqual(1, second.graph().size)
+
+        # Without seeking they cannot be read again
+        unseekable = io.StringIO(GRAPHS)
+        unseekable.seekable = lambda: False
+        section = next(read_sections(unseekable, headers_only=True))
+        self.assertIsNone(section.edge_lines)
+        self.assertRaises(ValueError, section.graph)
+
+    def test_iter_graphs(self):
+        with open(PATH + '/torus24.grl') as f:
+            graphs, options = load_graph(f, read_list=True)
+        with open(PATH + '/torus24.grl') as f:
+            streamed = list(iter_graphs(Graph, f))
+        self.assertEqual([g.name for g in graphs], [g.name for g in streamed])
+        self.assertEqual([sorted((e.tail.label, e.head.label) for e in g.edges) for g in graphs],
+                         [sorted((e.tail.label, e.head.label) for e in g.edges) for g in streamed])
+
+    def test_lazy(self):
+        # Assert that a graph is yielded before the next one is read
+        streamed = iter_graphs(Graph, io.StringIO(GRAPHS + '---\n2\n0,x\n'))
+        self.assertEqual(3, next(streamed).order)
+        self.assertEqual(2, next(streamed).order)
+        self.assertRaises(ValueError, next, streamed)
+
+    def test_parse_graph_list(self):
+        graphs, options = parse_graph_list(Graph, GRAPHS)
+        self.assertEqual(['option'], options)
+        self.assertEqual([('G0', 3, 2), ('G1', 2, 1)], [(g.name, g.order, g.size) for g in graphs])
+        self.assertEqual([None, 5], [edge.weight for edge in graphs[0].edges])
+        self.assertRaises(ValueError, parse_graph_list, Graph, '2\n0,1\n1,x\n')
+
+        for path in (PATH + '/trees90.grl', 'graphs/treepaths/threepaths160.gr'):
+            for graph_class in (Graph, CSRGraph):
+                with open(path) as f:
+                    graphs, _ = read_graph_list(graph_class, f)
+                with open(path) as f:
+                    parsed, _ = read_graph_list_bulk(graph_class, f)
+                self.assertEqual([g.name for g in graphs], [g.name for g in parsed])
+                for g, h in zip(graphs, parsed):
+                    g, h = as_csr(g), as_csr(h)
+                    self.assertEqual((list(g.offsets), list(g.targets)), (list(h.offsets), list(h.targets)))
+
+    def test_parallel(self):
+        options, n, edges, weights = parse_section('# First graph\noption\n3\n0,1\n1,2:5\n')
+        self.assertEqual((['option'], 3, [0, 1, 1, 2], [None, 5]), (options, n, list(edges), weights))
+        self.assertEqual(([], None), parse_section('# Nothing\n\n')[:2])
+
+        with open(PATH + '/cubes3.grl') as f:
+            graphs, options = read_graph_list(Graph, f)
+        with open(PATH + '/cubes3.grl') as f:
+            parsed, parsed_options = read_graph_list_parallel(Graph, f, processes=2)
+        self.assertEqual(options, parsed_options)
+        self.assertEqual([g.name for g in graphs], [g.name for g in parsed])
+        for g, h in zip(graphs, parsed):
+            g, h = as_csr(g), as_csr(h)
+            self.assertEqual((list(g.offsets), list(g.targets)), (list(h.offsets), list(h.targets)))
+
+        graphs, _ = parse_graph_list(Graph, GRAPHS, processes=2)
+        self.assertEqual([None, 5], [edge.weight for edge in graphs[0].edges])
+
+    def test_parse_edge_list(self):
+        edges = parse_edge_list(['0,1', '2,3'])
+        self.assertEqual([0, 1, 2, 3], list(edges))
+        with patch('graph_io.numpy', None):
+            edges = parse_edge_list(['0,1', '2,3'])
+        self.assertEqual(array('i', [0, 1, 2, 3]), edges)
+
+        # The error names the line that is not a pair of integers, with and without NumPy
+        for lines, invalid in ((['0,1', '2,x'], '2,x'), (['0,1', '2'], '2'), (['0,1,2', '3,4'], '0,1,2')):
+            for module in (graph_io.numpy, None):
+                with patch('graph_io.numpy', module), self.assertRaises(ValueError) as e:
+                    parse_edge_list(lines)
+                self.assertEqual('Invalid edge line: {!r}'.format(invalid), str(e.exception))
+
+    def test_read_graph(self):
+        graph, options, more = read_graph(Graph, io.StringIO(GRAPHS))
+        self.assertEqual((3, ['option'], True), (graph.order, options, more))
+        self.assertRaises(ValueError, read_graph, Graph, io.StringIO('# Nothing\n'))
+
+    def test_graph6(self):
+        # The Petersen graph and the example of the sparse6 format description
+        n, edges = decode_graph6('IheA@GUAo')
+        self.assertEqual((10, 30), (n, len(edges)))
+        self.assertEqual('IheA@GUAo', encode_graph6(n, edges))
+        with patch('graph_io.numpy', None):
+            self.assertEqual(list(edges), list(decode_graph6('IheA@GUAo')[1]))
+        self.assertEqual((7, [0, 1, 0, 2, 1, 2, 5, 6]), (7, list(decode_sparse6(':Fa@x^')[1])))
+        self.assertEqual(':Fa@x^', encode_sparse6(7, [1, 0, 2, 0, 2, 1, 5, 6]))
+        # The padding may not be read as a loop at the last vertex
+        self.assertEqual([0, 2], list(decode_sparse6(encode_sparse6(4, [0, 2]))[1]))
+        self.assertEqual([1, 1, 0, 3, 0, 3], list(decode_sparse6(encode_sparse6(4, [1, 1, 0, 3, 3, 0]))[1]))
+        self.assertRaises(ValueError, encode_graph6, 2, [1, 1])
+        self.assertRaises(ValueError, decode_graph6, 'IheA@GU')
+
+    def test_save_graph6(self):
+        with open(PATH + '/trees90.grl') as f:
+            graphs, _ = load_graph(f, read_list=True)
+        for sparse in (False, True):
+            f = io.StringIO()
+            self.assertEqual(len(graphs), save_graph6(iter(graphs), f, sparse=sparse))
+            f.seek(0)
+            loaded = load_graph6(f, CSRGraph, read_list=True)
+            self.assertEqual([g.name for g in graphs], [g.name for g in loaded])
+            for g, h in zip(graphs, loaded):
+                g, h = as_csr(g), as_csr(h)
+                self.assertEqual((list(g.offsets), sorted(g.targets)), (list(h.offsets), sorted(h.targets)))
+
+        streamed = iter_graph6(Graph, io.StringIO('>>graph6<<IheA@GUAo\n\n:Fa@x^\nI\n'))
+        self.assertEqual(15, next(streamed).size)
+        self.assertEqual(4, next(streamed).size)
+        self.assertRaises(ValueError, next, streamed)
+
+    def test_compressed(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(PATH + '/trees90.grl', 'rb') as f:
+            data = f.read()
+        with open(PATH + '/trees90.grl') as f:
+            expected = [(g.name, g.order, g.size) for g in iter_graphs(Graph, f)]
+
+        # The magic bytes decide, an extension is not needed
+        for name, module in (('trees90.txt', None), ('trees90.grl', gzip), ('trees90.xz', lzma), ('trees90.bz2', bz2)):
+            path = os.path.join(directory, name)
+            with open(path, 'wb') as f:
+                f.write(module.compress(data) if module else data)
+
+            graphs, _ = load_graph(path, read_list=True)
+            self.assertEqual(expected, [(g.name, g.order, g.size) for g in graphs])
+            self.assertEqual(expected, [(g.name, g.order, g.size) for g in iter_graphs(Graph, path)])
+        self.assertEqual([None, 'gzip', 'xz', 'bzip2'],
+                         [compression_of(os.path.join(directory, name))
+                          for name in ('trees90.txt', 'trees90.grl', 'trees90.xz', 'trees90.bz2')])
+
+        path = os.path.join(directory, 'petersen.g6.gz')
+        with gzip.open(path, 'wt') as f:
+            f.write('IheA@GUAo\n')
+        self.assertEqual(15, load_graph6(path).size)
+
+        path = os.path.join(directory, 'empty.zst')
+        open(path, 'wb').close()
+        self.assertEqual('zstd', compression_of(path))
+        with patch('graph_io.zstandard', None):
+            self.assertRaises(ImportError, load_graph, path)
+
+    @unittest.skipIf(graph_io.zstandard is None, 'zstandard is not installed')
+    def test_zstd(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'graphs.grl')
+        with open(path, 'wb') as f:
+            f.write(graph_io.zstandard.ZstdCompressor().compress(GRAPHS.encode()))
+        self.assertEqual('zstd', compression_of(path))
+        self.assertEqual([3, 2], [g.order for g in iter_graphs(Graph, path)])
+
+    def test_write_graphs(self):
+        graphs, _ = parse_graph_list(Graph, GRAPHS)
+        f = io.StringIO()
+        save_graph(graphs, f, ['option', '5'])
+        self.assertEqual('option\n# Number of vertices:\n3\n# Edge list:\n0,1\n1,2:5\n--- Next graph:\n'
+                         '# Number of vertices:\n2\n# Edge list:\n0,1\n', f.getvalue())
+
+        # Graphs from a generator are written while they are built
+        with patch('graph_io.CHUNK_LINES', 2):
+            f = io.StringIO()
+            self.assertEqual(2, write_graphs((graph for graph in parse_graph_list(Graph, GRAPHS)[0]), f))
+        f.seek(0)
+        parsed, _ = load_graph(f, read_list=True)
+        self.assertEqual([(3, 2), (2, 1)], [(g.order, g.size) for g in parsed])
+
+        f = io.StringIO()
+        write_dot(graphs[1], f)
+        self.assertEqual('graph G {\n    0 [penwidth=3,label="G1_0"]\n    1 [penwidth=3,label="G1_1"]\n\n'
+                         '    0--1 [penwidth=2,label="None"]\n}', f.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 
 import tests
 
+from bitset import BitsetGraph
 from color_refinement_helper import graph_to_modules
 from disconnected_refinement import graph_component_isomorphic
 from preprocessing import is_similar_modular_decomposition, modular_decomposition_factor, \
@@ -82,6 +83,17 @@ class TestPreprocessing(unittest.TestCase):
         self.assertEqual(1, len(graphs[2].vertices))
         self.assertEqual(1, len(graphs[2].edges))
 
+    def test_construct_graph_from_lazy_complement(self):
+        # The components of a lazy complement are built from its rows, with new vertices
+        for graph in (tests.v5e7, tests.v8e7loop_unconnected.complement()):
+            lazy, _ = check_complement(graph, graph, lazy=True)
+            eager, _ = check_complement(graph, graph)
+            self.assertIsInstance(lazy, BitsetGraph)
+            graphs = construct_graph_from_components(find_components(lazy)[1], lazy)
+            expected = construct_graph_from_components(find_components(eager)[1])
+            self.assertEqual(sorted((g.order, g.size) for g in expected), sorted((g.order, g.size) for g in graphs))
+            self.assertTrue(all(v not in graph.vertices for g in graphs for v in g.vertices))
+
     def test_compare_graph_components(self):
         is_connected, components1 = find_components(tests.v8e7loop_unconnected)
         graph1 = construct_graph_from_components(components1)
@@ -85,82 +85,57 @@ class TestTrees(unittest.TestCase):
 
     def test_get_weight(self):
         g = tests.create_graph_helper([(0, 1), (1, 2), (2, 3), (2, 4)])
-        arb_root = g.find_vertex(0)
-        for v in g.vertices:
-            v.weight = 0
-        set_weight(arb_root)
-        self.assertEqual(5, g.find_vertex(0).weight)
-        self.assertEqual(4, g.find_vertex(1).weight)
-        self.assertEqual(3, g.find_vertex(2).weight)
-        self.assertEqual(1, g.find_vertex(3).weight)
-        self.assertEqual(1, g.find_vertex(4).weight)
-        for v in g.vertices:
-            v.weight = 0
-        arb_root = g.find_vertex(2)
-        set_weight(arb_root)
-        self.assertEqual(5, g.find_vertex(2).weight)
-        self.assertEqual(2, g.find_vertex(1).weight)
-        self.assertEqual(1, g.find_vertex(0).weight)
-        self.assertEqual(1, g.find_vertex(3).weight)
-        self.assertEqual(1, g.find_vertex(4).weight)
+        index = g.vertices.index
+        weight = set_weight(g, index(g.find_vertex(0)))
+        self.assertEqual(5, weight[index(g.find_vertex(0))])
+        self.assertEqual(4, weight[index(g.find_vertex(1))])
+        self.assertEqual(3, weight[index(g.find_vertex(2))])
+        self.assertEqual(1, weight[index(g.find_vertex(3))])
+        self.assertEqual(1, weight[index(g.find_vertex(4))])
+        weight = set_weight(g, index(g.find_vertex(2)))
+        self.assertEqual(5, weight[index(g.find_vertex(2))])
+        self.assertEqual(2, weight[index(g.find_vertex(1))])
+        self.assertEqual(1, weight[index(g.find_vertex(0))])
+        self.assertEqual(1, weight[index(g.find_vertex(3))])
+        self.assertEqual(1, weight[index(g.find_vertex(4))])
 
     def test_shift(self):
         g = tests.create_graph_helper([(0, 1), (0, 2), (2, 3), (0, 4), (4, 5), (5, 6), (6, 7), (7, 8), (8, 9), (8, 10)])
-        arb_root = g.find_vertex(0)
-        for v in g.vertices:
-            v.weight = 0
-        set_weight(arb_root)
-        self.assertEqual(11, g.find_vertex(0).weight)
-        root = shift(arb_root, g.order)
-        self.assertEqual(g.find_vertex(5), root)
+        index = g.vertices.index
+        self.assertEqual(11, set_weight(g, index(g.find_vertex(0)))[index(g.find_vertex(0))])
+        root = choose_a_root(g)
+        self.assertEqual(g.find_vertex(5), g.vertices[root])
 
     def test_get_root(self):
         g = tests.create_graph_helper([(0, 1), (0, 2), (2, 3), (0, 4), (4, 5), (5, 6), (6, 7), (7, 8), (8, 9), (8, 10)])
-        for v in g.vertices:
-            v.weight = 0
         root = choose_a_root(g)
-        self.assertEqual(g.find_vertex(5), root)
+        self.assertEqual(g.find_vertex(5), g.vertices[root])
 
     def test_levels(self):
         g = tests.create_graph_helper([(0, 1), (0, 2), (0, 3), (1, 4), (1, 5), (2, 6), (6, 8), (3, 7)])
-        for v in g.vertices:
-            v.weight = 0
-            v.level = None
-            v.children = []
+        index = g.vertices.index
         root = choose_a_root(g)
-        self.assertEqual(g.find_vertex(0), root)
-        assign_levels(root)
-        self.assertEqual(0, g.find_vertex(0).level)
-        self.assertEqual(1, g.find_vertex(1).level)
-        self.assertEqual(1, g.find_vertex(2).level)
-        self.assertEqual(1, g.find_vertex(3).level)
-        self.assertEqual(2, g.find_vertex(4).level)
-        self.assertEqual(2, g.find_vertex(5).level)
-        self.assertEqual(2, g.find_vertex(6).level)
-        self.assertEqual(2, g.find_vertex(7).level)
-        self.assertEqual(3, g.find_vertex(8).level)
+        self.assertEqual(g.find_vertex(0), g.vertices[root])
+        level, _ = assign_levels(g, root)
+        self.assertEqual([0, 1, 1, 1, 2, 2, 2, 2, 3], [level[index(g.find_vertex(label))] for label in range(9)])
         g = tests.create_graph_helper(
             [(0, 1), (0, 2), (1, 3), (1, 4), (1, 5), (2, 6), (2, 7), (2, 8), (6, 9), (6, 10), (8, 11), (8, 12)])
-        for v in g.vertices:
-            v.weight = 0
-            v.level = None
-            v.children = []
+        index = g.vertices.index
         root = choose_a_root(g)
-        self.assertEqual(g.find_vertex(2), root)
-        assign_levels(root)
-        self.assertEqual(1, g.find_vertex(0).level)
-        self.assertEqual(2, g.find_vertex(1).level)
-        self.assertEqual(0, g.find_vertex(2).level)
-        self.assertEqual(3, g.find_vertex(3).level)
-        self.assertEqual(3, g.find_vertex(4).level)
-        self.assertEqual(3, g.find_vertex(5).level)
-        self.assertEqual(1, g.find_vertex(6).level)
-        self.assertEqual(1, g.find_vertex(7).level)
-        self.assertEqual(1, g.find_vertex(8).level)
-        self.assertEqual(2, g.find_vertex(9).level)
-        self.assertEqual(2, g.find_vertex(10).level)
-        self.assertEqual(2, g.find_vertex(11).level)
-        self.assertEqual(2, g.find_vertex(12).level)
+        self.assertEqual(g.find_vertex(2), g.vertices[root])
+        level, parent = assign_levels(g, root)
+        self.assertEqual([1, 2, 0, 3, 3, 3, 1, 1, 1, 2, 2, 2, 2],
+                         [level[index(g.find_vertex(label))] for label in range(13)])
+        self.assertEqual(index(g.find_vertex(6)), parent[index(g.find_vertex(9))])
+        self.assertEqual(root, parent[root])
+
+    def test_concurrent_runs(self):
+        # No state is kept on the vertices, so runs on the same graph do not interfere
+        g = tests.create_graph_helper([(0, 1), (0, 2), (2, 3), (0, 4), (4, 5)])
+        self.assertFalse(hasattr(g.find_vertex(0), '__dict__'))
+        levels = [assign_levels(g, root)[0] for root in range(g.order)]
+        self.assertEqual(list(range(g.order)), [level.index(0) for level in levels])
+        self.assertTrue(tree_isomorphism(g, g))
 
     def test_tree_isomorphism(self):
         # G and H are the trees from the article, but root from our algorithm is different so doesn't match in result
@@ -170,8 +145,6 @@ class TestTrees(unittest.TestCase):
             [(0, 1), (0, 2), (1, 3), (1, 4), (1, 5), (2, 6), (2, 7), (2, 8), (3, 9), (3, 10), (4, 11), (4, 12)])
 
         result = tree_isomorphism(g, h)
-        self.assertListEqual([0, 0, 0], g.find_vertex(1).tuples)
-        self.assertListEqual([0, 0, 0], h.find_vertex(2).tuples)
         self.assertTrue(result)
 
         # Graph H minus the last edges 4 - 12
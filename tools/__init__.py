@@ -1,7 +1,7 @@
 import os
 from typing import List, Tuple, Any, Dict, Set
 
-from graph import Graph, Vertex, Edge
+from graph import Graph
 
 _last_integer = 0
 _generated_integers = set()
@@ -46,18 +46,15 @@ def create_graph_helper(edges: List[Tuple[Any, Any]] = list()):
     :return: The graph with labelled vertices and edges
     """
 
-    graph = Graph(False)
-    vertices = {}
+    indices = {}
+    pairs = []
     for head, tail in edges:
-        if head not in vertices:
-            vertices[head] = Vertex(graph=graph, label=head, id=head)
-            graph.add_vertex(vertices[head])
+        pairs.append((indices.setdefault(head, len(indices)), indices.setdefault(tail, len(indices))))
 
-        if tail not in vertices:
-            vertices[tail] = Vertex(graph=graph, label=tail, id=tail)
-            graph.add_vertex(vertices[tail])
-
-        graph.add_edge(Edge(vertices[head], vertices[tail]))
+    graph = Graph.from_edge_array(len(indices), pairs)
+    for label, vertex in zip(indices, graph.vertices):
+        vertex.label = label
+        vertex.set_id(label)
     return graph
 
 
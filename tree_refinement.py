@@ -1,188 +1,183 @@
+from array import array
 from collections import defaultdict
-from typing import List
+from typing import List, Union
 
 from color_refinement_helper import group_by
+from csr import CSRGraph, as_csr
 from graph import Graph, Vertex
 
+# The value of a vertex that has not been assigned one yet
+NO_VALUE = -1
 
-def tree_isomorphism(g: Graph, h: Graph, modules: [[Vertex]] = None) -> bool:
+
+def tree_isomorphism(g: Union[Graph, CSRGraph], h: Union[Graph, CSRGraph], modules: [[Vertex]] = None) -> bool:
     """
     Checks if Tree g and Tree h are isomorphic
+
+    The trees are walked in their CSR form. The weights, levels, values and tuples are kept in arrays indexed by vertex
+    index that only live for this call, so nothing is stored on the vertices and the same graph can be checked by
+    several calls at once.
     :param g: Graph
     :param h: Graph
+    :param modules: lists of vertices of g and h that are known to be isomorphic modules
     :return: Boolean whether they are isomorphic
     """
 
-    # Make all the vertices have the correct attributes
-    g = initialize_tree(g)
-    h = initialize_tree(h)
+    g = as_csr(g)
+    h = as_csr(h)
 
-    # Initialize module values
-    counter = len(g.vertices)
+    # Assign all leaves integer 0
+    value_g = array('i', (0 if g.degree(v) == 1 else NO_VALUE for v in g))
+    value_h = array('i', (0 if h.degree(v) == 1 else NO_VALUE for v in h))
+
+    # Initialize module values, module members are stored as (side, index) with side 0 for g and 1 for h
+    values = (value_g, value_h)
+    counter = g.order
+    module_indices = []
     if modules:
         for module in modules:
-            for v in module:
-                v.value = counter
+            indices = [(0, g.index[v]) if v in g.index else (1, h.index[v]) for v in module]
+            for side, v in indices:
+                values[side][v] = counter
+            module_indices.append(indices)
             counter += 1
 
-    # Get the root for the trees
+    # Get the root for the trees and assign the levels
     root_g = choose_a_root(g)
     root_h = choose_a_root(h)
+    level_g, parent_g = assign_levels(g, root_g)
+    level_h, parent_h = assign_levels(h, root_h)
+    level_dict_g = group_by(range(g.order), lambda v: level_g[v])
+    level_dict_h = group_by(range(h.order), lambda v: level_h[v])
 
-    # Assign the levels and get the level lists
-    assign_levels(root_g)
-    assign_levels(root_h)
-    level_dict_g = group_by(g.vertices, lambda v: v.level)
-    level_dict_h = group_by(h.vertices, lambda v: v.level)
     # Modules must have the same level
-    if modules:
-        for module in modules:
-            level = module[0].level
-            for v in module:
-                if v.level != level:
-                    return False
+    levels = (level_g, level_h)
+    for indices in module_indices:
+        if len({levels[side][v] for side, v in indices}) > 1:
+            return False
+
     # Gets the lowest level in the tree and since we assume isomorphism the dict which is used does not matter
     lowest_level = max(level_dict_g)
-    if max(level_dict_h) != lowest_level:
-        return False
-    # Loop through the levels
     if max(level_dict_h) != lowest_level:
         return False
 
+    tuples_of_g = [[] for _ in g]
+    tuples_of_h = [[] for _ in h]
     while lowest_level > 0:
-        tuples_g, d_g = set_tuples(level_dict_g[lowest_level - 1])
-        tuples_h, d_h = set_tuples(level_dict_h[lowest_level - 1])
-        sorted_t_g = sorted(tuples_g)
-        sorted_t_h = sorted(tuples_h)
+        tuples_g, d_g = set_tuples(g, level_dict_g[lowest_level - 1], parent_g, value_g, tuples_of_g)
+        tuples_h, d_h = set_tuples(h, level_dict_h[lowest_level - 1], parent_h, value_h, tuples_of_h)
         # If the sorted tuples are not identical it is not an isomorphism
-        if sorted_t_g != sorted_t_h:
+        if sorted(tuples_g) != sorted(tuples_h):
             return False
         # Assign a value to the vertices of the level that is considered
         value = 1
         for t in sorted(d_g):
             for v in d_g[t]:
-                if v.value is None:
-                    v.value = value
+                if value_g[v] == NO_VALUE:
+                    value_g[v] = value
             for v in d_h[t]:
-                if v.value is None:
-                    v.value = value
+                if value_h[v] == NO_VALUE:
+                    value_h[v] = value
             value += 1
         lowest_level -= 1
+
     # Modules should all have the same tuple, just like roots
-    if modules:
-        for module in modules:
-            tuples = module[0].tuples
-            for v in module:
-                if v.tuples != tuples:
-                    return False
+    tuples = (tuples_of_g, tuples_of_h)
+    for indices in module_indices:
+        side, v = indices[0]
+        if any(tuples[other_side][u] != tuples[side][v] for other_side, u in indices):
+            return False
     # If the roots have the same tuple the trees are isomorphic
-    return sorted(root_g.tuples) == sorted(root_h.tuples)
+    return sorted(tuples_of_g[root_g]) == sorted(tuples_of_h[root_h])
 
 
-def choose_a_root(g: Graph) -> Vertex:
+def choose_a_root(g: Union[Graph, CSRGraph]) -> int:
     """
     Determines the root for a tree that cuts the tree most in half, which is unique for a tree, so this should
     result in the same root for both tree
-    :param g: Graph
-    :return: Root
-    """
-
-    arbitrary_root = g.vertices[0]
-    set_weight(arbitrary_root)
-    return shift(vertex=arbitrary_root, num_vertices=g.order)
 
-
-def set_weight(root: Vertex, parent: Vertex = None):
-    """
-    Recursively assigns weights to the induced subgraphs starting with the root
-    :param root: Vertex
-    :param parent: The parent of the root, because those do not count in the weight of a subgraph
-    :return:
-    """
-
-    if root.degree == 1 and root.neighbours[0] == parent:
-        root.weight = 1
-        return 1
-    else:
-        for neighbour in root.neighbours:
-            if neighbour != parent:
-                root.weight += set_weight(root=neighbour, parent=root)
-        root.weight += 1
-        return root.weight
-
-
-def shift(vertex: Vertex, num_vertices: int) -> Vertex:
-    """
-    Returns the Vertex that is the root for this tree
-    :param vertex: the vertex we want to shift
-    :param num_vertices: the number of vertices in the graph [invariant]
-    :return:
+    Starting from the first vertex, the root is shifted to the neighbour with more than half of the vertices below it
+    until there is no such neighbour.
+    :param g: Graph
+    :return: index of the root
     """
 
-    # If no neighbour of u has weight > neighbour.weight/2, return u
-    result = vertex
-    for neighbour in vertex.neighbours:
-        if neighbour.weight > num_vertices / 2:
-            vertex.weight = vertex.weight - neighbour.weight
-            neighbour.weight = vertex.weight + neighbour.weight
-            result = shift(neighbour, num_vertices)
-    return result
-
-
-def assign_levels(root: Vertex, parent: Vertex = None, level: int = 0):
+    g = as_csr(g)
+    weight = set_weight(g, 0)
+    vertex = 0
+    while True:
+        for neighbour in g.neighbours(vertex):
+            if weight[neighbour] > g.order / 2:
+                weight[vertex] -= weight[neighbour]
+                weight[neighbour] += weight[vertex]
+                vertex = neighbour
+                break
+        else:
+            return vertex
+
+
+def set_weight(g: Union[Graph, CSRGraph], root: int) -> array:
     """
-    Assigns to a vertex the depth (in the algorithm called level, however our root = 0 instead of the max level)
-    :param root: The root of the tree
-    :param parent: The parent of the root (for the root of the tree this is None)
-    :param level: The level that needs to be assigned to the root
-    :return: Nothing because everything is assigned to the vertices
+    Determines the size of the subtree below every vertex when the tree hangs from root
+    :param g: Graph
+    :param root: index of the root
+    :return: the weight of every vertex
     """
 
-    if root.level is None:
-        root.level = level
-
-    level += 1
-    for neighbour in root.neighbours:
-        if neighbour.level is None:
-            neighbour.level = level
-        if neighbour != parent:
-            # noinspection PyUnresolvedReferences
-            root.children.append(neighbour)
-            assign_levels(root=neighbour, parent=root, level=level)
-
-
-def initialize_tree(g: Graph):
+    g = as_csr(g)
+    weight = array('i', [1]) * g.order
+    parent = array('i', [-1]) * g.order
+    parent[root] = root
+    order = [root]
+    for v in order:
+        for w in g.neighbours(v):
+            if parent[w] == -1:
+                parent[w] = v
+                order.append(w)
+    for v in reversed(order[1:]):
+        weight[parent[v]] += weight[v]
+    return weight
+
+
+def assign_levels(g: Union[Graph, CSRGraph], root: int) -> (array, array):
     """
-    The tree isomorphic algorithm and the root detection need certain attributes that are initialized here
+    Assigns to every vertex its depth (in the algorithm called level, however our root = 0 instead of the max level)
     :param g: Graph
-    :return: Nothing because everything is assigned to the vertices
+    :param root: index of the root
+    :return: the level and the parent of every vertex, the root is its own parent
     """
 
-    for v in g.vertices:
-        v.weight = 0
-        v.level = None
-        v.children = []
-        v.value = None
-        v.tuples = []
-        # Assign all leaves integer 0
-        if v.degree == 1:
-            v.value = 0
-    return g
-
-
-# noinspection PyUnresolvedReferences
-def set_tuples(vertices: List[Vertex]):
+    g = as_csr(g)
+    level = array('i', [-1]) * g.order
+    parent = array('i', [-1]) * g.order
+    level[root] = 0
+    parent[root] = root
+    stack = [root]
+    while stack:
+        v = stack.pop()
+        for w in g.neighbours(v):
+            if level[w] == -1:
+                level[w] = level[v] + 1
+                parent[w] = v
+                stack.append(w)
+    return level, parent
+
+
+def set_tuples(g: CSRGraph, vertices: List[int], parent: array, value: array, tuples_of: List[List[int]]):
     """
     Creates the tuples based on the value of its children and a mapping between the tuples and the vertices
-    :param vertices: The vertices of the level
+    :param g: CSRGraph
+    :param vertices: The vertex indices of the level
+    :param parent: The parent of every vertex
+    :param value: The value of every vertex
+    :param tuples_of: The tuple of every vertex, filled in for the given vertices
     :return: List of the tuples the are on this level and a dictionary tuples: vertices
     """
     tuples = []
     d = defaultdict(list)
     for v in vertices:
-        for n in v.children:
-            v.tuples.append(n.value)
-        if v.value != 0:
-            tuples.append(sorted(v.tuples))
-            d[tuple(sorted(v.tuples))].append(v)
+        tuples_of[v].extend(value[n] for n in g.neighbours(v) if parent[n] == v and n != v)
+        if value[v] != 0:
+            tuples.append(sorted(tuples_of[v]))
+            d[tuple(sorted(tuples_of[v]))].append(v)
     return tuples, d